@@ -0,0 +1,599 @@
+import argparse
+import importlib.util
+import json
+import os
+import py_compile
+import statistics
+import subprocess
+import random
+import sys
+import tempfile
+import time
+
+# run from anywhere: make the main xrpurr.py importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import xrpurr
+
+def showTimings(label, samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"{label:<28} mean {statistics.mean(samples)*1000:8.1f} ms | p50 {statistics.median(samples)*1000:8.1f} ms | p95 {p95*1000:8.1f} ms")
+
+def benchRpc(args):
+    from xrpl.clients import JsonRpcClient
+    from xrpl.models.requests import ServerInfo
+    url = args.url or xrpurr.XRPL_ENDPOINTS[0]
+    print(f"server_info x{args.n} against {url}")
+    fresh = []
+    for _ in range(args.n):
+        t0 = time.perf_counter()
+        JsonRpcClient(url).request(ServerInfo())
+        fresh.append(time.perf_counter() - t0)
+    pooled = []
+    c = xrpurr.get_client(url)
+    for _ in range(args.n):
+        t0 = time.perf_counter()
+        c.request(ServerInfo())
+        pooled.append(time.perf_counter() - t0)
+    showTimings("new JsonRpcClient per call", fresh)
+    showTimings("pooled keep-alive client", pooled)
+
+def benchTxLog(args):
+    # work on a throwaway log so the real one is never touched
+    tmp = tempfile.mkdtemp()
+    xrpurr.TX_LOG_FILE = os.path.join(tmp, "txlog.jsonl")
+    xrpurr.LEGACY_TX_LOG_FILE = os.path.join(tmp, "txlog.json")
+    xrpurr.TX_LOG_INDEX_FILE = os.path.join(tmp, "txlog.idx.json")
+    dests = [f"rDest{i:05d}" for i in range(1000)]
+    hashes = []
+    t0 = time.perf_counter()
+    with open(xrpurr.TX_LOG_FILE, "w") as f:
+        for i in range(args.n):
+            h = f"{i:064X}"
+            hashes.append(h)
+            entry = {
+                "timestamp": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T12:00:00+00:00",
+                "destination": random.choice(dests),
+                "amount_xrp": 1.5,
+                "destination_tag": random.randrange(100),
+                "hash": h,
+                "result": "tesSUCCESS"
+            }
+            f.write(json.dumps(entry) + "\n")
+    print(f"wrote {args.n} entries in {time.perf_counter()-t0:.2f}s")
+    t0 = time.perf_counter()
+    xrpurr.load_tx_log_index()
+    print(f"full index build: {(time.perf_counter()-t0)*1000:.0f} ms")
+    xrpurr._TX_INDEX = None
+    t0 = time.perf_counter()
+    xrpurr.load_tx_log_index()
+    print(f"index load from disk: {(time.perf_counter()-t0)*1000:.0f} ms")
+    timings = {"hash": [], "destination": [], "date range": [], "last 20": []}
+    for _ in range(200):
+        t0 = time.perf_counter()
+        xrpurr.query_tx_log(tx_hash=random.choice(hashes))
+        timings["hash"].append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        xrpurr.query_tx_log(destination=random.choice(dests), limit=50)
+        timings["destination"].append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        xrpurr.query_tx_log(since="2025-03-01", until="2025-03-03", limit=50)
+        timings["date range"].append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        xrpurr.tail_tx_log(20)
+        timings["last 20"].append(time.perf_counter() - t0)
+    for label, samples in timings.items():
+        showTimings(f"lookup by {label}", samples)
+    t0 = time.perf_counter()
+    list(xrpurr.read_tx_log())[-20:]
+    print(f"old full-parse 'last 20' for comparison: {(time.perf_counter()-t0)*1000:.0f} ms")
+
+class CannedResponse:
+    # stands in for an XRPL answer so the send flow runs without a network
+    result = {
+        "account_data": {"Balance": "50000000", "OwnerCount": 0},
+        "hash": "AB" * 32,
+        "meta": {"TransactionResult": "tesSUCCESS"},
+        "validated": True
+    }
+
+    def is_successful(self):
+        return True
+
+def benchSettings(args):
+    from xrpl.transaction import sign
+    from xrpl.wallet import Wallet
+    tmp = tempfile.mkdtemp()
+    xrpurr.SETTINGS_FILE = os.path.join(tmp, "settings.json")
+    xrpurr.TX_LOG_FILE = os.path.join(tmp, "txlog.jsonl")
+    xrpurr.LEGACY_TX_LOG_FILE = os.path.join(tmp, "txlog.json")
+    xrpurr.TX_LOG_INDEX_FILE = os.path.join(tmp, "txlog.idx.json")
+    # the synchronous send path; background sends would go to the network
+    xrpurr.save_settings({**xrpurr.DEFAULT_SETTINGS, "background_sends": False})
+    xrpurr.hedged_read = lambda func, *a, **k: CannedResponse()
+    xrpurr.try_all_clients = lambda func, *a, **k: CannedResponse()
+    # signing is local, only the autofill values are canned
+    xrpurr.sign_once = lambda tx, wallet: sign(type(tx).from_dict({**tx.to_dict(), "sequence": 1, "fee": "12", "last_ledger_sequence": 100}), wallet)
+    xrpurr.pause = lambda *a, **k: None
+    xrpurr.clear_screen = lambda: None
+    realLoad = xrpurr.load_settings
+    calls = [0]
+    def countingLoad():
+        calls[0] += 1
+        return realLoad()
+    xrpurr.load_settings = countingLoad
+    wallet = Wallet.create()
+    dest = Wallet.create().address
+    # start cold, as a fresh process would
+    xrpurr._SETTINGS_CACHE["settings"] = None
+    xrpurr._SETTINGS_CACHE["disk_reads"] = 0
+    for _ in range(args.n):
+        # what send_xrp_manual does after the user confirms
+        xrpurr.load_settings()
+        xrpurr.getBalance(wallet.address)
+        xrpurr.load_settings()
+        xrpurr.sendXrp(wallet, dest, 1, None)
+    print(f"\n{args.n} send flows: {calls[0]} load_settings() calls "
+          f"(each was a disk read + parse before), {xrpurr._SETTINGS_CACHE['disk_reads']} disk reads now")
+
+def benchSends(args):
+    # needs a node that accepts anything, e.g. tools/standin.py
+    import builtins
+    from xrpl.models.transactions import Payment
+    from xrpl.transaction import submit_and_wait
+    from xrpl.wallet import Wallet
+    tmp = tempfile.mkdtemp()
+    xrpurr.SETTINGS_FILE = os.path.join(tmp, "settings.json")
+    xrpurr.TX_LOG_FILE = os.path.join(tmp, "txlog.jsonl")
+    xrpurr.LEGACY_TX_LOG_FILE = os.path.join(tmp, "txlog.json")
+    xrpurr.TX_LOG_INDEX_FILE = os.path.join(tmp, "txlog.idx.json")
+    xrpurr.XRPL_ENDPOINTS = [args.url]
+    xrpurr.XRPL_WS_ENDPOINTS = [args.ws] if args.ws else []
+    xrpurr.pause = lambda *a, **k: None
+    xrpurr.clear_screen = lambda: None
+    xrpurr.fetch_dtag_accounts_without_flag = lambda: []
+    calls = {}
+    def counted(impl):
+        async def _request_impl(self, request, **kwargs):
+            calls[request.method.value] = calls.get(request.method.value, 0) + 1
+            return await impl(self, request, **kwargs)
+        return _request_impl
+    xrpurr.PooledJsonRpcClient._request_impl = counted(xrpurr.PooledJsonRpcClient._request_impl)
+    xrpurr.PooledAsyncJsonRpcClient._request_impl = counted(xrpurr.PooledAsyncJsonRpcClient._request_impl)
+    dest = Wallet.create().address
+
+    def report(label, t0):
+        detail = ", ".join(f"{k} {v}" for k, v in sorted(calls.items()))
+        print(f"{label:<44} {sum(calls.values()):4} RPCs in {time.perf_counter()-t0:5.1f}s ({detail})")
+        calls.clear()
+
+    wallet = Wallet.create()
+    t0 = time.perf_counter()
+    for _ in range(args.n):
+        # the old sendXrp: balance check, then autofill + sign + submit + wait per payment
+        xrpurr.getBalance(wallet.address)
+        submit_and_wait(Payment(account=wallet.address, amount="1000000", destination=dest), xrpurr.get_client(args.url), wallet)
+    report(f"{args.n} sends, autofill each time", t0)
+    realPrint, realInput = builtins.print, builtins.input
+    for background in (False, True):
+        xrpurr.save_settings({**xrpurr.DEFAULT_SETTINGS, "background_sends": background, "ledger_stream": bool(args.ws)})
+        wallet = Wallet.create()
+        xrpurr._NETWORK_CACHE.update(fee=None, ledger=None)
+        answers = iter([dest, "", "1", "y"] * args.n)
+        builtins.input = lambda *a: next(answers)
+        builtins.print = lambda *a, **k: None
+        t0 = time.perf_counter()
+        try:
+            for _ in range(args.n):
+                xrpurr.send_xrp_manual(wallet, xrpurr.load_settings())
+            xrpurr.wait_for_pending_transactions()
+        finally:
+            builtins.print, builtins.input = realPrint, realInput
+        report(f"{args.n} sends via send_xrp_manual" + (", background" if background else ""), t0)
+
+def benchPortfolio(args):
+    # against tools/standin.py --latency 0.05 or so, so round trips cost something
+    from xrpl.core.addresscodec import encode_classic_address
+    from xrpl.models.requests import AccountInfo
+    tmp = tempfile.mkdtemp()
+    xrpurr.SETTINGS_FILE = os.path.join(tmp, "settings.json")
+    xrpurr.XRPL_ENDPOINTS = [args.url]
+    xrpurr.XRPL_WS_ENDPOINTS = [args.ws] if args.ws else []
+    addrs = [encode_classic_address(os.urandom(20)) for _ in range(args.n)]
+    xrpurr.save_settings({**xrpurr.DEFAULT_SETTINGS, "hedged_reads": False})
+    xrpurr.get_client(args.url).request(AccountInfo(account=addrs[0], ledger_index="validated"))  # connect
+    t0 = time.perf_counter()
+    xrpurr.get_client(args.url).request(AccountInfo(account=addrs[0], ledger_index="validated"))
+    rtt = time.perf_counter() - t0
+    print(f"{args.n} accounts, one round trip {rtt*1000:.0f} ms")
+    t0 = time.perf_counter()
+    for a in addrs:
+        # what option 4 does, once per wallet
+        xrpurr.hedged_read(lambda c: c.request(AccountInfo(account=a, ledger_index="validated")))
+    print(f"{'one at a time':<38} {time.perf_counter() - t0:6.2f}s")
+    for stream in ((False, True) if args.ws else (False,)):
+        xrpurr.save_settings({**xrpurr.DEFAULT_SETTINGS, "ledger_stream": stream})
+        for run in ("cold", "warm"):
+            t0 = time.perf_counter()
+            snapshot = xrpurr.fetch_portfolio(addrs)
+            elapsed = time.perf_counter() - t0
+            ok = sum(1 for r in snapshot["rows"] if not r["error"])
+            label = f"fetch_portfolio, {'WebSocket' if stream else 'JSON-RPC pool'}, {run}"
+            print(f"{label:<38} {elapsed:6.2f}s ({elapsed / rtt:4.1f} round trips, {ok}/{args.n} read at ledger {snapshot['ledger']})")
+
+def benchHistory(args):
+    # against tools/standin.py --history ACCOUNT:COUNT, which seeds the account's past ledgers
+    import tracemalloc
+    tmp = tempfile.mkdtemp()
+    xrpurr.SETTINGS_FILE = os.path.join(tmp, "settings.json")
+    xrpurr.HISTORY_DIR = tmp
+    xrpurr.XRPL_ENDPOINTS = [args.url]
+    # imports and the connection are not part of what a page costs
+    xrpurr.hedged_read(lambda c: c.request(xrpurr.Ledger(ledger_index="validated")))
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    n = xrpurr.sync_account_history(args.account)
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    size = os.path.getsize(os.path.join(tmp, f"{args.account}.jsonl"))
+    print(f"full sync: {n:,} transactions in {elapsed:.1f}s ({n / max(elapsed, 1e-9):,.0f}/s), "
+          f"peak Python memory {peak / 1e6:.1f} MB, store {size / 1e6:.1f} MB")
+    time.sleep(xrpurr.LEDGER_CLOSE_SECONDS)
+    t0 = time.perf_counter()
+    n = xrpurr.sync_account_history(args.account)
+    print(f"incremental sync a ledger or two later: {n} new in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+def benchArchives(args):
+    # a throwaway archive directory: one archive per month over two years, as rotation leaves them
+    from decimal import Decimal
+    tmp = tempfile.mkdtemp()
+    xrpurr.TX_ARCHIVE_DIR = tmp
+    xrpurr.TX_LOG_FILE = os.path.join(tmp, "txlog.jsonl")
+    xrpurr.LEGACY_TX_LOG_FILE = os.path.join(tmp, "txlog.json")
+    xrpurr.TX_LOG_INDEX_FILE = os.path.join(tmp, "txlog.idx.json")
+    dests = [f"rDest{i:05d}" for i in range(1000)]
+    months = [(2024 + m // 12, 1 + m % 12) for m in range(24)]
+    for year, month in months:
+        with open(os.path.join(tmp, f"xrpurr_txlog_{year}{month:02d}28_000000.jsonl"), "w") as f:
+            for i in range(args.n):
+                f.write(json.dumps({"timestamp": f"{year}-{month:02d}-{1 + i % 28:02d}T12:00:00+00:00",
+                                    "destination": random.choice(dests), "amount_xrp": str(random.randrange(1, 10000) / 100),
+                                    "destination_tag": random.randrange(100), "hash": f"{i:064X}",
+                                    "result": random.choice(["tesSUCCESS"] * 9 + ["FAILED"])}) + "\n")
+    plain = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+    target = random.choice(dests)
+
+    def oldTotal(since, until):
+        # what answering it took before: every archive parsed in full
+        total = Decimal(0)
+        for name in os.listdir(tmp):
+            if name.endswith(".jsonl"):
+                with open(os.path.join(tmp, name)) as f:
+                    for e in map(json.loads, f):
+                        if e["destination"] == target and since <= e["timestamp"][:10] <= until and e["result"] == "tesSUCCESS":
+                            total += Decimal(e["amount_xrp"])
+        return total
+
+    queries = [("last year", "2025-01-01", "2025-12-31"), ("mid-month to mid-month", "2025-03-15", "2025-06-14")]
+    old = {}
+    for label, since, until in queries:
+        t0 = time.perf_counter()
+        old[label] = oldTotal(since, until)
+        print(f"{label:<24} plain archives, full parse: {(time.perf_counter() - t0) * 1000:7.0f} ms")
+    t0 = time.perf_counter()
+    xrpurr.finish_archives()
+    packed = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+    print(f"{len(months)} archives x {args.n:,} entries compressed and summarized in {time.perf_counter() - t0:.1f}s: "
+          f"{plain / 1e6:.1f} MB -> {packed / 1e6:.1f} MB")
+    for label, since, until in queries:
+        t0 = time.perf_counter()
+        totals = xrpurr.sent_totals(target, since, until)
+        elapsed = (time.perf_counter() - t0) * 1000
+        same = "matches" if Decimal(totals["xrp"]) == old[label] else f"MISMATCH vs {old[label]}"
+        print(f"{label:<24} summaries: {elapsed:7.1f} ms ({totals['summaries']} from summaries, {totals['opened']} opened, "
+              f"{totals['skipped']} skipped; {totals['xrp']} XRP, {same})")
+
+def benchWallets(args):
+    # a throwaway wallets directory with n files, as the manifest sees them after a rebuild
+    from xrpl.core.addresscodec import encode_classic_address
+    tmp = tempfile.mkdtemp()
+    xrpurr.wallets_dir = tmp
+    xrpurr.WALLET_MANIFEST_FILE = os.path.join(tmp, "wallets_manifest.json")
+    names = ["xrpurr_wallet.dat"] + [f"xrpurr_wallet_{i}.dat" for i in range(1, args.n)]
+    for name in names:
+        with open(os.path.join(tmp, name), "wb") as f:
+            f.write(b"gAAAAA")
+    t0 = time.perf_counter()
+    manifest = xrpurr.rebuild_wallet_manifest()
+    rebuild = time.perf_counter() - t0
+    addrs = [encode_classic_address(os.urandom(20)) for _ in names]
+    for name, address in zip(names, addrs):
+        manifest["wallets"][name]["address"] = address
+    xrpurr.save_wallet_manifest(manifest)
+    print(f"{args.n:,} wallet files; rebuilding the index takes {rebuild*1000:.0f} ms")
+
+    def oldNext():
+        base = os.path.join(tmp, "xrpurr_wallet.dat")
+        if not os.path.exists(base):
+            return base
+        i = 1
+        while os.path.exists(os.path.join(tmp, f"xrpurr_wallet_{i}.dat")):
+            i += 1
+        return os.path.join(tmp, f"xrpurr_wallet_{i}.dat")
+
+    def oldList():
+        files = [f for f in os.listdir(tmp) if f.endswith(".dat")]
+        files.sort(key=lambda x: os.path.getmtime(os.path.join(tmp, x)), reverse=True)
+        return files
+
+    def coldLoad():
+        xrpurr._WALLET_MANIFEST["manifest"] = None
+        return xrpurr.load_wallet_manifest()
+
+    probe = random.choice(addrs)
+    rows = [("next file name, probing", oldNext),
+            ("next file name, manifest", xrpurr.get_next_wallet_file),
+            ("listing, listdir + getmtime", oldList),
+            ("listing, manifest", xrpurr.wallet_entries),
+            ("manifest load after a change", coldLoad),
+            ("find file by address", lambda: xrpurr.find_wallet_file(probe))]
+    for label, func in rows:
+        reps = 20 if "probing" in label or "listdir" in label or "load" in label else 1000
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            func()
+        print(f"{label:<32} {(time.perf_counter() - t0) / reps * 1000:9.3f} ms")
+    print("finding a file by address before: decrypt files one by one until it matches")
+
+def benchKdf(args):
+    # unlock cost: the old single SHA-256, a calibrated KDF cold, and the same unlock from the cache
+    t0 = time.perf_counter()
+    params = xrpurr.calibrate_wallet_kdf(args.target)
+    print(f"calibrated for {args.target} ms in {(time.perf_counter() - t0) * 1000:.0f} ms: {xrpurr.describe_wallet_kdf(params)}")
+    xrpurr.load_settings = lambda: {"wallet_unlock_cache_minutes": 5}
+    seed = xrpurr.Wallet.create().seed
+    v0 = xrpurr.Fernet(xrpurr.getFernetKeyFromPassword("hunter2")).encrypt(seed.encode())
+    v1 = xrpurr.encrypt_wallet_seed(seed, "hunter2", params)
+    xrpurr.clear_unlock_cache()
+    rows = [("format 0 (SHA-256)", lambda: xrpurr.decrypt_wallet_data(v0, "hunter2"), None),
+            ("format 1, derived", lambda: xrpurr.decrypt_wallet_data(v1, "hunter2"), xrpurr.clear_unlock_cache),
+            ("format 1, cached key", lambda: xrpurr.decrypt_wallet_data(v1, "hunter2"), None)]
+    for label, func, reset in rows:
+        times = []
+        for _ in range(args.reps):
+            t0 = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - t0)
+            if reset:
+                reset()
+        print(f"{label:<22} {statistics.median(times) * 1000:9.2f} ms")
+
+def benchDtag(args):
+    import tracemalloc
+    from xrpl.core.addresscodec import encode_classic_address
+    tmp = tempfile.mkdtemp()
+    ids = [os.urandom(20) for _ in range(args.n)]
+    addrs = [encode_classic_address(i) for i in ids]
+    csvText = "n,address\n" + "".join(f"{i},{a}\n" for i, a in enumerate(addrs))
+    misses = [encode_classic_address(os.urandom(20)) for _ in range(2000)]
+    hits = random.sample(addrs, 2000)
+    print(f"{args.n:,} accounts")
+
+    # what a process did before: parse the CSV into a set of address strings
+    t0 = time.perf_counter()
+    accounts = xrpurr.csv.reader(xrpurr.StringIO(csvText))
+    next(accounts)
+    accounts = {row[1] for row in accounts}
+    setLoad = time.perf_counter() - t0
+    # again under tracemalloc, which slows it down too much to time
+    tracemalloc.start()
+    measured = {row.split(",")[1] for row in csvText.splitlines()[1:]}
+    setBytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del measured
+    path = os.path.join(tmp, "dtag.idx")
+    t0 = time.perf_counter()
+    data = xrpurr.build_account_index(ids)
+    build = time.perf_counter() - t0
+    with open(path, "wb") as f:
+        f.write(data)
+    plainPath = os.path.join(tmp, "plain.idx")
+    with open(plainPath, "wb") as f:
+        f.write(xrpurr.build_account_index(ids, bloom_bits=0))
+    t0 = time.perf_counter()
+    index = xrpurr.AccountIndex.open(path)
+    indexLoad = time.perf_counter() - t0
+    plain = xrpurr.AccountIndex.open(plainPath)
+    print(f"set of strings:   {setBytes / args.n:6.0f} bytes/account, load {setLoad*1000:8.2f} ms (CSV parse)")
+    print(f"account index:    {len(data) / args.n:6.1f} bytes/account, load {indexLoad*1000:8.2f} ms (mmap), build {build*1000:.0f} ms on refresh")
+    assert all(a in index for a in hits) and all(a in plain for a in hits)
+    rows = [("set, by address", lambda a: a in accounts, hits, misses),
+            ("index+Bloom, by address", lambda a: a in index, hits, misses),
+            ("index+Bloom, by account ID", index.contains_id, [ids[addrs.index(a)] for a in hits[:200]] * 10, [os.urandom(20) for _ in range(2000)]),
+            ("index only, by account ID", plain.contains_id, [ids[addrs.index(a)] for a in hits[:200]] * 10, [os.urandom(20) for _ in range(2000)])]
+    for label, test, hitKeys, missKeys in rows:
+        timings = []
+        for keys in (hitKeys, missKeys):
+            t0 = time.perf_counter()
+            for k in keys:
+                test(k)
+            timings.append((time.perf_counter() - t0) / len(keys) * 1e6)
+        print(f"{label:<28} hit {timings[0]:7.2f} us | miss {timings[1]:7.2f} us")
+    falsePositives = sum(index.may_contain(os.urandom(20)) for _ in range(20000))
+    print(f"misses answered by the Bloom filter alone: {100 - falsePositives / 200:.1f}%")
+
+def oldIsValidAddress(address):
+    # the checks xrpurr made before the table-driven decoder: Bitcoin alphabet, length, no checksum
+    chars = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+    if not address or not isinstance(address, str) or not address.startswith("r") or not (25 <= len(address) <= 35):
+        return False
+    if not all(c in chars for c in address):
+        return False
+    num = 0
+    for c in address:
+        num = num * 58 + chars.index(c)
+    try:
+        num.to_bytes(25, byteorder='big')
+    except OverflowError:
+        return False
+    return True
+
+def benchBase58(args):
+    from xrpl.core.addresscodec import encode_classic_address, is_valid_classic_address
+    addrs = [encode_classic_address(os.urandom(20)) for _ in range(args.n)]
+    # one character changed, the usual typo
+    typos = []
+    for a in addrs[:2000]:
+        i = random.randrange(1, len(a))
+        typos.append(a[:i] + random.choice(xrpurr.XRPL_ALPHABET.replace(a[i], "")) + a[i + 1:])
+    print(f"{len(addrs):,} addresses, {len(typos):,} with one character changed")
+    rows = [("old is_valid_xrp_address", lambda batch: [oldIsValidAddress(a) for a in batch]),
+            ("xrpl-py is_valid_classic_address", lambda batch: [is_valid_classic_address(a) for a in batch]),
+            ("is_valid_xrp_address", lambda batch: [xrpurr.is_valid_xrp_address(a) for a in batch]),
+            ("validate_xrp_addresses (batch)", xrpurr.validate_xrp_addresses)]
+    for label, check in rows:
+        t0 = time.perf_counter()
+        ok = check(addrs)
+        elapsed = time.perf_counter() - t0
+        caught = len(typos) - sum(check(typos))
+        print(f"{label:<34} {elapsed / len(addrs) * 1e6:7.2f} us/address | valid {sum(ok):,}/{len(addrs):,} | typos caught {caught:,}/{len(typos):,}")
+
+def benchVanity(args):
+    from xrpl.core.addresscodec import encode_classic_address
+    from xrpl.wallet import Wallet
+    # the encoder must agree with xrpl-py, leading zero bytes included
+    ids = [os.urandom(20) for _ in range(1000)] + [b"\x00" * k + os.urandom(20 - k) for k in range(1, 6) for _ in range(200)]
+    wrong = [i for i in ids if xrpurr.encode_classic_address(i) != encode_classic_address(i)]
+    print(f"address encoding checked against xrpl-py: {len(ids) - len(wrong):,}/{len(ids):,} agree")
+    if wrong:
+        sys.exit(1)
+    t0 = time.perf_counter()
+    for _ in range(args.baseline):
+        Wallet.create().address
+    old = args.baseline / (time.perf_counter() - t0)
+    gen = xrpurr.vanity_candidates()
+    t0 = time.perf_counter()
+    for _ in range(args.n):
+        next(gen)
+    new = args.n / (time.perf_counter() - t0)
+    print(f"Wallet.create loop:     {old:12,.0f} candidates/sec/core")
+    print(f"batched key pipeline:   {new:12,.0f} candidates/sec/core ({new/old:,.0f}x)")
+    addrs = [address for _, address in (next(gen) for _ in range(20_000))]
+    for count in (1, 50):
+        patterns = [xrpurr.parse_vanity_pattern("r" + "".join(random.choice(xrpurr.XRPL_ALPHABET) for _ in range(5)) + ("/i" if i % 2 else ""))
+                    for i in range(count)]
+        matcher = xrpurr.compile_vanity_patterns(patterns)
+        t0 = time.perf_counter()
+        for a in addrs:
+            xrpurr.match_vanity(matcher, a)
+        print(f"matching {count:>2} pattern(s):   {(time.perf_counter()-t0)/len(addrs)*1e6:12.2f} us/candidate")
+
+# cryptography.fernet is imported up front, since loadWallet catches its InvalidToken
+HEAVY_MODULES = ("xrpl", "httpx", "asyncio", "urllib.request", "concurrent.futures")
+
+def importTimes(code):
+    # `python -X importtime` on a fresh interpreter: [(module, self us, cumulative us, depth)], in
+    # the order they finished, so a module's own imports come right before it, one level deeper
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        selfUs, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(selfUs), int(cumulative), (len(name) - len(name.lstrip())) // 2))
+    return rows, proc.stdout
+
+def importedUnder(rows, module):
+    # the rows for module and everything it imported
+    end = next(i for i, r in enumerate(rows) if r[0] == module)
+    start = end
+    while start > 0 and rows[start - 1][3] > rows[end][3]:
+        start -= 1
+    return rows[start:end + 1]
+
+def benchStartup(args):
+    # measure the cached-bytecode start a frozen or installed build gets, not a recompile
+    py_compile.compile(xrpurr.__file__, cfile=importlib.util.cache_from_source(xrpurr.__file__))
+    runs = [importedUnder(importTimes("import xrpurr")[0], "xrpurr") for _ in range(args.n)]
+    importMs = statistics.median(r[-1][2] for r in runs) / 1000
+    rows = runs[-1]
+    leaked = sorted(r[0] for r in rows if r[0].startswith(HEAVY_MODULES))
+    print(f"import xrpurr: {importMs:.1f} ms (median of {args.n}), budget {xrpurr.STARTUP_BUDGET_MS} ms")
+    print("slowest modules it pulls in (self time):")
+    for name, selfUs, _, _ in sorted(rows, key=lambda r: -r[1])[:args.top]:
+        print(f"  {name:<40} {selfUs / 1000:7.1f} ms")
+    # what startup paid before the heavy imports were deferred; now paid on first use
+    _, out = importTimes("import json, xrpurr\n"
+                         "for o in list(vars(xrpurr).values()):\n"
+                         "    if isinstance(o, xrpurr._LazyImport): o._resolve()\n"
+                         "print(json.dumps(xrpurr.lazy_modules_loaded()))")
+    deferred = json.loads(out)
+    print(f"deferred to first use: {sum(deferred.values()) * 1000:.0f} ms")
+    for label, sec in sorted(deferred.items(), key=lambda kv: -kv[1]):
+        if sec >= 0.001:
+            print(f"  {label:<40} {sec * 1000:7.1f} ms")
+    if leaked:
+        print(f"FAIL: imported at startup: {', '.join(leaked)}")
+    if importMs > xrpurr.STARTUP_BUDGET_MS:
+        print(f"FAIL: over the startup budget by {importMs - xrpurr.STARTUP_BUDGET_MS:.1f} ms")
+    if leaked or importMs > xrpurr.STARTUP_BUDGET_MS:
+        sys.exit(1)
+
+def main():
+    parser = argparse.ArgumentParser(description="xrpurr micro-benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+    p = sub.add_parser("rpc", help="per-request latency, fresh clients vs the keep-alive pool")
+    p.add_argument("--url", help="XRPL JSON-RPC endpoint (default: first configured endpoint)")
+    p.add_argument("-n", type=int, default=20)
+    p.set_defaults(func=benchRpc)
+    p = sub.add_parser("txlog", help="transaction log index build and lookup times")
+    p.add_argument("-n", type=int, default=300_000)
+    p.set_defaults(func=benchTxLog)
+    p = sub.add_parser("settings", help="settings disk reads made by the send flow")
+    p.add_argument("-n", type=int, default=10)
+    p.set_defaults(func=benchSettings)
+    p = sub.add_parser("sends", help="RPCs made by repeated sends, against a stand-in node (tools/standin.py)")
+    p.add_argument("--url", default="http://127.0.0.1:5005/")
+    p.add_argument("--ws", help="WebSocket URL for ledger-stream confirmation, e.g. ws://127.0.0.1:6006/")
+    p.add_argument("-n", type=int, default=10)
+    p.set_defaults(func=benchSends)
+    p = sub.add_parser("portfolio", help="portfolio balances, one at a time vs concurrent, against a stand-in node (tools/standin.py --latency)")
+    p.add_argument("--url", default="http://127.0.0.1:5005/")
+    p.add_argument("--ws", help="WebSocket URL, e.g. ws://127.0.0.1:6006/")
+    p.add_argument("-n", type=int, default=100)
+    p.set_defaults(func=benchPortfolio)
+    p = sub.add_parser("history", help="account history sync: full and incremental, against a stand-in node (tools/standin.py --history)")
+    p.add_argument("account")
+    p.add_argument("--url", default="http://127.0.0.1:5005/")
+    p.set_defaults(func=benchHistory)
+    p = sub.add_parser("archives", help="totals across transaction log archives: full parse vs summaries")
+    p.add_argument("-n", type=int, default=20000, help="entries per archive")
+    p.set_defaults(func=benchArchives)
+    p = sub.add_parser("wallets", help="wallets directory: probing and listing vs the manifest")
+    p.add_argument("-n", type=int, default=2000)
+    p.set_defaults(func=benchWallets)
+    p = sub.add_parser("kdf", help="wallet unlock time: format 0, calibrated KDF, unlock cache")
+    p.add_argument("--target", type=int, default=500, help="unlock time to calibrate for, ms")
+    p.add_argument("--reps", type=int, default=5)
+    p.set_defaults(func=benchKdf)
+    p = sub.add_parser("dtag", help="destination-tag account list: memory, load and lookup, set vs index")
+    p.add_argument("-n", type=int, default=50_000)
+    p.set_defaults(func=benchDtag)
+    p = sub.add_parser("base58", help="address validation: old checks vs the table-driven decoder and the batch API")
+    p.add_argument("-n", type=int, default=20_000)
+    p.set_defaults(func=benchBase58)
+    p = sub.add_parser("vanity", help="vanity candidates per second on one core")
+    p.add_argument("-n", type=int, default=50_000)
+    p.add_argument("--baseline", type=int, default=200, help="Wallet.create calls to time (slow)")
+    p.set_defaults(func=benchVanity)
+    p = sub.add_parser("startup", help="import time of xrpurr.py against its budget (-X importtime); exits 1 when over")
+    p.add_argument("-n", type=int, default=5)
+    p.add_argument("--top", type=int, default=10)
+    p.set_defaults(func=benchStartup)
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
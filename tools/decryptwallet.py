@@ -1,21 +1,24 @@
-from cryptography.fernet import Fernet, InvalidToken
-import base64
-import hashlib
+import getpass
+import os
+import sys
 
-def getFernetKeyFromPassword(password):
-    key = hashlib.sha256(password.encode()).digest()
-    return base64.urlsafe_b64encode(key)
+from cryptography.fernet import InvalidToken
 
-filename = "src/xrpurr_wallet.dat"
-password = input("Enter your wallet password: ")
-key = getFernetKeyFromPassword(password)
-f = Fernet(key)
+# reads every wallet file format the main app writes
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import xrpurr
+
+filename = sys.argv[1] if len(sys.argv) > 1 else "src/xrpurr_wallet.dat"
+password = getpass.getpass("Enter your wallet password: ")
 
 with open(filename, "rb") as fp:
     enc = fp.read()
 
 try:
-    seed = f.decrypt(enc).decode()
+    seed, fmt = xrpurr.decrypt_wallet_data(enc, password)
+    print(f"Wallet file format {fmt}.")
     print("Your secret key (seed) is:", seed)
 except InvalidToken:
-    print("Incorrect password or corrupted file.")
\ No newline at end of file
+    print("Incorrect password or corrupted file.")
+except ValueError as e:
+    print(e)
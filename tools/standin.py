@@ -0,0 +1,232 @@
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import websockets
+from xrpl.models.transactions.transaction import Transaction
+
+# A local stand-in for an XRPL node, enough to exercise xrpurr's send path without a network:
+# JSON-RPC over HTTP plus a WebSocket with the ledger and accounts streams. A ledger closes every
+# --ledger-seconds and every accepted transaction lands in the next one. It does not check
+# signatures or balances. GET /api/v3/simple/price answers like the CoinGecko price feed.
+# --latency adds a fixed delay to every answer, to stand in for the network round trip.
+#
+#   python tools/standin.py
+#   then in xrpurr.py: XRPL_ENDPOINTS = ["http://127.0.0.1:5005/"], XRPL_WS_ENDPOINTS = ["ws://127.0.0.1:6006/"]
+#   and run it with XRPURR_PRICE_URL=http://127.0.0.1:5005/api/v3/simple/price
+
+oldest = 1  # first ledger this node keeps; --first-ledger makes it a node without full history
+state = {"ledger": 1000, "sequences": {}, "txs": {}, "by_account": {}, "calls": {}}
+lock = threading.Lock()
+subscribers = {}  # websocket -> {"ledger": bool, "accounts": set}
+latency = 0.0  # seconds added to every answer
+# rough XRP prices; each request moves them a little so refreshes are visible
+prices = {"usd": 0.5, "eur": 0.46, "gbp": 0.39, "jpy": 75.0, "cad": 0.68, "aud": 0.76,
+          "chf": 0.44, "cny": 3.6, "krw": 680.0, "inr": 42.0, "brl": 2.7, "mxn": 9.1}
+
+def seedHistory(account, count):
+    # count validated payments to account spread over past ledgers, for history sync tests;
+    # they do not touch sequences, so sends still work as usual
+    sender = "rHb9CJAWyB4rj91VRWn96DkukG4bwdtyTh"
+    with lock:
+        state["ledger"] = max(state["ledger"], count // 10 + 1000)
+        first = state["ledger"] - count // 10 - 1
+        for i in range(count):
+            txHash = f"{len(state['txs']):064X}"
+            addTx(txHash, first + i // 10, {"TransactionType": "Payment", "Account": sender, "Destination": account,
+                                            "Amount": str(1000 + i), "Fee": "12", "Sequence": i + 1, "hash": txHash})
+
+def addTx(txHash, ledger, txJson):
+    # caller holds the lock
+    state["txs"][txHash] = {"ledger": ledger, "tx_json": txJson}
+    for account in {txJson["Account"], txJson.get("Destination")} - {None}:
+        state["by_account"].setdefault(account, []).append(txHash)
+
+def handleCommand(method, params):
+    with lock:
+        state["calls"][method] = state["calls"].get(method, 0) + 1
+        ledger = state["ledger"]
+        if method == "server_info":
+            return {"info": {"build_version": "standin", "validated_ledger": {"seq": ledger},
+                             "complete_ledgers": f"{oldest}-{ledger}"}}
+        if method == "ledger":
+            return {"ledger_index": ledger, "ledger_hash": f"{ledger:064X}", "validated": True}
+        if method == "ledger_current":
+            return {"ledger_current_index": ledger + 1}
+        if method == "fee":
+            return {"drops": {"base_fee": "10", "median_fee": "5000", "minimum_fee": "10", "open_ledger_fee": "10"},
+                    "current_queue_size": "0", "max_queue_size": "2000"}
+        if method == "account_info":
+            account = params["account"]
+            result = {"account_data": {"Account": account, "Balance": "100000000", "OwnerCount": 0,
+                                       "Sequence": state["sequences"].setdefault(account, 1)}}
+            at = params.get("ledger_index")
+            if at == "validated" or isinstance(at, int):
+                result.update(ledger_index=ledger if at == "validated" else at, validated=True)
+            else:
+                result.update(ledger_current_index=ledger + 1, validated=False)
+            return result
+        if method == "submit":
+            tx = Transaction.from_blob(params["tx_blob"])
+            txHash = tx.get_hash()
+            expected = state["sequences"].setdefault(tx.account, 1)
+            if txHash in state["txs"] or tx.sequence < expected:
+                return {"engine_result": "tefPAST_SEQ", "engine_result_message": "This sequence number has already passed."}
+            if tx.sequence > expected:
+                return {"engine_result": "terPRE_SEQ", "engine_result_message": "Missing/inapplicable prior transaction."}
+            state["sequences"][tx.account] = expected + 1
+            addTx(txHash, ledger + 1, tx.to_xrpl())
+            return {"engine_result": "tesSUCCESS", "engine_result_message": "The transaction was applied.",
+                    "tx_json": {**tx.to_xrpl(), "hash": txHash}}
+        if method == "tx":
+            entry = state["txs"].get(params["transaction"])
+            if entry is None:
+                return {"error": "txnNotFound", "error_message": "Transaction not found."}
+            return {"hash": params["transaction"], "tx_json": entry["tx_json"], "ledger_index": entry["ledger"],
+                    "validated": entry["ledger"] <= ledger, "meta": {"TransactionResult": "tesSUCCESS"}}
+        if method == "account_tx":
+            low = params.get("ledger_index_min", -1)
+            high = params.get("ledger_index_max", -1)
+            low = oldest if low == -1 else max(low, oldest)
+            high = ledger if high == -1 else min(high, ledger)
+            hashes = [h for h in state["by_account"].get(params["account"], []) if low <= state["txs"][h]["ledger"] <= high]
+            if not params.get("forward"):
+                hashes.reverse()  # newest first, like rippled
+            start = int(params.get("marker") or 0)
+            limit = min(params.get("limit", 200), 400)
+            rows = [{"hash": h, "ledger_index": state["txs"][h]["ledger"], "tx_json": state["txs"][h]["tx_json"], "validated": True,
+                     "meta": {"TransactionResult": "tesSUCCESS", "delivered_amount": state["txs"][h]["tx_json"].get("Amount")}}
+                    for h in hashes[start:start + limit]]
+            result = {"account": params["account"], "transactions": rows,
+                      "ledger_index_min": low, "ledger_index_max": high}
+            if start + limit < len(hashes):
+                result["marker"] = str(start + limit)
+            return result
+    return {"error": "unknownCmd", "error_message": f"Unknown method: {method}"}
+
+class RpcHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(latency)
+        result = handleCommand(body["method"], (body.get("params") or [{}])[0])
+        result["status"] = "error" if "error" in result else "success"
+        out = json.dumps({"result": result}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/api/v3/simple/price":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        wanted = parse_qs(url.query).get("vs_currencies", ["usd"])[0].split(",")
+        drift = random.uniform(0.99, 1.01)
+        with lock:
+            for c in prices:
+                prices[c] *= drift
+            out = json.dumps({"ripple": {c: round(prices[c], 6) for c in wanted if c in prices}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, *args):
+        pass
+
+async def wsReply(ws, msg):
+    # like rippled, requests on one socket are answered independently, not one after another
+    await asyncio.sleep(latency)
+    command = msg.get("command")
+    if command == "subscribe":
+        subscribers[ws]["ledger"] |= "ledger" in msg.get("streams", [])
+        subscribers[ws]["accounts"].update(msg.get("accounts", []))
+        with lock:
+            result = {"ledger_index": state["ledger"]}
+    else:
+        result = handleCommand(command, msg)
+    reply = {"id": msg.get("id"), "type": "response", "result": result,
+             "status": "error" if "error" in result else "success"}
+    try:
+        await ws.send(json.dumps(reply))
+    except websockets.ConnectionClosed:
+        pass
+
+async def wsHandler(ws):
+    subscribers[ws] = {"ledger": False, "accounts": set()}
+    try:
+        async for raw in ws:
+            asyncio.ensure_future(wsReply(ws, json.loads(raw)))
+    except websockets.ConnectionClosed:
+        pass
+    finally:
+        subscribers.pop(ws, None)
+
+async def closeLedgers(seconds):
+    while True:
+        await asyncio.sleep(seconds)
+        with lock:
+            state["ledger"] += 1
+            ledger = state["ledger"]
+            closed = [(h, e) for h, e in state["txs"].items() if e["ledger"] == ledger]
+        # same order as rippled: ledgerClosed, then that ledger's transactions
+        for ws, subs in list(subscribers.items()):
+            messages = []
+            if subs["ledger"]:
+                messages.append({"type": "ledgerClosed", "ledger_index": ledger, "ledger_hash": f"{ledger:064X}"})
+            for h, e in closed:
+                if subs["accounts"] & {e["tx_json"]["Account"], e["tx_json"].get("Destination")}:
+                    messages.append({"type": "transaction", "validated": True, "ledger_index": ledger, "hash": h,
+                                     "tx_json": e["tx_json"], "meta": {"TransactionResult": "tesSUCCESS"},
+                                     "engine_result": "tesSUCCESS"})
+            for m in messages:
+                try:
+                    await ws.send(json.dumps(m))
+                except websockets.ConnectionClosed:
+                    break
+
+async def serve(args):
+    if args.ws_port:
+        await websockets.serve(wsHandler, args.host, args.ws_port)
+        print(f"WebSocket on ws://{args.host}:{args.ws_port}/")
+    await closeLedgers(args.ledger_seconds)
+
+def main():
+    parser = argparse.ArgumentParser(description="local XRPL stand-in for testing xrpurr")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5005, help="JSON-RPC port")
+    parser.add_argument("--ws-port", type=int, default=6006, help="WebSocket port, 0 to run without one")
+    parser.add_argument("--ledger-seconds", type=float, default=4.0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of simulated round trip per answer")
+    parser.add_argument("--first-ledger", type=int, default=1, help="oldest ledger kept, to act as a node without full history")
+    parser.add_argument("--history", metavar="ACCOUNT:COUNT", action="append", default=[],
+                        help="give ACCOUNT COUNT incoming payments in past ledgers (repeatable)")
+    args = parser.parse_args()
+    for spec in args.history:
+        account, _, count = spec.partition(":")
+        seedHistory(account, int(count))
+    global latency, oldest
+    latency = args.latency
+    oldest = args.first_ledger
+    server = ThreadingHTTPServer((args.host, args.port), RpcHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"JSON-RPC on http://{args.host}:{args.port}/, a ledger every {args.ledger_seconds}s")
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,85 +1,175 @@
-import concurrent.futures
-import threading
+import multiprocessing
+import queue
+import sys
 import time
 import os
-from xrpl.wallet import Wallet
-from cryptography.fernet import Fernet
 import getpass
 import string
 
+# shares the candidate generator with the main app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import xrpurr
+
+# how often a worker publishes its attempt count; larger means less shared-memory traffic
+REPORT_EVERY = 4096
+CHECKPOINT_FILE = "vanity_checkpoint.json"  # next to vanity_wallet.dat; holds counts, never seeds
+
 def showAllowedChars():
     allowed = "r + base58check (no 0, O, I, l), length 25-35. More than 4-5 characters is increasingly difficult to find a match for."
     chars = "r" + ''.join([c for c in "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"])
     print(f"Allowed characters for XRP addresses:\n{chars}\n\nSummary: {allowed}")
 
-def generateWorker(prefix, caseSensitive, stopEvent, resultDict, workerId):
-    create = Wallet.create
-    plen = len(prefix)
-    prefixC = prefix if caseSensitive else prefix.lower()
+def generateWorker(patterns, stopEvent, foundFlags, counters, resultQueue, workerId):
+    # runs in its own process: key derivation is CPU work, so threads would share one core
+    matcher = xrpurr.compile_vanity_patterns(patterns)
+    match = xrpurr.match_vanity
     attempts = 0
-    while not stopEvent.is_set():
-        w = create()
-        addrPart = w.address[:plen] if caseSensitive else w.address[:plen].lower()
-        if addrPart == prefixC:
-            # Only first thread to succeed sets result
-            if not stopEvent.is_set():
-                resultDict['address'] = w.address
-                resultDict['seed'] = w.seed
-                resultDict['attempts'] = attempts
-                resultDict['workerId'] = workerId
-                stopEvent.set()
-            break
-        attempts += 1
-        if attempts % 10000 == 0:
-            print(f"Attempts: {attempts}... still searching.")
+    try:
+        for entropy, address in xrpurr.vanity_candidates():
+            attempts += 1
+            hits = match(matcher, address)
+            if hits:
+                # patterns another worker already found are dropped here, not in the parent
+                hits = [i for i in hits if not foundFlags[i]]
+                if hits:
+                    resultQueue.put({'entropy': entropy, 'address': address, 'hits': hits, 'attempts': attempts, 'workerId': workerId})
+            if attempts % REPORT_EVERY == 0:
+                counters[workerId] = attempts
+                if stopEvent.is_set():
+                    break
+    except KeyboardInterrupt:
+        # Ctrl-C reaches every worker; the parent does the reporting
+        pass
+    # final count, so the totals include the attempts since the last report
+    counters[workerId] = attempts
+
+def runSearch(patterns, workers, checkpointPath=CHECKPOINT_FILE):
+    """
+    Search for every pattern at once with one process per worker, until each pattern has a hit
+    or Ctrl-C. Progress is checkpointed so the same search picks up where it stopped.
+    Returns (list of hit dicts, per-worker attempts, elapsed this run, interrupted).
+    """
+    stopEvent = multiprocessing.Event()
+    # one slot per worker, each written by a single process, so no lock is needed
+    counters = multiprocessing.Array('q', workers, lock=False)
+    foundFlags = multiprocessing.Array('b', len(patterns), lock=False)  # written by the parent only
+    resultQueue = multiprocessing.Queue()
+    found = {}  # pattern index -> address
+    priorAttempts, priorElapsed = 0, 0.0
+    checkpoint = xrpurr.load_vanity_checkpoint(checkpointPath, patterns)
+    if checkpoint:
+        priorAttempts, priorElapsed = checkpoint['attempts'], checkpoint['elapsed']
+        for i, p in enumerate(patterns):
+            if p['text'] in checkpoint['found']:
+                found[i] = checkpoint['found'][p['text']]
+                foundFlags[i] = 1
+        print(f"Resuming from checkpoint: {priorAttempts:,} attempts over {xrpurr.format_duration(priorElapsed)}, {len(found)} pattern(s) already found.")
+    procs = [multiprocessing.Process(target=generateWorker, args=(patterns, stopEvent, foundFlags, counters, resultQueue, i), daemon=True)
+             for i in range(workers)]
+    t0 = time.time()
+    for p in procs:
+        p.start()
+    results = []
+    lastReport = lastCheckpoint = t0
+    interrupted = False
+
+    def saveProgress():
+        xrpurr.save_vanity_checkpoint(checkpointPath, patterns, priorAttempts + sum(counters), priorElapsed + time.time() - t0, found)
 
-def getEncryptionKey():
-    import base64
-    import hashlib
-    pw = getpass.getpass("Enter a password to encrypt your seed: ").encode()
-    key = base64.urlsafe_b64encode(hashlib.sha256(pw).digest())
-    return key
+    try:
+        while len(found) < len(patterns):
+            try:
+                hit = resultQueue.get(timeout=0.25)
+                new = [i for i in hit['hits'] if i not in found]
+                if new:
+                    for i in new:
+                        found[i] = hit['address']
+                        foundFlags[i] = 1
+                    # only winners pay for the seed encoding
+                    hit['seed'] = xrpurr.vanity_wallet(hit.pop('entropy')).seed
+                    hit['hits'] = new
+                    results.append(hit)
+                    print(f"Found {hit['address']} for {', '.join(patterns[i]['text'] for i in new)} ({len(found)}/{len(patterns)})")
+            except queue.Empty:
+                pass
+            now = time.time()
+            if now - lastReport >= 5:
+                # the hardest pattern still missing sets the pace
+                expected = max(xrpurr.vanity_difficulty(p) for i, p in enumerate(patterns) if i not in found)
+                print(xrpurr.vanity_progress(priorAttempts + sum(counters), priorElapsed + now - t0, expected))
+                lastReport = now
+            if now - lastCheckpoint >= xrpurr.VANITY_CHECKPOINT_EVERY:
+                saveProgress()
+                lastCheckpoint = now
+            if not any(p.is_alive() for p in procs):
+                break
+    except KeyboardInterrupt:
+        interrupted = True
+    finally:
+        stopEvent.set()
+        for p in procs:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+    if len(found) == len(patterns):
+        xrpurr.clear_vanity_checkpoint(checkpointPath)
+    else:
+        saveProgress()
+    elapsed = time.time() - t0
+    return results, list(counters), elapsed, interrupted
+
+def showThroughput(perWorker, elapsed):
+    total = sum(perWorker)
+    elapsed = max(elapsed, 1e-9)
+    for i, n in enumerate(perWorker, 1):
+        print(f"  Worker {i}: {n:,} attempts ({int(n / elapsed):,}/sec)")
+    print(f"Total: {total:,} attempts in {elapsed:.2f}s | Rate: {int(total / elapsed):,} attempts/sec")
+
+def getEncryptionPassword():
+    return getpass.getpass("Enter a password to encrypt your seed: ")
 
-def saveEncryptedSeed(seed, filename="vanity_wallet.dat"):
-    key = getEncryptionKey()
-    f = Fernet(key)
-    token = f.encrypt(seed.encode())
-    with open(filename, "wb") as out:
-        out.write(token)
+def saveEncryptedSeed(seed, filename="vanity_wallet.dat", password=None):
+    # same file format as wallets saved by the main app, so it can load these too
+    if password is None:
+        password = getEncryptionPassword()
+    xrpurr.write_wallet_file(filename, xrpurr.encrypt_wallet_seed(seed, password))
     print(f"Seed encrypted and saved to {filename}.")
 
 def main():
     showAllowedChars()
-    prefix = input("Enter desired prefix (e.g., rMiaCat): ").strip()
-    if not prefix.startswith("r") or len(prefix) < 2:
-        print("Prefix must start with 'r' and be at least 2 chars."); return
+    print("Several patterns can be searched at once: separate them with commas, use *abc for a suffix,\nand add /i to a single pattern to ignore case for it.")
+    text = input("Enter desired prefixes (e.g., rMiaCat, rRuby, *xrp): ").strip()
     caseSel = input("Case sensitive match? (y/N): ").strip().lower()
     caseSensitive = caseSel == "y"
+    try:
+        patterns = [xrpurr.parse_vanity_pattern(t, caseSensitive) for t in text.split(",") if t.strip()]
+    except ValueError as e:
+        print(e); return
+    if not patterns:
+        print("Enter at least one pattern."); return
     cpuTotal = os.cpu_count() or 4
     cpu = max(1, int(cpuTotal * 0.75))
-    stopEvent = threading.Event()
-    resultDict = {}
-    csText = "case-sensitive" if caseSensitive else "case-insensitive"
-    print(f"Searching for address beginning with: '{prefix}...' ({csText}); Using {cpu} of {cpuTotal} threads...")
-    t0 = time.time()
-    with concurrent.futures.ThreadPoolExecutor(max_workers=cpu) as executor:
-        futures = []
-        for i in range(cpu):
-            futures.append(executor.submit(generateWorker, prefix, caseSensitive, stopEvent, resultDict, i+1))
-        # Wait for any thread to finish
-        while not stopEvent.is_set():
-            time.sleep(0.05)
-        # Cancel all threads
-        for f in futures:
-            f.cancel()
-    elapsed = time.time() - t0
-    addr = resultDict.get('address')
-    seed = resultDict.get('seed')
-    attempts = resultDict.get('attempts', 0)
-    workerId = resultDict.get('workerId', '?')
-    print(f"\nFound {addr}\nBy thread {workerId} after {attempts} attempts")
-    print(f"Time: {elapsed:.2f}s | Rate: {int(attempts*cpu/elapsed)} attempts/sec")
-    saveEncryptedSeed(seed)
+    desc = ", ".join(f"'{p['body']}' ({p['kind']}, {'case-sensitive' if p['case_sensitive'] else 'case-insensitive'})" for p in patterns)
+    print(f"Searching for: {desc}; Using {cpu} of {cpuTotal} cores (one process each)...")
+    for p in patterns:
+        print(f"  {p['text']}: about 1 in {xrpurr.vanity_difficulty(p):,.0f} addresses")
+    results, perWorker, elapsed, interrupted = runSearch(patterns, cpu)
+    if interrupted:
+        print(f"\nSearch paused; progress saved to {CHECKPOINT_FILE}. Run the same search again to resume.")
+    if not results:
+        if not interrupted:
+            print("Search stopped without a match.")
+        return
+    print()
+    for r in results:
+        print(f"{r['address']} ({', '.join(patterns[i]['text'] for i in r['hits'])}) by worker {r['workerId'] + 1} after {r['attempts']:,} of its own attempts")
+    showThroughput(perWorker, elapsed)
+    password = getEncryptionPassword()
+    if len(results) == 1:
+        saveEncryptedSeed(results[0]['seed'], password=password)
+    else:
+        for r in results:
+            saveEncryptedSeed(r['seed'], f"vanity_{r['address']}.dat", password=password)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,25 +1,128 @@
-import asyncio
+import time 
+STARTUP_T0 = time.perf_counter()  # for the time-to-first-menu figure in show_dev_info
+import importlib
+import sys
 
-from decimal import MIN_EMIN
+from decimal import MIN_EMIN, Decimal, InvalidOperation
 from io import StringIO
 import random
+import copy
+import bisect
+import mmap
+import struct
 import csv
+import shutil
 import os
 import hashlib
+import hmac
+import gzip
+import math
 import base64
 import getpass
 import json
-import time 
+from json import JSONDecodeError
+import threading
+import atexit
 from datetime import datetime, timezone
-from xrpl.wallet import Wallet
-from xrpl.clients import JsonRpcClient
-from xrpl.models.transactions import Payment, AccountDelete
-from xrpl.models.requests import AccountInfo
-from xrpl.transaction import submit_and_wait
-from xrpl.utils import xrp_to_drops, drops_to_xrp
-from cryptography.fernet import Fernet, InvalidToken
-import urllib.request
 import traceback  
+from cryptography.fernet import Fernet, InvalidToken  # InvalidToken is caught in loadWallet, so not deferred
+
+# xrpl-py, httpx, urllib and asyncio take most of a second to import (longer from the one-file
+# binary) and nothing before the first menu needs them, so their names below are stand-ins that
+# import the real module on first use. cryptography.fernet is the exception: its InvalidToken is
+# caught in loadWallet, and it costs about 13 ms. Check the budget with
+# `python tools/benchmark.py startup`.
+STARTUP_BUDGET_MS = 60  # import of this module; about 37 ms measured, the rest is headroom for slower disks
+_STARTUP = {"import": None, "first_menu": None}  # seconds since STARTUP_T0
+_LAZY_LOADED = {}  # loader label -> seconds it took, for show_dev_info
+_LAZY_LOCK = threading.RLock()  # one import at a time, so background threads cannot deadlock on a half-imported package
+
+class _LazyImport:
+    """
+    Stand-in for a name whose module is not imported yet. The first call, attribute access or
+    isinstance check runs the loader, which replaces every name it provides in this module's
+    globals with the real object; later lookups never see the stand-in. Names from one loader
+    resolve together. Exception classes named in an except clause must not be deferred: a
+    stand-in there is a TypeError whenever the try block failed before touching the module.
+    """
+
+    def __init__(self, name, label, loader, names):
+        self._name = name
+        self._label = label
+        self._loader = loader
+        self._names = names
+
+    def _resolve(self):
+        with _LAZY_LOCK:
+            current = globals().get(self._name)
+            if current is not self and current is not None:
+                return current
+            t0 = time.perf_counter()
+            objs = self._loader()
+            globals().update(zip(self._names, objs))
+            _LAZY_LOADED[self._label] = time.perf_counter() - t0
+            return globals()[self._name]
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __instancecheck__(self, obj):
+        return isinstance(obj, self._resolve())
+
+    def __repr__(self):
+        return f"<lazy {self._name} from {self._label}>"
+
+def lazy(label, loader, *names):
+    """Bind names to stand-ins; loader() returns their real objects, in the same order."""
+    for name in names:
+        globals()[name] = _LazyImport(name, label, loader, names)
+
+def lazy_from(module, *names):
+    """Deferred `from module import a, b as c`; names are given as "a" or "b as c"."""
+    attrs = [n.split(" as ")[0].strip() for n in names]
+    lazy(module, lambda: [getattr(importlib.import_module(module), a) for a in attrs],
+         *[n.split(" as ")[-1].strip() for n in names])
+
+def lazy_module(name, *submodules):
+    """Deferred `import name` (plus `import name.sub` for each of submodules)."""
+    def load():
+        for m in submodules or (name,):
+            importlib.import_module(m)
+        return [sys.modules[name]]
+    lazy(", ".join(submodules or (name,)), load, name)
+
+def lazy_modules_loaded():
+    """Label -> seconds for every deferred import that has run so far."""
+    return dict(_LAZY_LOADED)
+
+def preload_modules():
+    """Resolve the deferred imports on a background thread while the user reads the menu."""
+    def run():
+        for obj in list(globals().values()):
+            if isinstance(obj, _LazyImport):
+                try:
+                    obj._resolve()
+                except Exception:
+                    pass  # a missing module is reported where it is first used
+    threading.Thread(target=run, name="xrpurr-preload", daemon=True).start()
+
+lazy_module("asyncio")
+lazy_module("concurrent", "concurrent.futures")
+lazy_from("xrpl.wallet", "Wallet")
+lazy_from("xrpl.models.transactions", "Payment", "AccountDelete")
+lazy_from("xrpl.models.requests", "AccountInfo", "AccountTx", "Ledger", "ServerInfo", "SubmitOnly", "Subscribe", "StreamParameter", "Tx")
+lazy_from("xrpl.transaction", "submit_and_wait", "sign", "autofill_and_sign")
+lazy_from("xrpl.asyncio.clients", "AsyncWebsocketClient")
+lazy_from("xrpl.asyncio.transaction", "submit as async_submit")
+lazy_from("xrpl.asyncio.ledger", "get_latest_validated_ledger_sequence as async_get_latest_validated_ledger_sequence")
+lazy_from("xrpl.ledger", "get_fee", "get_latest_validated_ledger_sequence")
+lazy_from("xrpl.core.binarycodec", "encode")
+lazy_from("xrpl.utils", "xrp_to_drops", "drops_to_xrp")
+lazy_module("urllib", "urllib.request", "urllib.error")
+lazy_module("httpx")  # installed with xrpl-py
 
 BASEDIR = os.path.dirname(os.path.abspath(__file__))
 VERSION = '1.2'
@@ -30,35 +133,169 @@ XRPL_ENDPOINTS = [
     "https://xrplcluster.com/",
     "https://xrpl.ws/"
 ]
+# WebSocket endpoints for the ledger stream, used to confirm sends without polling
+XRPL_WS_ENDPOINTS = [
+    "wss://s1.ripple.com/",
+    "wss://xrplcluster.com/",
+    "wss://xrpl.ws/"
+]
 testnetUrl = "https://s.altnet.rippletest.net:51234/"
-client = JsonRpcClient(XRPL_ENDPOINTS[0])
+testnetWsUrl = "wss://s.altnet.rippletest.net:51233/"
 testmode = True
 if testmode == True:
     XRPL_ENDPOINTS = [testnetUrl]
+    XRPL_WS_ENDPOINTS = [testnetWsUrl]
+
+# Shared keep-alive connection pool, so repeated calls skip the TCP + TLS handshake
+POOL_MAX_CONNECTIONS = 10
+POOL_MAX_KEEPALIVE = 5  # idle connections kept open across all endpoints
+POOL_KEEPALIVE_EXPIRY = 30  # seconds before an idle connection is closed
+_HTTP_POOL = None
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+def _pooled_client_class():
+    from xrpl.clients import JsonRpcClient, XRPLRequestFailureException
+    from xrpl.asyncio.clients.client import REQUEST_TIMEOUT
+    from xrpl.asyncio.clients.utils import json_to_response, request_to_json_rpc
+
+    class PooledJsonRpcClient(JsonRpcClient):
+        """JsonRpcClient that sends every request over the shared keep-alive pool."""
+
+        async def _request_impl(self, request, *, timeout=REQUEST_TIMEOUT):
+            # xrpl-py drives sync clients through asyncio.run(), which gives every call a
+            # fresh event loop, so the pool is a blocking httpx.Client that outlives them
+            response = _http_pool().post(self.url, json=request_to_json_rpc(request), timeout=timeout)
+            try:
+                return json_to_response(response.json())
+            except JSONDecodeError:
+                raise XRPLRequestFailureException({
+                    "error": response.status_code,
+                    "error_message": response.text
+                })
+
+    return [PooledJsonRpcClient]
+
+lazy("PooledJsonRpcClient", _pooled_client_class, "PooledJsonRpcClient")
+
+def _http_pool():
+    global _HTTP_POOL
+    with _CLIENTS_LOCK:
+        if _HTTP_POOL is None:
+            _HTTP_POOL = httpx.Client(limits=httpx.Limits(
+                max_connections=POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=POOL_MAX_KEEPALIVE,
+                keepalive_expiry=POOL_KEEPALIVE_EXPIRY
+            ))
+        return _HTTP_POOL
+
+def get_client(url):
+    """Return the shared client for an endpoint, creating it on first use."""
+    with _CLIENTS_LOCK:
+        c = _CLIENTS.get(url)
+        if c is None:
+            c = _CLIENTS[url] = PooledJsonRpcClient(url)
+        return c
 
 def get_redundant_clients():
-    """Return a list of JsonRpcClient objects for all endpoints."""
-    return [JsonRpcClient(url) for url in XRPL_ENDPOINTS]
+    """Return the shared clients for all endpoints."""
+    return [get_client(url) for url in XRPL_ENDPOINTS]
+
+def close_client_pool():
+    global _HTTP_POOL
+    with _CLIENTS_LOCK:
+        if _HTTP_POOL is not None:
+            _HTTP_POOL.close()
+            _HTTP_POOL = None
+        _CLIENTS.clear()
+
+atexit.register(close_client_pool)
+
+# Per-endpoint health, kept for the life of the process. Latency and error rate are
+# exponentially weighted so a node that recovers climbs back up the ranking.
+ENDPOINT_EWMA_ALPHA = 0.3
+ENDPOINT_BREAKER_THRESHOLD = 3  # consecutive failures before a node is taken out of rotation
+ENDPOINT_BREAKER_COOLDOWN = 60  # seconds before a tripped node gets a trial request again
+_ENDPOINT_HEALTH = {}
+
+def _endpoint_state(url):
+    return _ENDPOINT_HEALTH.setdefault(url, {
+        "latency": None,  # EWMA seconds, None until the first answer
+        "error_rate": 0.0,
+        "failures": 0,  # consecutive
+        "calls": 0,
+        "opened_at": None  # set while the circuit breaker is open
+    })
+
+def record_endpoint_result(url, elapsed, ok):
+    state = _endpoint_state(url)
+    state["calls"] += 1
+    a = ENDPOINT_EWMA_ALPHA
+    state["error_rate"] = (1 - a) * state["error_rate"] + a * (0.0 if ok else 1.0)
+    if ok:
+        if state["latency"] is None:
+            state["latency"] = elapsed
+        else:
+            state["latency"] = (1 - a) * state["latency"] + a * elapsed
+        state["failures"] = 0
+        state["opened_at"] = None
+    else:
+        state["failures"] += 1
+        if state["failures"] >= ENDPOINT_BREAKER_THRESHOLD:
+            # (re)open; a failed half-open trial restarts the cool-down
+            state["opened_at"] = time.time()
+
+def endpoint_breaker_open(url, now=None):
+    state = _endpoint_state(url)
+    if state["opened_at"] is None:
+        return False
+    now = time.time() if now is None else now
+    # after the cool-down the node is half-open and may take one trial request
+    return now - state["opened_at"] < ENDPOINT_BREAKER_COOLDOWN
+
+def ranked_endpoints():
+    """Return XRPL_ENDPOINTS ordered by live health, tripped nodes last."""
+    now = time.time()
+    def score(item):
+        idx, url = item
+        state = _endpoint_state(url)
+        # never-tried nodes sort first so each one gets probed once;
+        # nodes that have only ever failed sort after every answering node
+        if state["latency"] is not None:
+            latency = state["latency"]
+        else:
+            latency = float("inf") if state["calls"] else 0.0
+        return (endpoint_breaker_open(url, now), latency * (1 + 4 * state["error_rate"]), idx)
+    return [url for idx, url in sorted(enumerate(XRPL_ENDPOINTS), key=score)]
 
 def try_all_clients(func, *args, **kwargs):
-    # try all XRPL endpoints in order, may cause lag. Sometimes it sends before it even says it's done
+    # try XRPL endpoints healthiest first; tripped nodes are only used if everything else failed
     last_exception = None
     last_response = None
     txHash = kwargs.pop("txHash", None)
     txSeq = kwargs.pop("txSeq", None)
     txAccount = kwargs.pop("txAccount", None)
-    for idx, url in enumerate(XRPL_ENDPOINTS):
+    endpoints = ranked_endpoints()
+    for idx, url in enumerate(endpoints):
         try:
-            c = JsonRpcClient(url)
+            c = get_client(url)
             # Before fallback, check if txn is validated
             if idx > 0 and txHash and txAccount:
-                if isTxnValidated(c, txHash, txAccount, txSeq):
+                validated = isTxnValidated(c, txHash, txAccount, txSeq)
+                if validated:
                     print(f"Transaction already validated on fallback check at {url}!")
-                    return last_response
-            response = func(c, *args, **kwargs)
+                    return validated
+            t0 = time.perf_counter()
+            try:
+                response = func(c, *args, **kwargs)
+            except Exception:
+                record_endpoint_result(url, time.perf_counter() - t0, False)
+                raise
+            # any answer (even actNotFound) means the node itself is healthy
+            record_endpoint_result(url, time.perf_counter() - t0, True)
             last_response = response
             if hasattr(response, "is_successful") and response.is_successful():
-                if url != XRPL_ENDPOINTS[0]:
+                if idx > 0:
                     print(f"Notice: Fallback XRPL endpoint used: {url}")
                 return response
         except Exception as e:
@@ -68,66 +305,328 @@ def try_all_clients(func, *args, **kwargs):
         raise last_exception
     return last_response
 
+# Hedged reads: only for idempotent requests (AccountInfo and friends), never for submits
+_HEDGE_POOL = None
+_HEDGE_STATS = {
+    "last_winner": None,
+    "wins": {},  # url -> number of hedged reads that endpoint answered first
+    "hedges_fired": 0
+}
+
+def _hedge_pool():
+    global _HEDGE_POOL
+    if _HEDGE_POOL is None:
+        _HEDGE_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="xrpurr-hedge")
+    return _HEDGE_POOL
+
+def _timed_read(url, func, *args):
+    c = get_client(url)
+    t0 = time.perf_counter()
+    try:
+        response = func(c, *args)
+    except Exception:
+        record_endpoint_result(url, time.perf_counter() - t0, False)
+        raise
+    record_endpoint_result(url, time.perf_counter() - t0, True)
+    return response
+
+def hedged_read(func, *args):
+    """
+    Run a read-only request against the best endpoint, and fire a backup at the next
+    endpoint if no answer arrived within the hedge delay. The first successful answer wins.
+    Falls back to the serial try_all_clients when hedging is off or there is nothing to hedge to.
+    """
+    settings = load_settings()
+    endpoints = ranked_endpoints()
+    if not settings.get("hedged_reads", True) or len(endpoints) < 2:
+        return try_all_clients(func, *args)
+    delay = max(0, settings.get("hedge_delay_ms", 300)) / 1000.0
+    pool = _hedge_pool()
+    pending = {}
+    remaining = list(endpoints)
+    last_response = None
+    last_exception = None
+
+    def launch():
+        url = remaining.pop(0)
+        pending[pool.submit(_timed_read, url, func, *args)] = url
+
+    launch()
+    while pending:
+        # wait the hedge delay only while a backup is still available to fire
+        timeout = delay if remaining else None
+        done, _ = concurrent.futures.wait(pending, timeout=timeout, return_when=concurrent.futures.FIRST_COMPLETED)
+        if not done:
+            _HEDGE_STATS["hedges_fired"] += 1
+            launch()
+            continue
+        replace = False
+        for fut in done:
+            url = pending.pop(fut)
+            try:
+                response = fut.result()
+            except Exception as e:
+                last_exception = e
+                replace = True
+                print(f"Warning: XRPL endpoint {url} failed: {e}")
+                continue
+            if hasattr(response, "is_successful") and response.is_successful():
+                _HEDGE_STATS["last_winner"] = url
+                _HEDGE_STATS["wins"][url] = _HEDGE_STATS["wins"].get(url, 0) + 1
+                return response
+            last_response = response
+            replace = True
+        # a node failed or gave a non-success answer: bring in the next one right away
+        if replace and remaining:
+            launch()
+    if last_response is not None:
+        return last_response
+    if last_exception:
+        raise last_exception
+    return None
+
 def isTxnValidated(client, txHash, account, seq=None):
-    # Check if txn is in validated ledger
+    # Check if txn is in a validated ledger; returns the tx response if so, else None.
+    # Any validated result is final (tec included), so the caller must not resubmit.
     try:
-        req = {
-            "method": "tx",
-            "params": [{"transaction": txHash, "binary": False}]
-        }
-        resp = client.request(req)
+        resp = client.request(Tx(transaction=txHash))
         result = resp.result
-        if result.get("validated") and result.get("meta", {}).get("TransactionResult") == "tesSUCCESS":
+        if resp.is_successful() and result.get("validated"):
+            # API v2 nests the fields under tx_json, v1 has them at the top level
+            fields = result.get("tx_json", result)
             # Optionally check sequence
-            if seq is not None and result.get("Sequence") != seq:
-                return False
+            if seq is not None and fields.get("Sequence") != seq:
+                return None
             # Confirm account matches
-            if result.get("Account") != account:
-                return False
-            return True
-        return False
+            if fields.get("Account") != account:
+                return None
+            return resp
+        return None
     except Exception:
-        return False
+        return None
+
+def first_answer(func, *args):
+    """
+    Call func(client, *args) on the healthiest node that does not raise. For helpers that
+    return plain values; try_all_clients wants Response objects.
+    """
+    last_exception = None
+    for url in ranked_endpoints():
+        t0 = time.perf_counter()
+        try:
+            value = func(get_client(url), *args)
+        except Exception as e:
+            record_endpoint_result(url, time.perf_counter() - t0, False)
+            last_exception = e
+            print(f"Warning: XRPL endpoint {url} failed: {e}")
+            continue
+        record_endpoint_result(url, time.perf_counter() - t0, True)
+        return value
+    raise last_exception or Exception("No XRPL endpoints available")
+
+# Local account state: the next sequence per wallet, plus a cached fee and validated ledger
+# index, so a send is signed without the account_info/fee/ledger round trips autofill makes
+# every time. The ledger is only asked again after a sequence error or when a cache ages out.
+LEDGER_CLOSE_SECONDS = 4
+LAST_LEDGER_OFFSET = 20  # LastLedgerSequence headroom, same as autofill
+FEE_CACHE_SECONDS = 60
+LEDGER_CACHE_SECONDS = 60  # in between, the index is extrapolated from the close time
+_ACCOUNT_STATES = {}  # address -> next unused sequence
+_NETWORK_CACHE = {"fee": None, "fee_at": 0, "ledger": None, "ledger_at": 0}
+_ACCOUNT_LOCK = threading.Lock()
 
-def base58_decode(s):
-    base58_chars = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+def cached_fee():
+    now = time.time()
+    if _NETWORK_CACHE["fee"] is None or now - _NETWORK_CACHE["fee_at"] > FEE_CACHE_SECONDS:
+        _NETWORK_CACHE["fee"] = first_answer(get_fee)
+        _NETWORK_CACHE["fee_at"] = now
+    return _NETWORK_CACHE["fee"]
+
+def validated_ledger_estimate():
+    # a connected ledger stream knows the index for free
+    if _LEDGER_STREAM.client is not None and _LEDGER_STREAM.ledger_index:
+        return _LEDGER_STREAM.ledger_index
+    now = time.time()
+    if _NETWORK_CACHE["ledger"] is None or now - _NETWORK_CACHE["ledger_at"] > LEDGER_CACHE_SECONDS:
+        _NETWORK_CACHE["ledger"] = first_answer(get_latest_validated_ledger_sequence)
+        _NETWORK_CACHE["ledger_at"] = now
+        return _NETWORK_CACHE["ledger"]
+    return _NETWORK_CACHE["ledger"] + int((now - _NETWORK_CACHE["ledger_at"]) / LEDGER_CLOSE_SECONDS)
+
+def reserve_sequence(address):
+    """Hand out the next sequence for an account, reading it from the ledger only when unknown."""
+    with _ACCOUNT_LOCK:
+        sequence = _ACCOUNT_STATES.get(address)
+    if sequence is None:
+        # "current" includes transactions already applied to the open ledger
+        info = hedged_read(lambda c: c.request(AccountInfo(account=address, ledger_index="current")))
+        if not info or not info.is_successful():
+            raise Exception(f"Could not read account info: {getattr(info, 'result', info)}")
+        sequence = int(info.result["account_data"]["Sequence"])
+    with _ACCOUNT_LOCK:
+        # another send may have reserved while we were reading
+        sequence = max(sequence, _ACCOUNT_STATES.get(address, sequence))
+        _ACCOUNT_STATES[address] = sequence + 1
+    return sequence
+
+def forget_account_state(address):
+    with _ACCOUNT_LOCK:
+        _ACCOUNT_STATES.pop(address, None)
+
+def note_submit_result(signed, engine_result):
+    """
+    Adjust the local sequence after a submission. tes/tec use it up and any ter may still,
+    so those keep it reserved until the transaction is final; an expired one is given back
+    with forget_account_state. tem/tef/tel never apply, so the number is handed out again.
+    """
+    if engine_result.startswith(("tes", "tec", "ter")):
+        return
+    if engine_result.startswith(("telINSUF_FEE_P", "telCAN_NOT_QUEUE_FEE")):
+        _NETWORK_CACHE["fee"] = None
+    with _ACCOUNT_LOCK:
+        if engine_result == "tefPAST_SEQ":
+            _ACCOUNT_STATES.pop(signed.account, None)
+        elif _ACCOUNT_STATES.get(signed.account) == signed.sequence + 1:
+            # not applied and nothing reserved after it: hand the same number out again
+            _ACCOUNT_STATES[signed.account] = signed.sequence
+        else:
+            # later sends already hold later numbers, which would now be stuck behind a gap
+            _ACCOUNT_STATES.pop(signed.account, None)
+
+def prepare_transaction(tx, wallet):
+    """Fill Sequence, Fee and LastLedgerSequence from local state and sign; no round trips when warm."""
+    fields = tx.to_dict()
+    fields["fee"] = cached_fee()
+    fields["last_ledger_sequence"] = validated_ledger_estimate() + LAST_LEDGER_OFFSET
+    fields["sequence"] = reserve_sequence(wallet.address)
+    return sign(type(tx).from_dict(fields), wallet)
+
+def sign_once(tx, wallet):
+    """
+    Sign a transaction exactly once; nothing is submitted here, so the lookups may fail over
+    freely. The signed result is what every endpoint then gets.
+    """
+    if isinstance(tx, AccountDelete):
+        # the fee is the owner reserve, which autofill knows how to work out
+        return first_answer(lambda c: autofill_and_sign(tx, c, wallet))
+    return prepare_transaction(tx, wallet)
+
+def wait_for_validation(client_obj, tx_hash, last_ledger):
+    """Poll until a submitted transaction is validated; raises once it can no longer land."""
+    while True:
+        time.sleep(VALIDATION_POLL_SECONDS)
+        # ledger first: once it is past LastLedgerSequence an unvalidated tx can never land
+        current = get_latest_validated_ledger_sequence(client_obj)
+        resp = client_obj.request(Tx(transaction=tx_hash))
+        if resp.is_successful() and resp.result.get("validated"):
+            return resp
+        if current > last_ledger:
+            raise Exception(f"Transaction expired: ledger {current} is past LastLedgerSequence {last_ledger}")
+
+def _submit_signed(client_obj, signed):
+    # the submit is made here rather than in submit_and_wait, so a sequence error is seen
+    # straight away instead of after LastLedgerSequence runs out
+    resp = client_obj.request(SubmitOnly(tx_blob=encode(signed.to_xrpl())))
+    if not resp.is_successful():
+        return resp
+    prelim = resp.result.get("engine_result", "")
+    note_submit_result(signed, prelim)
+    if prelim == "tefPAST_SEQ":
+        # on failover this can be our own blob, already applied through the previous endpoint
+        if not client_obj.request(Tx(transaction=signed.get_hash())).is_successful():
+            raise Exception("tefPAST_SEQ: sequence already used; the account will be re-read on the next send")
+    elif not prelim.startswith(("tes", "tec", "ter")):
+        raise Exception(f"{prelim}: {resp.result.get('engine_result_message', '')}")
+    return wait_for_validation(client_obj, signed.get_hash(), signed.last_ledger_sequence)
+
+# XRPL base58 uses its own alphabet (not Bitcoin's). Decoding maps the whole string to digit
+# values in one str.translate call, instead of searching the alphabet per character, then folds
+# them into an integer one digit at a time.
+XRPL_ALPHABET = "rpshnaf39wBUDNEGHJKLM4PQRST7VWXYZ2bcdeCg65jkm8oFqi1tuvAxyz"
+# str.translate table: each alphabet character becomes its digit value, every other ASCII character is dropped
+_B58_DIGITS = str.maketrans({**{chr(c): None for c in range(128)}, **{c: chr(i) for i, c in enumerate(XRPL_ALPHABET)}})
+
+def base58_decode(s, length=25):
+    """Decode XRPL base58 into exactly `length` bytes; None if s is not a canonical encoding of that size."""
+    try:
+        digits = s.translate(_B58_DIGITS).encode("ascii")
+    except UnicodeEncodeError:
+        return None
+    if len(digits) != len(s) or not digits:
+        return None
     num = 0
-    for char in s:
-        if char not in base58_chars:
-            return None
-        num = num * 58 + base58_chars.index(char)
-    # Convert to bytes
-    b = num.to_bytes(25, byteorder='big')
-    # Leading zeros
-    n_pad = len(s) - len(s.lstrip('1'))
-    return b'\x00' * n_pad + b
+    for d in digits:
+        num = num * 58 + d
+    try:
+        b = num.to_bytes(length, "big")
+    except OverflowError:
+        return None
+    # each leading zero byte is one leading 'r', no more and no fewer
+    if len(s) - len(s.lstrip("r")) != length - len(b.lstrip(b"\x00")):
+        return None
+    return b
+
+def decode_account_id(address):
+    """Return the 20-byte account ID of a classic address, or None if it is malformed or fails its checksum."""
+    if not isinstance(address, str) or not (25 <= len(address) <= 35) or not address.startswith("r"):
+        return None
+    b = base58_decode(address)
+    # version byte 0, account ID, then the first 4 bytes of a double SHA-256 of the rest
+    if b is None or b[0] != 0 or hashlib.sha256(hashlib.sha256(b[:21]).digest()).digest()[:4] != b[21:]:
+        return None
+    return b[1:21]
 
 def is_valid_xrp_address(address):
-    base58_chars = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
-    if not address or not isinstance(address, str):
-        return False
-    if not address.startswith("r"):
-        return False
-    if not (25 <= len(address) <= 35):
-        return False
-    if not all(c in base58_chars for c in address):
-        return False
-    decoded = base58_decode(address)
-    if not decoded or len(decoded) != 25:
-        return False
-    return True
+    return decode_account_id(address) is not None
+
+def decode_account_ids(addresses):
+    """
+    Batch form of decode_account_id for address-book imports and batch payouts: one account
+    ID (or None) per address, in order. Repeated addresses are only decoded once.
+    """
+    seen = {}
+    out = []
+    decode = decode_account_id
+    for address in addresses:
+        try:
+            account_id = seen[address]
+        except KeyError:
+            account_id = seen[address] = decode(address)
+        except TypeError:
+            account_id = None  # unhashable, so certainly not an address
+        out.append(account_id)
+    return out
+
+def validate_xrp_addresses(addresses):
+    """Return a list of bools, True where the address is a valid classic address."""
+    return [account_id is not None for account_id in decode_account_ids(addresses)]
 
 # Wallets directory and file management is not great 
 wallets_dir = os.path.join(BASEDIR, "wallets")
 os.makedirs(wallets_dir, exist_ok=True)
 SETTINGS_FILE = os.path.join(BASEDIR, "src", "xrpurr_settings.json")
-TX_LOG_FILE = os.path.join(BASEDIR, "src", "xrpurr_txlog.json")
+TX_LOG_FILE = os.path.join(BASEDIR, "src", "xrpurr_txlog.jsonl")  # one JSON entry per line, append-only
+LEGACY_TX_LOG_FILE = os.path.join(BASEDIR, "src", "xrpurr_txlog.json")  # pre-1.3 single JSON array
+TX_LOG_INDEX_FILE = os.path.join(BASEDIR, "src", "xrpurr_txlog.idx.json")  # sidecar: hash/destination/tag/day -> byte offsets
 
 # Cache for dtag_accounts_without_flag list
+DTAG_LIST_URL = "https://xrpl.ws-stats.com/lists/f:dtag_accounts_without_flag"
+DTAG_CACHE_FILE = os.path.join(BASEDIR, "src", "dtag_accounts.json")  # ETag/Last-Modified of the last good list
+DTAG_INDEX_FILE = os.path.join(BASEDIR, "src", "dtag_accounts.idx")  # the list itself, see build_account_index
+DTAG_BLOOM_BITS = 10  # Bloom filter bits per account (about 1% false positives), 0 for none
+DTAG_BLOOM_HASHES = 5  # at most 5, one per 32-bit word of the account ID
+DTAG_REFRESH_SECONDS = 30 * 60
+DTAG_RETRY_SECONDS = 5 * 60  # after a failed refresh, while the last good copy is used
 _DTAG_ACCOUNTS_CACHE = {
     "accounts": None,
-    "last_fetch": 0
+    "last_fetch": 0,  # last time the server confirmed or replaced the list
+    "last_attempt": 0,
+    "etag": None,
+    "last_modified": None,
+    "loaded": False,
+    "refreshing": False
 }
+_DTAG_LOCK = threading.Lock()
 
 # Default settings structure
 DEFAULT_SETTINGS = {
@@ -135,8 +634,21 @@ DEFAULT_SETTINGS = {
     "never_require_dtag": False,
     "sanity_check_dtag": True,
     "tx_log_enabled": True,
+    "tx_log_fsync": False,  # fsync every log append; safer on power loss, slower
+    "tx_log_rotate_mb": 5,  # archive the log once it reaches this size, 0 for no size limit
+    "tx_log_rotate_days": 90,  # or once its oldest entry is this old, 0 for no age limit
     "debug": False,
-    "xrp_usd_conversion": False  # show USD conversion
+    "xrp_usd_conversion": False,  # show the balance in fiat_currency too
+    "fiat_currency": "usd",
+    "xrp_input_mode": "XRP",  # "XRP", or "FIAT" to enter send amounts in fiat_currency
+    "hedged_reads": True,  # race a backup endpoint on slow balance/account lookups
+    "hedge_delay_ms": 300,
+    "background_sends": True,  # return once a node accepts a send; validation is tracked in the background
+    "ledger_stream": True,  # confirm background sends from the WebSocket ledger stream instead of polling
+    "preload_modules": True,  # import xrpl-py and friends in the background once the menu is up
+    "wallet_kdf": None,  # key derivation for new wallet files; calibrated on the first save
+    "wallet_unlock_ms": 500,  # what calibration aims for, per unlock
+    "wallet_unlock_cache_minutes": 5  # keep derived keys this long after last use, 0 to never keep them
 }
 
 # if this ever changes it needs to be updated
@@ -149,53 +661,232 @@ def clear_screen():
 def pause(msg="Press any key to continue..."):
     input(msg)
 
+# Settings are parsed once per process and re-read only when the file's mtime/size changes.
+# Callers get their own copy, so editing it does nothing until save_settings is called.
+_SETTINGS_CACHE = {
+    "settings": None,
+    "stat": None,  # (mtime_ns, size) of the file the cached copy came from
+    "disk_reads": 0
+}
+
+def _settings_stat():
+    try:
+        st = os.stat(SETTINGS_FILE)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
 def load_settings():
-    if os.path.exists(SETTINGS_FILE):
+    stat = _settings_stat()
+    if _SETTINGS_CACHE["settings"] is not None and _SETTINGS_CACHE["stat"] == stat:
+        return copy.deepcopy(_SETTINGS_CACHE["settings"])
+    if stat is not None:
+        _SETTINGS_CACHE["disk_reads"] += 1
         try:
             with open(SETTINGS_FILE, "r") as f:
                 settings = json.load(f)
             # Fill in any missing keys with defaults
             for k, v in DEFAULT_SETTINGS.items():
                 if k not in settings:
-                    settings[k] = v
-            return settings
+                    settings[k] = copy.deepcopy(v)
         except Exception as e:
+            # cached against this stat too, so a broken file only warns once until it changes
             print(f"Warning: Could not load settings: {e}")
             time.sleep(3.5)
-            return DEFAULT_SETTINGS.copy()
+            settings = copy.deepcopy(DEFAULT_SETTINGS)
     else:
-        return DEFAULT_SETTINGS.copy()
+        settings = copy.deepcopy(DEFAULT_SETTINGS)
+    _SETTINGS_CACHE["settings"] = settings
+    _SETTINGS_CACHE["stat"] = stat
+    return copy.deepcopy(settings)
 
 def save_settings(settings):
+    # write-through: temp file + rename, so a crash never leaves half a settings file
+    tmp = SETTINGS_FILE + ".tmp"
     try:
-        with open(SETTINGS_FILE, "w") as f:
+        with open(tmp, "w") as f:
             json.dump(settings, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, SETTINGS_FILE)
+        _SETTINGS_CACHE["settings"] = copy.deepcopy(settings)
+        _SETTINGS_CACHE["stat"] = _settings_stat()
     except Exception as e:
         print(f"Warning: Could not save settings: {e}")
         time.sleep(3.5)
 
+# Wallet manifest: one small file next to the wallets with each file's name, public address,
+# label, creation time and format, kept in memory by file and by address. Listings need no
+# directory scan and no decryption, and the next free file name is a counter instead of a
+# probe. It is rewritten atomically on every save or delete; rebuild_wallet_manifest
+# recreates it from the directory (addresses of files it did not know come back as each
+# one is next unlocked).
+WALLET_MANIFEST_FILE = os.path.join(wallets_dir, "wallets_manifest.json")
+WALLET_MANIFEST_VERSION = 1
+WALLET_FORMAT = 1  # a header line naming the KDF, salt and parameters, then the Fernet token
+_WALLET_MANIFEST = {"manifest": None, "stat": None, "by_address": {}}
+_WALLET_LOCK = threading.RLock()
+
+def _wallet_manifest_stat():
+    try:
+        st = os.stat(WALLET_MANIFEST_FILE)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+def _wallet_file_name(index):
+    return "xrpurr_wallet.dat" if index == 0 else f"xrpurr_wallet_{index}.dat"
+
+def _wallet_file_index(name):
+    """The N of xrpurr_wallet_N.dat (0 for xrpurr_wallet.dat), None for any other name."""
+    if name == "xrpurr_wallet.dat":
+        return 0
+    n = name[len("xrpurr_wallet_"):-len(".dat")]
+    if name.startswith("xrpurr_wallet_") and name.endswith(".dat") and n.isdigit():
+        return int(n)
+    return None
+
+def _cache_wallet_manifest(manifest, stat):
+    _WALLET_MANIFEST["manifest"] = manifest
+    _WALLET_MANIFEST["stat"] = stat
+    _WALLET_MANIFEST["by_address"] = {e["address"]: name for name, e in manifest["wallets"].items() if e.get("address")}
+
+def load_wallet_manifest():
+    """
+    The manifest as {"version", "next_index", "wallets": {file name: entry}}, entries in the
+    order they were added. Cached until the file changes; built from the directory if missing.
+    Callers must not modify it; use the register/forget functions.
+    """
+    with _WALLET_LOCK:
+        stat = _wallet_manifest_stat()
+        if _WALLET_MANIFEST["manifest"] is not None and _WALLET_MANIFEST["stat"] == stat:
+            return _WALLET_MANIFEST["manifest"]
+        if stat is None:
+            return rebuild_wallet_manifest()
+        try:
+            with open(WALLET_MANIFEST_FILE, "r") as f:
+                manifest = json.load(f)
+            if manifest.get("version") != WALLET_MANIFEST_VERSION:
+                raise ValueError(f"unknown manifest version {manifest.get('version')}")
+        except Exception as e:
+            print(f"Warning: wallet index unreadable ({e}); rebuilding it from the wallets directory.")
+            return rebuild_wallet_manifest()
+        _cache_wallet_manifest(manifest, stat)
+        return manifest
+
+def save_wallet_manifest(manifest):
+    # temp file + rename, so a crash leaves either the old manifest or the new one
+    with _WALLET_LOCK:
+        tmp = WALLET_MANIFEST_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, WALLET_MANIFEST_FILE)
+        _cache_wallet_manifest(manifest, _wallet_manifest_stat())
+
+def rebuild_wallet_manifest():
+    """
+    Recreate the manifest from the .dat files in the wallets directory. Entries for files that
+    are still there keep their address and label; new files get the file's mtime as creation
+    time and no address until they are unlocked. Returns the new manifest.
+    """
+    with _WALLET_LOCK:
+        old = _WALLET_MANIFEST["manifest"]
+        if old is None and os.path.exists(WALLET_MANIFEST_FILE):
+            try:
+                with open(WALLET_MANIFEST_FILE, "r") as f:
+                    old = json.load(f)
+            except Exception:
+                old = None
+        known = old["wallets"] if old and isinstance(old.get("wallets"), dict) else {}
+        found = []
+        next_index = 0
+        for entry in os.scandir(wallets_dir):
+            if not entry.name.endswith(".dat") or not entry.is_file():
+                continue
+            index = _wallet_file_index(entry.name)
+            if index is not None:
+                next_index = max(next_index, index + 1)
+            e = known.get(entry.name) or {"address": None, "label": None, "created": entry.stat().st_mtime,
+                                          "format": wallet_file_format(entry.path)}
+            found.append((e["created"], entry.name, e))
+        found.sort(key=lambda t: t[0])
+        manifest = {"version": WALLET_MANIFEST_VERSION, "next_index": next_index,
+                    "wallets": {name: e for _, name, e in found}}
+        save_wallet_manifest(manifest)
+        return manifest
+
+def _updated_manifest(change):
+    # read-modify-write under the lock; the cached manifest itself is never mutated
+    with _WALLET_LOCK:
+        manifest = copy.deepcopy(load_wallet_manifest())
+        change(manifest)
+        save_wallet_manifest(manifest)
+        return manifest
+
 def get_next_wallet_file():
-    base_wallet_file = os.path.join(wallets_dir, "xrpurr_wallet.dat")
-    if not os.path.exists(base_wallet_file):
-        return base_wallet_file
-    i = 1
-    while True:
-        candidate = os.path.join(wallets_dir, f"xrpurr_wallet_{i}.dat")
-        if not os.path.exists(candidate):
-            return candidate
-        i += 1
+    manifest = load_wallet_manifest()
+    index = manifest["next_index"]
+    # a file copied in by hand since the last rebuild would be overwritten otherwise
+    while os.path.exists(os.path.join(wallets_dir, _wallet_file_name(index))):
+        index += 1
+    return os.path.join(wallets_dir, _wallet_file_name(index))
+
+def register_wallet_file(path, address, label=None, fmt=WALLET_FORMAT):
+    """Record a newly written wallet file in the manifest."""
+    name = os.path.basename(path)
+
+    def change(manifest):
+        manifest["wallets"].pop(name, None)  # re-added last, as the newest
+        manifest["wallets"][name] = {"address": address, "label": label or None, "created": time.time(), "format": fmt}
+        index = _wallet_file_index(name)
+        if index is not None:
+            manifest["next_index"] = max(manifest["next_index"], index + 1)
+    _updated_manifest(change)
+
+def forget_wallet_file(path):
+    """Drop a deleted wallet file from the manifest."""
+    name = os.path.basename(path)
+    if name in load_wallet_manifest()["wallets"]:
+        _updated_manifest(lambda manifest: manifest["wallets"].pop(name, None))
+
+def note_wallet_address(path, address, fmt=None):
+    """
+    Fill in the address of a file the manifest only knew by name, once it has been unlocked,
+    and its format if the unlock upgraded it.
+    """
+    name = os.path.basename(path)
+    entry = load_wallet_manifest()["wallets"].get(name)
+    fields = {"address": address} if fmt is None else {"address": address, "format": fmt}
+    if entry is not None and any(entry.get(k) != v for k, v in fields.items()):
+        _updated_manifest(lambda manifest: manifest["wallets"][name].update(fields))
+
+def wallet_entries():
+    """[(file name, entry)], newest first."""
+    return list(reversed(load_wallet_manifest()["wallets"].items()))
+
+def find_wallet_file(address):
+    """Path of the wallet file holding address, or None."""
+    load_wallet_manifest()
+    name = _WALLET_MANIFEST["by_address"].get(address)
+    return os.path.join(wallets_dir, name) if name else None
 
 def get_latest_wallet_file():
-    files = []
-    for fname in os.listdir(wallets_dir):
-        if fname.startswith("xrpurr_wallet") and fname.endswith(".dat"):
-            files.append(os.path.join(wallets_dir, fname))
-    if not files:
+    entries = wallet_entries()
+    if not entries:
         return os.path.join(wallets_dir, "xrpurr_wallet.dat")
-    files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-    return files[0]
+    return os.path.join(wallets_dir, entries[0][0])
+
+def describe_wallet_entry(name, entry):
+    parts = [name]
+    if entry.get("label"):
+        parts.append(f"'{entry['label']}'")
+    parts.append(entry.get("address") or "(address shown after first unlock)")
+    return " - ".join(parts)
 
-def log_transaction(tx_data):
+def log_transaction(tx_data, interactive=True):
+    # interactive=False for the background submitter: no prompts from another thread
     settings = load_settings()
     if not settings.get("tx_log_enabled", True):
         return
@@ -223,57 +914,769 @@ def log_transaction(tx_data):
         **clean_dict(tx_data)
     }
     try:
+        append_tx_log(log_entry, fsync=settings.get("tx_log_fsync", False))
+        if tx_log_rotation_due(settings):
+            archive_log(background=True)
+    except Exception as e:
+        if interactive:
+            print(f"Warning: Could not log transaction: {e}")
+            pause()
+
+def migrate_tx_log():
+    """One-time conversion of the old JSON array log into the JSONL log."""
+    if not os.path.exists(LEGACY_TX_LOG_FILE):
+        return
+    try:
+        with open(LEGACY_TX_LOG_FILE, "r") as f:
+            legacy = json.load(f)
+        if not isinstance(legacy, list):
+            legacy = []
+    except Exception:
+        print("Warning: Old transaction log could not be read, it was kept as xrpurr_txlog.json.bad")
+        os.replace(LEGACY_TX_LOG_FILE, LEGACY_TX_LOG_FILE + ".bad")
+        return
+    # old entries go first so the log stays in time order
+    tmp = TX_LOG_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as out:
+        for entry in legacy:
+            out.write(json.dumps(entry) + "\n")
         if os.path.exists(TX_LOG_FILE):
+            with open(TX_LOG_FILE, "r", encoding="utf-8") as current:
+                shutil.copyfileobj(current, out)
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(tmp, TX_LOG_FILE)
+    os.replace(LEGACY_TX_LOG_FILE, LEGACY_TX_LOG_FILE + ".migrated")
+
+def append_tx_log(entry, fsync=False):
+    migrate_tx_log()
+    line = json.dumps(entry) + "\n"
+    with _TX_LOG_LOCK, open(TX_LOG_FILE, "ab+") as f:
+        # a crash mid-write can leave a torn last line; start on a fresh line so only that one is lost
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = "\n" + line
+        f.write(line.encode("utf-8"))
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+def read_tx_log():
+    """Yield log entries oldest first, skipping lines that are torn or not valid JSON."""
+    migrate_tx_log()
+    if not os.path.exists(TX_LOG_FILE):
+        return
+    with open(TX_LOG_FILE, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
             try:
-                with open(TX_LOG_FILE, "r") as f:
-                    log = json.load(f)
-            except Exception:
-                print("Warning: Transaction log corrupted. Resetting log.")
-                log = []
-        else:
-            log = []
-        log.append(log_entry)
-        with open(TX_LOG_FILE, "w") as f:  # file write
-            json.dump(log, f, indent=2)
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+def clear_tx_log():
+    with open(TX_LOG_FILE, "w"):
+        pass
+    drop_tx_log_index()
+
+def _tx_log_head():
+    # first bytes of the log, to notice when the file was replaced rather than appended to
+    try:
+        with open(TX_LOG_FILE, "rb") as f:
+            return f.read(64).decode("utf-8", "replace")
+    except OSError:
+        return ""
+
+def tail_tx_log(n=20):
+    """Return the last n entries, oldest first, reading backwards from the end of the log."""
+    migrate_tx_log()
+    return _tail_jsonl(TX_LOG_FILE, n)
+
+def _tail_jsonl(path, n):
+    if n <= 0 or not os.path.exists(path):
+        return []
+    block = 64 * 1024
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        buf = b""
+        # one extra line, since the first one in the buffer may be partial
+        while pos > 0 and buf.count(b"\n") <= n:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+    lines = buf.split(b"\n")
+    if pos > 0:
+        lines = lines[1:]
+    entries = []
+    for line in reversed(lines):
+        if len(entries) >= n:
+            break
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue
+    entries.reverse()
+    return entries
+
+# In-memory copy of the sidecar index; caught up with the log on each query
+_TX_INDEX = None
+
+def _empty_tx_index():
+    return {"version": 1, "size": 0, "head": "", "hash": {}, "destination": {}, "tag": {}, "day": {}}
+
+def drop_tx_log_index():
+    global _TX_INDEX
+    _TX_INDEX = None
+    if os.path.exists(TX_LOG_INDEX_FILE):
+        os.remove(TX_LOG_INDEX_FILE)
+
+def _index_tx_entry(index, entry, offset):
+    if entry.get("hash"):
+        index["hash"][entry["hash"]] = offset
+    if entry.get("destination"):
+        index["destination"].setdefault(entry["destination"], []).append(offset)
+    if entry.get("destination_tag") is not None:
+        index["tag"].setdefault(str(entry["destination_tag"]), []).append(offset)
+    if entry.get("timestamp"):
+        index["day"].setdefault(str(entry["timestamp"])[:10], []).append(offset)
+
+def load_tx_log_index():
+    """
+    Return the sidecar index, indexing only the part of the log appended since it was last saved.
+    The index is rebuilt from scratch if the log shrank or was replaced.
+    """
+    global _TX_INDEX
+    migrate_tx_log()
+    if not os.path.exists(TX_LOG_FILE):
+        return _empty_tx_index()
+    size = os.path.getsize(TX_LOG_FILE)
+    head = _tx_log_head()
+    index = _TX_INDEX
+    if index is None and os.path.exists(TX_LOG_INDEX_FILE):
+        try:
+            with open(TX_LOG_INDEX_FILE, "r") as f:
+                index = json.load(f)
+        except Exception:
+            index = None
+    if index is None or index.get("version") != 1 or index["size"] > size or not head.startswith(index["head"]):
+        index = _empty_tx_index()
+    if index["size"] < size:
+        with open(TX_LOG_FILE, "rb") as f:
+            f.seek(index["size"])
+            offset = index["size"]
+            for line in f:
+                # stop at a torn line with no newline yet; it is indexed once the next append lands
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    _index_tx_entry(index, json.loads(line), offset)
+                except ValueError:
+                    pass
+                offset += len(line)
+        index["size"] = offset
+        index["head"] = head[:64] if offset >= 64 else head[:offset]
+        try:
+            tmp = TX_LOG_INDEX_FILE + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(index, f, separators=(",", ":"))
+            os.replace(tmp, TX_LOG_INDEX_FILE)
+        except Exception as e:
+            print(f"Warning: Could not save transaction log index: {e}")
+    _TX_INDEX = index
+    return index
+
+def _read_tx_entries_at(offsets):
+    entries = []
+    if not offsets:
+        return entries
+    with open(TX_LOG_FILE, "rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            try:
+                entries.append(json.loads(f.readline()))
+            except ValueError:
+                continue
+    return entries
+
+def query_tx_log(tx_hash=None, destination=None, tag=None, since=None, until=None, limit=None):
+    """
+    Look up log entries through the sidecar index. since/until are 'YYYY-MM-DD' strings
+    (inclusive). Filters combine with AND. Returns matches newest first.
+    """
+    index = load_tx_log_index()
+    candidates = None
+    def narrow(offsets):
+        nonlocal candidates
+        offsets = set(offsets)
+        candidates = offsets if candidates is None else candidates & offsets
+    if tx_hash:
+        narrow([index["hash"][tx_hash]] if tx_hash in index["hash"] else [])
+    if destination:
+        narrow(index["destination"].get(destination, []))
+    if tag is not None:
+        narrow(index["tag"].get(str(tag), []))
+    if since or until:
+        days = [d for d in index["day"] if (not since or d >= since) and (not until or d <= until)]
+        narrow(o for d in days for o in index["day"][d])
+    if candidates is None:
+        # no filter: everything, which is what tail_tx_log is for
+        return list(reversed(tail_tx_log(limit))) if limit else list(reversed(list(read_tx_log())))
+    offsets = sorted(candidates, reverse=True)
+    if limit:
+        offsets = offsets[:limit]
+    return _read_tx_entries_at(offsets)
+
+def format_tx_entry(entry):
+    return (f"- {entry.get('timestamp','?')}: Sent {entry.get('amount_xrp','?')} XRP to {entry.get('destination','?')}"
+            f"{' (tag: '+str(entry['destination_tag'])+')' if entry.get('destination_tag') is not None else ''} "
+            f"Result: {entry.get('result','?')}")
+
+# --- Archives ---
+# Once the log reaches tx_log_rotate_mb, or its oldest entry is tx_log_rotate_days old, it is
+# moved into src/archive and gzipped. Next to each archive is a small summary: entry count, time
+# bounds, and counts and XRP totals of successful sends, overall, per destination and per
+# month. Totals across archives come from the summaries. An archive is opened only when it holds
+# matching entries and lies partly outside the dates asked for. JSON array archives from older
+# versions are converted to this format, with a summary, the first time the archives are read.
+TX_ARCHIVE_DIR = os.path.join(BASEDIR, "src", "archive")
+TX_ARCHIVE_SUMMARY_VERSION = 1
+_TX_LOG_LOCK = threading.Lock()  # appends vs the move that starts a rotation
+_TX_ARCHIVE_LOCK = threading.Lock()  # one compressor at a time; appends never wait on it
+
+def _entry_xrp(entry):
+    # only successful sends count toward totals
+    if entry.get("result") != "tesSUCCESS":
+        return None
+    try:
+        amount = Decimal(str(entry.get("amount_xrp")))
+    except (InvalidOperation, ValueError):
+        return None
+    return amount if amount.is_finite() else None
+
+def _add_to_totals(totals, amount):
+    totals["count"] += 1
+    if amount is not None:
+        totals["sent"] += 1
+        totals["xrp"] += amount
+
+def _new_totals():
+    # xrp is a Decimal while adding up and a string in the saved summary
+    return {"count": 0, "sent": 0, "xrp": Decimal(0)}
+
+def _totals_for_json(totals):
+    return {**totals, "xrp": str(totals["xrp"])}
+
+def _summarize_entry(summary, entry):
+    amount = _entry_xrp(entry)
+    summary["count"] += 1
+    _add_to_totals(summary["totals"], amount)
+    ts = str(entry.get("timestamp") or "")
+    if ts:
+        summary["first"] = min(summary["first"] or ts, ts)
+        summary["last"] = max(summary["last"] or ts, ts)
+        _add_to_totals(summary["months"].setdefault(ts[:7], _new_totals()), amount)
+    if entry.get("destination"):
+        _add_to_totals(summary["destinations"].setdefault(entry["destination"], _new_totals()), amount)
+
+def _archive_summary_path(archive):
+    return archive[:-len(".jsonl.gz")] + ".summary.json"
+
+def compress_archive(path):
+    """
+    Gzip a plain .jsonl archive and write its summary, in one pass. The plain file is removed
+    only once both are on disk, so an interrupted run is simply done again. Returns the summary.
+    """
+    archive = path + ".gz"
+    summary = {"version": TX_ARCHIVE_SUMMARY_VERSION, "archive": os.path.basename(archive), "count": 0,
+               "first": None, "last": None, "bytes": os.path.getsize(path), "compressed": 0,
+               "totals": _new_totals(), "destinations": {}, "months": {}}
+    tmp = archive + ".tmp"
+    with open(path, "rb") as src, open(tmp, "wb") as raw:
+        with gzip.GzipFile(filename=os.path.basename(path), mode="wb", fileobj=raw, compresslevel=6) as out:
+            # whole lines a block at a time: one compressor call per block, not per line
+            while True:
+                block = b"".join(src.readlines(1 << 20))
+                if not block:
+                    break
+                out.write(block)
+                for line in block.decode("utf-8", "replace").splitlines():
+                    try:
+                        _summarize_entry(summary, json.loads(line))
+                    except ValueError:
+                        continue
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp, archive)
+    summary["compressed"] = os.path.getsize(archive)
+    summary["totals"] = _totals_for_json(summary["totals"])
+    for group in ("destinations", "months"):
+        summary[group] = {k: _totals_for_json(v) for k, v in summary[group].items()}
+    summary_tmp = _archive_summary_path(archive) + ".tmp"
+    with open(summary_tmp, "w") as f:
+        json.dump(summary, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(summary_tmp, _archive_summary_path(archive))
+    os.remove(path)
+    return summary
+
+def convert_legacy_archive(path):
+    """
+    Turn a JSON array archive from "Reset & archive" in older versions into a plain .jsonl
+    archive next to it, the way migrate_tx_log converts the live log. The original is kept
+    as .json.migrated, or .json.bad if it cannot be read. Returns the .jsonl path, or None.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            legacy = json.load(f)
+        if not isinstance(legacy, list):
+            raise ValueError("not a JSON array")
+    except (OSError, ValueError):
+        os.replace(path, path + ".bad")
+        return None
+    plain = path[:-len(".json")] + ".jsonl"
+    n = 1
+    while os.path.exists(plain) or os.path.exists(plain + ".gz"):
+        plain = f"{path[:-len('.json')]}_{n}.jsonl"
+        n += 1
+    tmp = plain + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as out:
+        for entry in legacy:
+            out.write(json.dumps(entry) + "\n")
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(tmp, plain)
+    os.replace(path, path + ".migrated")
+    return plain
+
+def _is_legacy_archive(name):
+    return name.startswith("xrpurr_txlog_") and name.endswith(".json") and not name.endswith(".summary.json")
+
+def finish_archives():
+    """Compress plain archives left by older versions or by a rotation that was cut short."""
+    if not os.path.isdir(TX_ARCHIVE_DIR):
+        return
+    for entry in os.scandir(TX_ARCHIVE_DIR):
+        if not entry.is_file():
+            continue
+        if _is_legacy_archive(entry.name):
+            with _TX_ARCHIVE_LOCK:
+                if os.path.exists(entry.path):
+                    plain = convert_legacy_archive(entry.path)
+                    if plain:
+                        compress_archive(plain)
+        elif entry.name.endswith(".jsonl"):
+            with _TX_ARCHIVE_LOCK:  # a rotation running in the background may be on it already
+                if os.path.exists(entry.path):
+                    compress_archive(entry.path)
+
+def archive_log(background=False):
+    """
+    Move the log into the archive directory and compress it there; background=True does the
+    compressing on a thread. Returns the archive's path, or None if the log was empty.
+    """
+    migrate_tx_log()
+    with _TX_LOG_LOCK:
+        if not os.path.exists(TX_LOG_FILE) or os.path.getsize(TX_LOG_FILE) == 0:
+            return None
+        os.makedirs(TX_ARCHIVE_DIR, exist_ok=True)
+        ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")  # utc timestamp
+        plain = os.path.join(TX_ARCHIVE_DIR, f"xrpurr_txlog_{ts}.jsonl")
+        n = 1
+        while os.path.exists(plain) or os.path.exists(plain + ".gz"):
+            plain = os.path.join(TX_ARCHIVE_DIR, f"xrpurr_txlog_{ts}_{n}.jsonl")
+            n += 1
+        os.replace(TX_LOG_FILE, plain)
+        drop_tx_log_index()
+    if background:
+        threading.Thread(target=finish_archives, daemon=True).start()
+    else:
+        finish_archives()
+    return plain + ".gz"
+
+def tx_log_rotation_due(settings):
+    try:
+        size = os.path.getsize(TX_LOG_FILE)
+    except OSError:
+        return False
+    limit_mb = settings.get("tx_log_rotate_mb", 5)
+    if limit_mb and size >= limit_mb * 1024 * 1024:
+        return True
+    days = settings.get("tx_log_rotate_days", 90)
+    if not days or size == 0:
+        return False
+    with open(TX_LOG_FILE, "rb") as f:
+        first = f.readline()
+    try:
+        oldest = datetime.fromisoformat(json.loads(first)["timestamp"])
+    except (ValueError, KeyError, TypeError):
+        return False
+    return (datetime.now(timezone.utc) - oldest).total_seconds() >= days * 86400
+
+def load_archive_summaries():
+    """[(archive path, summary)] oldest first."""
+    finish_archives()
+    if not os.path.isdir(TX_ARCHIVE_DIR):
+        return []
+    out = []
+    for entry in os.scandir(TX_ARCHIVE_DIR):
+        if not entry.name.endswith(".summary.json"):
+            continue
+        try:
+            with open(entry.path, "r") as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if summary.get("version") == TX_ARCHIVE_SUMMARY_VERSION:
+            out.append((os.path.join(TX_ARCHIVE_DIR, summary["archive"]), summary))
+    out.sort(key=lambda t: t[1]["first"] or "")
+    return out
+
+def read_archive(archive):
+    """Yield the entries of one compressed archive, oldest first."""
+    with gzip.open(archive, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+def _entry_matches(entry, destination, since, until):
+    day = str(entry.get("timestamp") or "")[:10]
+    return ((not destination or entry.get("destination") == destination)
+            and (not since or day >= since) and (not until or day <= until))
+
+def sent_totals(destination=None, since=None, until=None):
+    """
+    Count and XRP total of successful sends, across the archives and the current log.
+    since/until are 'YYYY-MM-DD' strings (inclusive). Returns the totals plus how many
+    archives were answered from their summary, opened, or skipped.
+    """
+    totals = _new_totals()
+    totals.update(summaries=0, opened=0, skipped=0)
+    for archive, summary in load_archive_summaries():
+        first, last = (summary["first"] or "")[:10], (summary["last"] or "")[:10]
+        if (not summary["count"] or (since and last < since) or (until and first > until)
+                or (destination and destination not in summary["destinations"])):
+            totals["skipped"] += 1
+            continue
+        if (not since or first >= since) and (not until or last <= until):
+            part = summary["destinations"][destination] if destination else summary["totals"]
+            totals["count"] += part["count"]
+            totals["sent"] += part["sent"]
+            totals["xrp"] += Decimal(part["xrp"])
+            totals["summaries"] += 1
+            continue
+        totals["opened"] += 1
+        for entry in read_archive(archive):
+            if _entry_matches(entry, destination, since, until):
+                _add_to_totals(totals, _entry_xrp(entry))
+    live = query_tx_log(destination=destination, since=since, until=until) if destination or since or until else read_tx_log()
+    for entry in live:
+        _add_to_totals(totals, _entry_xrp(entry))
+    return _totals_for_json(totals)
+
+def sent_totals_menu():
+    clear_screen()
+    print("\nTotals sent, across the current log and all archives (press Enter to skip a filter):")
+    destination = input("Destination address: ").strip()
+    since = input("From date (YYYY-MM-DD): ").strip()
+    until = input("To date (YYYY-MM-DD): ").strip()
+    for d in (since, until):
+        if d:
+            try:
+                datetime.strptime(d, "%Y-%m-%d")
+            except ValueError:
+                print(f"Invalid date: {d}")
+                time.sleep(2)
+                return
+    try:
+        t0 = time.perf_counter()
+        totals = sent_totals(destination or None, since or None, until or None)
+        elapsed = (time.perf_counter() - t0) * 1000
     except Exception as e:
-        print(f"Warning: Could not log transaction: {e}")
+        print(f"Could not read the archives: {e}")
         pause()
+        return
+    print(f"\n{totals['sent']} successful send(s) totalling {totals['xrp']} XRP ({totals['count']} logged attempt(s)).")
+    print(f"Archives: {totals['summaries']} answered from summaries, {totals['opened']} opened, {totals['skipped']} skipped ({elapsed:.1f} ms)")
+    pause()
 
-# Archive log helper
-import shutil
+def print_tx_log():
+    clear_screen()
+    migrate_tx_log()
+    if not os.path.exists(TX_LOG_FILE):
+        print("No transaction log found.")
+        pause()
+        return
+    try:
+        log = tail_tx_log(20)  # Show last 20
+        if not log:
+            print("Transaction log is empty.")
+            pause()
+            return
+        print("\nTransaction Log:")
+        for entry in log:
+            print(format_tx_entry(entry))
+        pause()
+    except Exception as e:
+        print(f"Could not read transaction log: {e}")
+        time.sleep(3.5)
+        pause()
 
-def archive_log():
-    arch_dir = os.path.join(BASEDIR, "src", "archive")
-    os.makedirs(arch_dir, exist_ok=True)
-    if os.path.exists(TX_LOG_FILE):
-        ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")  # utc timestamp
-        arch_file = os.path.join(arch_dir, f"xrpurr_txlog_{ts}.json")
-        shutil.move(TX_LOG_FILE, arch_file)
-        print(f"Log archived to {arch_file}")
+# --- Account history sync ---
+# The transaction log only sees sends made from this client. The synced history is the
+# ledger's own record: account_tx for each wallet, paged with its marker, written page by page
+# to one JSONL file per account under src/history, oldest first. Each account's state file
+# remembers the last ledger synced, so later syncs only ask for newer ledgers. Memory use is
+# one page, whatever the account's size.
+#
+# A sync reads every page from one node and pins its upper ledger when it starts. After every
+# page it fsyncs the rows and records the marker and file size. An interrupted sync resumes
+# from that page. Anything written past the recorded size is a page that was never recorded,
+# and it is cut off first.
+#
+# Not every node keeps full history, so a first sync goes to the node whose complete_ledgers
+# starts earliest and records where that was. A start after HISTORY_GENESIS_LEDGER means
+# older transactions are missing, and the menus say so.
+HISTORY_DIR = os.path.join(BASEDIR, "src", "history")
+HISTORY_GENESIS_LEDGER = 32570  # the oldest ledger a full-history mainnet node has
+HISTORY_PAGE_SIZE = 400  # rows per account_tx page; rippled's upper limit
+RIPPLE_EPOCH = 946684800  # 2000-01-01 in Unix time; ledger dates count from here
+_HISTORY_LOCK = threading.Lock()
+
+def _history_paths(address):
+    return os.path.join(HISTORY_DIR, f"{address}.jsonl"), os.path.join(HISTORY_DIR, f"{address}.state.json")
+
+def load_history_state(address):
+    _, state_file = _history_paths(address)
+    try:
+        with open(state_file, "r") as f:
+            state = json.load(f)
+        if state.get("version") == 1:
+            return state
+    except (OSError, ValueError):
+        pass
+    # pending: the sync in progress, {"endpoint", "ledger_max", "marker", "size", "count", "first_ledger"}
+    # first_ledger: where the node the first sync read from started its history
+    return {"version": 1, "synced_ledger": 0, "size": 0, "count": 0, "first_ledger": None, "endpoint": None,
+            "pending": None, "updated": None}
+
+def _save_history_state(address, state):
+    _, state_file = _history_paths(address)
+    tmp = state_file + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, state_file)
+
+def _history_row(item, account):
+    """One account_tx item cut down to what the history view needs (API v1 and v2 shapes)."""
+    tx = item.get("tx_json") or item.get("tx") or {}
+    meta = item.get("meta") if isinstance(item.get("meta"), dict) else {}
+    amount = meta.get("delivered_amount", tx.get("Amount", tx.get("DeliverMax")))
+    date = item.get("close_time_iso")
+    if not date and tx.get("date") is not None:
+        date = datetime.fromtimestamp(tx["date"] + RIPPLE_EPOCH, timezone.utc).isoformat()
+    return {"hash": item.get("hash") or tx.get("hash"), "ledger_index": item.get("ledger_index") or tx.get("ledger_index"),
+            "date": date, "type": tx.get("TransactionType"), "account": tx.get("Account"),
+            "destination": tx.get("Destination"), "destination_tag": tx.get("DestinationTag"), "amount": amount,
+            "fee": tx.get("Fee"), "result": meta.get("TransactionResult"),
+            "direction": "out" if tx.get("Account") == account else "in"}
+
+def _history_start(url):
+    # oldest ledger the node keeps, from server_info's complete_ledgers ("32570-91234567"); None if unknown
+    try:
+        resp = _timed_read(url, lambda c: c.request(ServerInfo()))
+        ranges = resp.result["info"]["complete_ledgers"]
+        return min(int(r.split("-")[0]) for r in ranges.split(","))
+    except Exception:
+        return None
+
+def _history_endpoints(first_sync):
+    """Endpoints to sync from, in order. A first sync goes to the node with the oldest history, since that is where it starts."""
+    endpoints = [url for url in ranked_endpoints() if not endpoint_breaker_open(url)] or ranked_endpoints()
+    if not first_sync:
+        return endpoints
+    starts = {url: _history_start(url) for url in endpoints}
+    return sorted(endpoints, key=lambda url: float("inf") if starts[url] is None else starts[url])
+
+def _sync_history_from(url, address, state, pending, ledger_max, progress):
+    # every page from one node: a marker only means something to the node that issued it
+    history_file, _ = _history_paths(address)
+    if pending is None:
+        if ledger_max is None:
+            resp = _timed_read(url, lambda c: c.request(Ledger(ledger_index="validated")))
+            if not resp or not resp.is_successful():
+                raise RuntimeError(f"could not get the validated ledger: {getattr(resp, 'result', resp)}")
+            ledger_max = int(resp.result["ledger_index"])
+        if ledger_max <= state["synced_ledger"]:
+            return 0
+        pending = {"endpoint": url, "ledger_max": ledger_max, "marker": None, "size": state["size"],
+                   "count": state["count"], "first_ledger": state.get("first_ledger")}
+    # first sync: from the oldest ledger the node has (-1)
+    ledger_min = state["synced_ledger"] + 1 if state["synced_ledger"] else -1
+    new_rows = 0
+    with open(history_file, "ab+") as f:
+        f.truncate(pending["size"])  # a page written but never recorded
+        while True:
+            def _account_tx(client_obj):
+                return client_obj.request(AccountTx(account=address, ledger_index_min=ledger_min,
+                                                    ledger_index_max=pending["ledger_max"], forward=True,
+                                                    limit=HISTORY_PAGE_SIZE, marker=pending["marker"]))
+            resp = _timed_read(url, _account_tx)
+            if resp and not resp.is_successful() and resp.result.get("error") == "actNotFound":
+                break  # never funded yet: nothing to sync up to ledger_max
+            if not resp or not resp.is_successful():
+                raise RuntimeError(f"account_tx failed: {getattr(resp, 'result', resp)}")
+            searched_from = resp.result.get("ledger_index_min")
+            if pending["marker"] is None and searched_from is not None:
+                if ledger_min == -1:
+                    pending["first_ledger"] = int(searched_from)
+                elif int(searched_from) > ledger_min:
+                    # storing this would leave a hole the next sync never goes back for
+                    raise RuntimeError(f"node only has ledgers from {searched_from}, ledgers {ledger_min} to {int(searched_from) - 1} would be missing")
+            page = resp.result.get("transactions", [])
+            if page:
+                f.write("".join(json.dumps(_history_row(item, address)) + "\n" for item in page).encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+            pending.update(marker=resp.result.get("marker"), size=f.tell(), count=pending["count"] + len(page))
+            new_rows += len(page)
+            if not pending["marker"]:
+                break
+            state["pending"] = pending
+            _save_history_state(address, state)
+            if progress:
+                progress(new_rows)
+    state.update(synced_ledger=pending["ledger_max"], size=pending["size"], count=pending["count"],
+                 first_ledger=pending.get("first_ledger"), endpoint=url, pending=None, updated=time.time())
+    _save_history_state(address, state)
+    return new_rows
+
+def sync_account_history(address, ledger_max=None, progress=None):
+    """
+    Bring address's synced history up to ledger_max (the latest validated ledger by default).
+    Returns the number of new rows. progress(rows so far) is called after each page.
+    A sync reads from one node. If that node fails, the next one starts the range over.
+    Raises once every node has failed; whatever was synced before is kept.
+    """
+    os.makedirs(HISTORY_DIR, exist_ok=True)
+    with _HISTORY_LOCK:
+        state = load_history_state(address)
+        pending = state["pending"]
+        endpoints = _history_endpoints(not state["synced_ledger"])
+        if pending is not None:
+            # an interrupted sync resumes on its own node first
+            endpoints = [pending.get("endpoint")] + [url for url in endpoints if url != pending.get("endpoint")]
+        errors = []
+        for url in endpoints:
+            if url is None or url not in XRPL_ENDPOINTS:
+                pending = None
+                continue
+            if pending is not None and pending.get("endpoint") != url:
+                pending = None  # another node's marker; this node starts the range over
+            try:
+                return _sync_history_from(url, address, state, pending, ledger_max, progress)
+            except Exception as e:
+                errors.append(f"{url}: {e}")
+                state = load_history_state(address)
+                pending = state["pending"]
+        raise RuntimeError("; ".join(errors) or "no XRPL endpoints")
+
+def history_incomplete(state):
+    return bool(state.get("first_ledger")) and state["first_ledger"] > HISTORY_GENESIS_LEDGER
+
+def history_accounts(wallet=None):
+    """(address, label) of every wallet this client knows: the loaded one, wallet files and the session's."""
+    accounts = {}
+    if wallet is not None:
+        accounts[wallet.address] = "loaded wallet"
+    for name, entry in wallet_entries():
+        if entry.get("address"):
+            accounts.setdefault(entry["address"], entry.get("label") or name)
+    for address, label in _SESSION_WALLETS.items():
+        accounts.setdefault(address, label)
+    return list(accounts.items())
+
+def tail_account_history(address, n=20):
+    history_file, _ = _history_paths(address)
+    return _tail_jsonl(history_file, n)
+
+def format_history_row(row):
+    amount = row.get("amount")
+    if isinstance(amount, str):
+        amount = f"{drops_to_xrp(amount)} XRP"
+    elif isinstance(amount, dict):
+        amount = f"{amount.get('value')} {amount.get('currency')}"
+    else:
+        amount = ""
+    if row.get("direction") == "in":
+        who = f"from {row.get('account', '?')}"
+    else:
+        who = f"to {row['destination']}" if row.get("destination") else ""
+    tag = f" (tag: {row['destination_tag']})" if row.get("destination_tag") is not None else ""
+    return f"- {row.get('date') or '?'} ledger {row.get('ledger_index')}: {row.get('type')} {amount} {who}{tag} Result: {row.get('result')}"
 
-def print_tx_log():
+def sync_history_menu(wallet=None):
     clear_screen()
-    if not os.path.exists(TX_LOG_FILE):
-        print("No transaction log found.")
+    accounts = history_accounts(wallet)
+    if not accounts:
+        print("No wallets with a known address yet. Load or create one first.")
         pause()
         return
+    print(f"\nSyncing history for {len(accounts)} account(s). Ctrl-C stops; the next sync picks up where it stopped.")
     try:
-        with open(TX_LOG_FILE, "r") as f:
-            log = json.load(f)
-        if not log:
-            print("Transaction log is empty.")
-            pause()
-            return
-        print("\nTransaction Log:")
-        for entry in log[-20:]:  # Show last 20
-            print(f"- {entry['timestamp']}: Sent {entry.get('amount_xrp','?')} XRP to {entry.get('destination','?')}"
-                  f"{' (tag: '+str(entry['destination_tag'])+')' if entry.get('destination_tag') is not None else ''} "
-                  f"Result: {entry.get('result','?')}")
-        pause()
-    except Exception as e:
-        print(f"Could not read transaction log: {e}")
-        time.sleep(3.5)
+        for address, label in accounts:
+            state = load_history_state(address)
+            since = f"from ledger {state['synced_ledger'] + 1}" if state["synced_ledger"] else "full history"
+            print(f"{label} ({address}), {since}...")
+            t0 = time.perf_counter()
+            try:
+                new = sync_account_history(address, progress=lambda n: print(f"  {n:,} transactions so far", end="\r"))
+            except Exception as e:
+                print(f"  failed: {e}")
+                continue
+            state = load_history_state(address)
+            print(f"  {new:,} new, {state['count']:,} in total, synced to ledger {state['synced_ledger']} ({time.perf_counter() - t0:.1f}s)")
+            if history_incomplete(state):
+                print(f"  Note: {state['endpoint']} only had ledgers from {state['first_ledger']}; anything older is not included.")
+    except KeyboardInterrupt:
+        print("\nSync stopped.")
+    pause()
+
+def view_history_menu(wallet=None):
+    clear_screen()
+    accounts = [(a, l) for a, l in history_accounts(wallet) if load_history_state(a)["count"]]
+    if not accounts:
+        print("No synced history yet. Sync it from this menu first.")
         pause()
+        return
+    for idx, (address, label) in enumerate(accounts, 1):
+        state = load_history_state(address)
+        missing = f", only from ledger {state['first_ledger']} (older ones missing)" if history_incomplete(state) else ""
+        print(f"  {idx}. {label} ({address}): {state['count']:,} transactions, to ledger {state['synced_ledger']}{missing}")
+    choice = input("Select an account: ").strip()
+    if not choice.isdigit() or not 1 <= int(choice) <= len(accounts):
+        print("Invalid selection.")
+        time.sleep(2)
+        return
+    address, label = accounts[int(choice) - 1]
+    print(f"\nLast 20 transactions of {label}:")
+    for row in tail_account_history(address, 20):
+        print(format_history_row(row))
+    pause()
 
 # a merely cute ux cliché
 def getGreeting():
@@ -332,47 +1735,480 @@ def createWallet():
     print(f"If this is your first non-custodial XRP wallet, remember that you can use destination tag '0' if you have never used an address without a dtag requirement before.\n")
     save = input("Save this wallet encrypted to disk? (y/N): ").strip().lower()
     if save == "y":
-        saveWalletSeed(wallet.seed)
+        saveWalletSeed(wallet.seed, wallet.address)
     clear_screen()
     return wallet
 
-def findVanityAddr(prefix, maxAttempts=10_000_000):
+# Vanity candidates skip Wallet.create: keys come straight from raw entropy in batches, the
+# public key is derived with cryptography's native Ed25519, and only the address is encoded.
+# The seed string is built for the winning entropy alone.
+VANITY_BATCH = 512
+
+try:
+    hashlib.new("ripemd160")
+    def _ripemd160(data):
+        return hashlib.new("ripemd160", data).digest()
+except ValueError:
+    # OpenSSL 3 builds can leave ripemd160 out of hashlib; pycryptodome comes with xrpl-py
+    from Crypto.Hash import RIPEMD160
+    def _ripemd160(data):
+        return RIPEMD160.new(data).digest()
+
+def encode_classic_address(account_id):
+    payload = b"\x00" + account_id
+    payload += hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4]
+    num = int.from_bytes(payload, "big")
+    out = []
+    while num:
+        num, rem = divmod(num, 58)
+        out.append(XRPL_ALPHABET[rem])
+    # every leading zero byte is one leading 'r': the version byte, plus any at the start of the account ID
+    zeros = len(payload) - len(payload.lstrip(b"\x00"))
+    return "r" * zeros + "".join(reversed(out))
+
+def vanity_candidates(batch=VANITY_BATCH):
+    """Yield (entropy, address) pairs for ed25519 accounts, forever."""
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+    from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+    from_private = Ed25519PrivateKey.from_private_bytes
+    sha512 = hashlib.sha512
+    sha256 = hashlib.sha256
+    raw = (Encoding.Raw, PublicFormat.Raw)
+    while True:
+        pool = os.urandom(16 * batch)  # one syscall per batch
+        for i in range(0, len(pool), 16):
+            entropy = pool[i:i + 16]
+            pub = from_private(sha512(entropy).digest()[:32]).public_key().public_bytes(*raw)
+            account_id = _ripemd160(sha256(b"\xED" + pub).digest())
+            yield entropy, encode_classic_address(account_id)
+
+def vanity_wallet(entropy):
+    """Build the full Wallet (and seed) for a winning candidate."""
+    return Wallet.from_entropy(entropy.hex())
+
+# Vanity patterns: "rCat" (or "Cat") is a prefix, "*cat" a suffix, a trailing "/i" ignores case.
+# All patterns are compiled into one trie per (kind, case) so an address is checked against
+# every pattern in a single walk of at most the longest pattern's length.
+def parse_vanity_pattern(text, case_sensitive=True):
+    raw = text.strip()
+    body = raw
+    if body.lower().endswith("/i"):
+        body = body[:-2]
+        case_sensitive = False
+    if body.startswith("*"):
+        kind = "suffix"
+        body = body[1:]
+    else:
+        kind = "prefix"
+        if not body.startswith("r"):
+            body = "r" + body
+    if not body or (kind == "prefix" and len(body) < 2):
+        raise ValueError(f"Pattern '{raw}' is empty.")
+    for c in body:
+        if c not in XRPL_ALPHABET and (case_sensitive or (c.lower() not in XRPL_ALPHABET and c.upper() not in XRPL_ALPHABET)):
+            raise ValueError(f"Pattern '{raw}' has '{c}', which never appears in XRP addresses (no 0, O, I, l).")
+    return {"text": raw, "kind": kind, "body": body, "case_sensitive": case_sensitive}
+
+def compile_vanity_patterns(patterns):
+    """Build the matcher for a list of parsed patterns (see parse_vanity_pattern)."""
+    tries = {}
+    for idx, pat in enumerate(patterns):
+        key = (pat["kind"], pat["case_sensitive"])
+        body = pat["body"] if pat["case_sensitive"] else pat["body"].lower()
+        if pat["kind"] == "suffix":
+            body = body[::-1]
+        node = tries.setdefault(key, {})
+        for c in body:
+            node = node.setdefault(c, {})
+        node.setdefault("", []).append(idx)  # "" never collides with an address character
+    return {"patterns": patterns, "tries": list(tries.items())}
+
+def match_vanity(matcher, address):
+    """Return the indexes of every pattern the address matches."""
+    hits = []
+    lowered = None
+    for (kind, case_sensitive), node in matcher["tries"]:
+        text = address
+        if not case_sensitive:
+            if lowered is None:
+                lowered = address.lower()
+            text = lowered
+        if kind == "suffix":
+            text = reversed(text)
+        for c in text:
+            node = node.get(c)
+            if node is None:
+                break
+            if "" in node:
+                hits.extend(node[""])
+    return hits
+
+VANITY_CHECKPOINT_FILE = os.path.join(BASEDIR, "src", "vanity_checkpoint.json")
+VANITY_CHECKPOINT_EVERY = 30  # seconds
+
+def _second_char_odds():
+    # An address is 'r' for the version byte, then the account ID and checksum as one base58
+    # number N below 2**192, with one more 'r' if the ID starts with a zero byte (N < 2**184).
+    # That bound cuts the leading digit short: the 22 letters 'p' to 'P' each follow the 'r' in
+    # about 4.3% of addresses, the rest of the alphabet in under 0.1%. Odds per character.
+    lo, hi = 1 << 184, 1 << 192
+    odds = {"r": lo / hi}
+    for d, c in enumerate(XRPL_ALPHABET[1:], 1):
+        count, scale = 0, 1
+        while d * scale < hi:
+            count += max(0, min((d + 1) * scale, hi) - max(d * scale, lo))
+            scale *= 58
+        odds[c] = count / (hi - lo) * (1 - odds["r"])
+    return odds
+
+_VANITY_SECOND_CHAR_ODDS = _second_char_odds()
+
+def vanity_difficulty(pattern):
+    """
+    Expected attempts to hit one pattern. The character right after the leading 'r' follows
+    its real, heavily skewed odds; every later one is taken as uniform over the 58-letter
+    alphabet, which is close enough for estimates.
+    """
+    p = 1.0
+    chars = pattern["body"][1:] if pattern["kind"] == "prefix" else pattern["body"]
+    for i, c in enumerate(chars):
+        variants = {c} if pattern["case_sensitive"] else {v for v in (c.lower(), c.upper()) if v in XRPL_ALPHABET}
+        if i == 0 and pattern["kind"] == "prefix":
+            p *= sum(_VANITY_SECOND_CHAR_ODDS[v] for v in variants)
+        else:
+            p *= len(variants) / 58
+    return 1 / p if p else float("inf")
+
+def vanity_progress(attempts, elapsed, expected):
+    """One status line: rate, chance of a hit by now, and ETA to 50% / 90% chance."""
+    rate = attempts / elapsed if elapsed > 0 else 0
+    p = 1 / expected
+    chance = 1 - math.exp(attempts * math.log1p(-p)) if p < 1 else 1.0
+    parts = [f"Attempts: {attempts:,}", f"{int(rate):,}/sec", f"{chance*100:.1f}% chance of a hit by now"]
+    if rate > 0 and p < 1:
+        for q in (0.5, 0.9):
+            needed = math.log(1 - q) / math.log1p(-p)
+            if needed > attempts:
+                parts.append(f"{int(q*100)}% ETA {format_duration((needed - attempts) / rate)}")
+    return " | ".join(parts)
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60}s"
+    if seconds < 86400:
+        return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+    return f"{seconds // 86400}d {seconds % 86400 // 3600}h"
+
+def _vanity_checkpoint_key(patterns):
+    return sorted(f"{p['kind']}:{p['body']}:{int(p['case_sensitive'])}" for p in patterns)
+
+def load_vanity_checkpoint(path, patterns):
+    """Return the saved progress for exactly these patterns, or None. Seeds are never stored."""
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except Exception:
+        return None
+    if data.get("key") != _vanity_checkpoint_key(patterns):
+        return None
+    return data
+
+def save_vanity_checkpoint(path, patterns, attempts, elapsed, found):
+    """found: pattern index -> address"""
+    data = {
+        "key": _vanity_checkpoint_key(patterns),
+        "attempts": attempts,
+        "elapsed": elapsed,
+        "found": {patterns[i]["text"]: addr for i, addr in found.items()},
+        "saved": datetime.now(timezone.utc).isoformat()
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+def clear_vanity_checkpoint(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+def findVanityAddr(patternText, maxAttempts=10_000_000):
     clear_screen()
-    prefix = prefix.strip()
-    if not prefix.startswith("r"):
-        prefix = "r" + prefix
-    print(f"Preferably, use the companion tool which is multithreaded and faster, available in the tools folder or in the repo.")
-    print(f"Searching for address starting with: {prefix}")
+    try:
+        patterns = [parse_vanity_pattern(p) for p in patternText.split(",") if p.strip()]
+    except ValueError as e:
+        print(e)
+        time.sleep(3.5)
+        clear_screen()
+        return None
+    if not patterns:
+        clear_screen()
+        return None
+    matcher = compile_vanity_patterns(patterns)
+    print(f"Preferably, use the companion tool which uses every CPU core and is faster, available in the tools folder or in the repo.")
+    print(f"Searching for: {', '.join(p['text'] for p in patterns)}")
+    for p in patterns:
+        print(f"  {p['text']}: about 1 in {vanity_difficulty(p):,.0f} addresses")
     attempts = 0
+    priorElapsed = 0.0
+    found = {}  # pattern index -> wallet (or address, for hits from an earlier session)
+    checkpoint = load_vanity_checkpoint(VANITY_CHECKPOINT_FILE, patterns)
+    if checkpoint:
+        attempts = checkpoint["attempts"]
+        priorElapsed = checkpoint["elapsed"]
+        for i, p in enumerate(patterns):
+            if p["text"] in checkpoint["found"]:
+                found[i] = checkpoint["found"][p["text"]]
+        print(f"Resuming from checkpoint: {attempts:,} attempts over {format_duration(priorElapsed)}, {len(found)} pattern(s) already found.")
     startTime = time.time()
-    
-    while attempts < maxAttempts:
-        wallet = Wallet.create()
-        if wallet.address.startswith(prefix):
-            elapsed = time.time() - startTime
-            print(f"Found vanity address after {attempts+1} attempts in {elapsed:.2f} seconds!")
-            print(f"Address: {wallet.address}")
-            print(f"Seed: {wallet.seed}")
-            # Offer to save wallet
-            save = input("Save this wallet encrypted to disk? (y/N): ").strip().lower()
-            if save == "y":
-                saveWalletSeed(wallet.seed)
-            clear_screen()
-            return wallet
-        
-        attempts += 1
-        if attempts % 10000 == 0:
-            print(f"Attempts: {attempts}... still searching.")
-    
-    print("Vanity address not found within max attempts.")
+    lastStatus = lastCheckpoint = startTime
+    sessionAttempts = 0
+
+    def expected():
+        # the hardest pattern still missing sets the pace
+        return max(vanity_difficulty(p) for i, p in enumerate(patterns) if i not in found)
+
+    def checkpointNow():
+        save_vanity_checkpoint(VANITY_CHECKPOINT_FILE, patterns, attempts, priorElapsed + time.time() - startTime,
+                               {i: getattr(w, "address", w) for i, w in found.items()})
+
+    try:
+        for entropy, address in vanity_candidates():
+            if sessionAttempts >= maxAttempts or len(found) == len(patterns):
+                break
+            attempts += 1
+            sessionAttempts += 1
+            hits = [i for i in match_vanity(matcher, address) if i not in found]
+            if hits:
+                wallet = vanity_wallet(entropy)
+                elapsed = priorElapsed + time.time() - startTime
+                print(f"\nFound {wallet.address} for {', '.join(patterns[i]['text'] for i in hits)} after {attempts:,} attempts in {elapsed:.2f} seconds!")
+                print(f"Seed: {wallet.seed}")
+                # Offer to save wallet
+                save = input("Save this wallet encrypted to disk? (y/N): ").strip().lower()
+                if save == "y":
+                    saveWalletSeed(wallet.seed, wallet.address)
+                for i in hits:
+                    found[i] = wallet
+                if len(found) < len(patterns):
+                    checkpointNow()
+                    print(f"Still searching for: {', '.join(p['text'] for i, p in enumerate(patterns) if i not in found)}")
+
+            if sessionAttempts % 10000 == 0:
+                now = time.time()
+                if now - lastStatus >= 5:
+                    print(vanity_progress(attempts, priorElapsed + now - startTime, expected()))
+                    lastStatus = now
+                if now - lastCheckpoint >= VANITY_CHECKPOINT_EVERY:
+                    checkpointNow()
+                    lastCheckpoint = now
+    except KeyboardInterrupt:
+        checkpointNow()
+        print(f"\nVanity search paused after {attempts:,} attempts. Start the same search again to resume.")
+        time.sleep(3.5)
+        clear_screen()
+        return None
+
+    if len(found) == len(patterns):
+        clear_vanity_checkpoint(VANITY_CHECKPOINT_FILE)
+        clear_screen()
+        first = found.get(0)
+        return first if isinstance(first, Wallet) else None
+    checkpointNow()
+    print("Vanity address not found within max attempts. Progress was saved; search again to continue.")
     clear_screen()
     return None
 
+# --- Wallet file format ---
+# Format 0 (older files) is the bare Fernet token, keyed with one unsalted SHA-256 of the
+# password. Format 1 puts a header line in front of the token naming the KDF, its salt and its
+# parameters, so the cost can be raised for new files without breaking old ones:
+#   XRPURR-WALLET 1 {"kdf": "scrypt", "salt": "...", "n": 32768, "r": 8, "p": 1}
+# The parameters come from calibrate_wallet_kdf, aimed at wallet_unlock_ms on this machine.
+# A format 0 file still opens through the SHA-256 path and is rewritten as format 1 once the
+# password is known to be right.
+WALLET_MAGIC = b"XRPURR-WALLET"
+SCRYPT_MAX_N = 1 << 16  # 64 MiB at r=8; past that calibration raises p instead of memory
+SCRYPT_MAX_R = 8
+SCRYPT_MAX_P = 64  # several seconds per unlock at n=SCRYPT_MAX_N, far past any sane target
+PBKDF2_MAX_ITERATIONS = 20_000_000
+
 def getFernetKeyFromPassword(password):
+    # format 0 only; kept so older files still open
     key = hashlib.sha256(password.encode()).digest()
     return base64.urlsafe_b64encode(key)
 
-def saveWalletSeed(seed):
+def _check_kdf(kdf):
+    # the header comes from the file, so a corrupt or tampered one must not choose the memory or time spent
+    def bounded(name, low, high):
+        value = kdf.get(name)
+        if type(value) is not int or not low <= value <= high:
+            raise ValueError(f"wallet KDF parameter {name}={value!r} is outside {low}..{high}")
+    if kdf.get("kdf") == "scrypt":
+        bounded("n", 2, SCRYPT_MAX_N)
+        if kdf["n"] & (kdf["n"] - 1):
+            raise ValueError(f"wallet KDF parameter n={kdf['n']} is not a power of two")
+        bounded("r", 1, SCRYPT_MAX_R)
+        bounded("p", 1, SCRYPT_MAX_P)
+    elif kdf.get("kdf") == "pbkdf2_sha256":
+        bounded("iterations", 1, PBKDF2_MAX_ITERATIONS)
+    else:
+        raise ValueError(f"unknown wallet KDF {kdf.get('kdf')!r}")
+
+def _derive_key_bytes(password, kdf):
+    _check_kdf(kdf)
+    salt = base64.b64decode(kdf["salt"])
+    if kdf["kdf"] == "scrypt":
+        n, r, p = kdf["n"], kdf["r"], kdf["p"]
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * r * (n + p), dklen=32)
+    if kdf["kdf"] == "pbkdf2_sha256":
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, kdf["iterations"])
+
+def calibrate_wallet_kdf(target_ms=500):
+    """
+    KDF parameters (without a salt) that take about target_ms to derive on this machine. One
+    timed derivation at a known cost is scaled up; scrypt doubles n up to SCRYPT_MAX_N and
+    makes up any remaining time with p. Falls back to PBKDF2 where hashlib has no scrypt.
+    """
+    probe_salt = base64.b64encode(os.urandom(16)).decode()
+    if hasattr(hashlib, "scrypt"):
+        probe = {"kdf": "scrypt", "salt": probe_salt, "n": 1 << 12, "r": 8, "p": 1}
+    else:
+        probe = {"kdf": "pbkdf2_sha256", "salt": probe_salt, "iterations": 20000}
+    t0 = time.perf_counter()
+    _derive_key_bytes("calibration", probe)
+    scale = max(1.0, target_ms / max((time.perf_counter() - t0) * 1000, 0.01))
+    if probe["kdf"] == "pbkdf2_sha256":
+        return {"kdf": "pbkdf2_sha256", "iterations": min(PBKDF2_MAX_ITERATIONS, int(probe["iterations"] * scale))}
+    n = probe["n"]
+    while n < SCRYPT_MAX_N and n * 2 <= probe["n"] * scale:
+        n *= 2
+    p = min(SCRYPT_MAX_P, max(1, round(probe["n"] * scale / n)))
+    return {"kdf": "scrypt", "n": n, "r": 8, "p": p}
+
+def wallet_kdf_params():
+    """The KDF parameters new wallet files get, calibrated and saved the first time."""
+    settings = load_settings()
+    if not settings.get("wallet_kdf"):
+        print("Measuring this machine to set the wallet unlock cost (once)...")
+        settings["wallet_kdf"] = calibrate_wallet_kdf(settings.get("wallet_unlock_ms", 500))
+        save_settings(settings)
+    return settings["wallet_kdf"]
+
+def describe_wallet_kdf(kdf):
+    if not kdf:
+        return "not calibrated yet"
+    if kdf["kdf"] == "scrypt":
+        return f"scrypt n={kdf['n']} r={kdf['r']} p={kdf['p']}"
+    return f"PBKDF2-SHA256, {kdf['iterations']:,} iterations"
+
+# Derived keys stay in memory for wallet_unlock_cache_minutes after their last use, so
+# unlocking the same file again skips the derivation. Entries are keyed by an HMAC of the
+# password under a per-process secret plus the file's KDF header, salt included; the password
+# itself is never kept. A timer drops them once idle.
+_UNLOCK_CACHE = {"keys": {}, "secret": os.urandom(32), "timer": None}  # (tag, kdf json) -> [key, last used]
+_UNLOCK_LOCK = threading.Lock()
+
+def _password_tag(password):
+    return hmac.new(_UNLOCK_CACHE["secret"], password.encode(), "sha256").digest()
+
+def _unlock_cache_seconds():
+    return max(0.0, float(load_settings().get("wallet_unlock_cache_minutes", 5)) * 60)
+
+def clear_unlock_cache():
+    with _UNLOCK_LOCK:
+        _UNLOCK_CACHE["keys"].clear()
+        if _UNLOCK_CACHE["timer"] is not None:
+            _UNLOCK_CACHE["timer"].cancel()
+            _UNLOCK_CACHE["timer"] = None
+
+def _expire_unlock_cache():
+    ttl = _unlock_cache_seconds()
+    with _UNLOCK_LOCK:
+        now = time.time()
+        for k in [k for k, v in _UNLOCK_CACHE["keys"].items() if now - v[1] >= ttl]:
+            del _UNLOCK_CACHE["keys"][k]
+        _UNLOCK_CACHE["timer"] = None
+        if _UNLOCK_CACHE["keys"]:
+            oldest = min(v[1] for v in _UNLOCK_CACHE["keys"].values())
+            _schedule_unlock_expiry(oldest + ttl - now)
+
+def _schedule_unlock_expiry(delay):
+    # caller holds _UNLOCK_LOCK
+    if _UNLOCK_CACHE["timer"] is None:
+        timer = threading.Timer(max(delay, 0.0) + 0.05, _expire_unlock_cache)
+        timer.daemon = True
+        _UNLOCK_CACHE["timer"] = timer
+        timer.start()
+
+def unlocked_key_count():
+    with _UNLOCK_LOCK:
+        return len(_UNLOCK_CACHE["keys"])
+
+def derive_wallet_key(password, kdf):
+    """Fernet key for password under a format 1 header's KDF, from the unlock cache when possible."""
+    ident = (_password_tag(password), json.dumps(kdf, sort_keys=True))
+    with _UNLOCK_LOCK:
+        hit = _UNLOCK_CACHE["keys"].get(ident)
+        if hit is not None:
+            hit[1] = time.time()
+            return hit[0]
+    key = base64.urlsafe_b64encode(_derive_key_bytes(password, kdf))
+    ttl = _unlock_cache_seconds()
+    if ttl > 0:
+        with _UNLOCK_LOCK:
+            _UNLOCK_CACHE["keys"][ident] = [key, time.time()]
+            _schedule_unlock_expiry(ttl)
+    return key
+
+def encrypt_wallet_seed(seed, password, params=None):
+    """Format 1 file contents for seed, under a fresh salt: no two files share a derived key."""
+    params = params or wallet_kdf_params()
+    kdf = {**params, "salt": base64.b64encode(os.urandom(16)).decode()}
+    token = Fernet(derive_wallet_key(password, kdf)).encrypt(seed.encode())
+    return WALLET_MAGIC + b" 1 " + json.dumps(kdf, sort_keys=True).encode() + b"\n" + token
+
+def decrypt_wallet_data(data, password):
+    """(seed, format) from wallet file contents; InvalidToken on a wrong password."""
+    if not data.startswith(WALLET_MAGIC):
+        return Fernet(getFernetKeyFromPassword(password)).decrypt(data.strip()).decode(), 0
+    header, _, token = data.partition(b"\n")
+    version, _, kdf = header[len(WALLET_MAGIC):].strip().partition(b" ")
+    if version != b"1":
+        raise ValueError(f"wallet file format {version.decode(errors='replace')} is newer than this version of xrpurr")
+    return Fernet(derive_wallet_key(password, json.loads(kdf))).decrypt(token.strip()).decode(), 1
+
+def wallet_file_format(path):
+    """Format number from a wallet file's first bytes; None if unreadable or not a header this can parse."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(len(WALLET_MAGIC) + 3)
+    except OSError:
+        return None
+    if not head.startswith(WALLET_MAGIC):
+        return 0
+    try:
+        return int(head[len(WALLET_MAGIC):].strip())
+    except ValueError:
+        return None
+
+def write_wallet_file(path, data):
+    # temp file + rename, so an upgrade interrupted halfway leaves the old file intact
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def upgrade_wallet_file(path, seed, password):
+    """Rewrite a format 0 file as format 1 under the same password."""
+    write_wallet_file(path, encrypt_wallet_seed(seed, password))
+    return WALLET_FORMAT
+
+def saveWalletSeed(seed, address=None):
     if Fernet is None:
         print("cryptography module not installed. Cannot encrypt wallet seed.")
         clear_screen()
@@ -383,26 +2219,27 @@ def saveWalletSeed(seed):
         print("Passwords do not match. Wallet not saved.")
         clear_screen()
         return
-    key = getFernetKeyFromPassword(password)  # password check
-    f = Fernet(key)
-    enc = f.encrypt(seed.encode())  # encrypt seed
-    wallet_file = get_next_wallet_file()
-    with open(wallet_file, "wb") as fp:  # file write
-        fp.write(enc)
+    enc = encrypt_wallet_seed(seed, password)
+    label = input("Label for this wallet (optional): ").strip()
+    with _WALLET_LOCK:
+        wallet_file = get_next_wallet_file()
+        write_wallet_file(wallet_file, enc)
+        register_wallet_file(wallet_file, address or Wallet.from_seed(seed).address, label)
     print(f"Wallet seed encrypted and saved to {wallet_file}.")
     clear_screen()
 
 def deleteWalletFile():
     clear_screen()
     # List wallet files
-    wallet_files = [f for f in os.listdir(wallets_dir) if f.endswith(".dat")]
+    entries = wallet_entries()
+    wallet_files = [name for name, _ in entries]
     if not wallet_files:
         print("No wallet file found to delete.")
         clear_screen()
         return
     print("Wallet files in your wallets directory:")
-    for idx, fname in enumerate(wallet_files, 1):
-        print(f"  {idx}. {fname}")
+    for idx, (fname, entry) in enumerate(entries, 1):
+        print(f"  {idx}. {describe_wallet_entry(fname, entry)}")
     print("a. All wallet files")
     print("b. Back")
     choice = input("Select wallet file to delete (number, 'a' for all, 'b' to cancel): ").strip().lower()
@@ -414,8 +2251,15 @@ def deleteWalletFile():
         if confirm == "deleteall":
             confirmforreal = input("Are you REALLY sure you want to DELETE ALL wallet files? This seriously cannot be undone! (type 'llaeteled' to confirm): ").strip() # don't let them accidentally history up and confirm
             if confirmforreal == "llaeteled":
-                for fname in wallet_files:
-                    os.remove(os.path.join(wallets_dir, fname))
+                # the directory itself, not the manifest: files added by hand since the last rebuild go too
+                with _WALLET_LOCK:
+                    for entry in os.scandir(wallets_dir):
+                        if entry.name.endswith(".dat") and entry.is_file():
+                            try:
+                                os.remove(entry.path)
+                            except FileNotFoundError:
+                                pass
+                    rebuild_wallet_manifest()
                 print("All wallet files deleted.")
             else:
                 print("Deletion cancelled.")
@@ -431,6 +2275,7 @@ def deleteWalletFile():
         confirm = input(f"Are you sure you want to DELETE the wallet file '{fname}'? This cannot be undone! (type 'delete' to confirm): ").strip()
         if confirm == "delete":
             os.remove(fullpath)
+            forget_wallet_file(fullpath)
             print("Wallet file deleted.")
         else:
             print("Deletion cancelled.")
@@ -440,23 +2285,29 @@ def deleteWalletFile():
 
 def loadWallet():
     clear_screen()
-    # List wallet files
-    wallet_files = [f for f in os.listdir(wallets_dir) if f.endswith(".dat")]
-    wallet_files.sort(key=lambda x: os.path.getmtime(os.path.join(wallets_dir, x)), reverse=True)
+    # List wallet files, newest first, from the manifest
+    entries = wallet_entries()
+    wallet_files = [name for name, _ in entries]
     default_file = os.path.join(wallets_dir, "xrpurr_wallet.dat")
     print("Wallet files in your wallets directory:")
     if wallet_files:
-        for idx, fname in enumerate(wallet_files, 1):
-            print(f"  {idx}. {fname}")
+        for idx, (fname, entry) in enumerate(entries, 1):
+            print(f"  {idx}. {describe_wallet_entry(fname, entry)}")
     else:
         print("  (none found)")
     print("m. Manual seed entry")
+    print("r. Rescan the wallets directory (if files were added or removed by hand)")
     print("b. Back/cancel")
     filename = None
     choice = input(f"Select wallet file to load (number, 'm' for manual, 'b' to cancel): ").strip().lower()
     if choice == "b":
         clear_screen()
         return None
+    if choice == "r":
+        manifest = rebuild_wallet_manifest()
+        print(f"Wallet index rebuilt: {len(manifest['wallets'])} wallet file(s).")
+        time.sleep(2)
+        return loadWallet()
     if choice == "m":
         filename = None
     elif choice.isdigit() and 1 <= int(choice) <= len(wallet_files):
@@ -473,13 +2324,18 @@ def loadWallet():
         # Removed y/n prompt, just load
         for attempt in range(3):
             password = getpass.getpass("Enter password to decrypt wallet: ")
-            key = getFernetKeyFromPassword(password)
-            f = Fernet(key)
             try:
                 with open(filename, "rb") as fp:
                     enc = fp.read()
-                seed = f.decrypt(enc).decode()  # decrypt seed
+                seed, fmt = decrypt_wallet_data(enc, password)
                 wallet = Wallet.from_seed(seed)
+                if fmt < WALLET_FORMAT:
+                    try:
+                        fmt = upgrade_wallet_file(filename, seed, password)
+                        print(f"Wallet file upgraded to format {fmt} ({describe_wallet_kdf(wallet_kdf_params())}).")
+                    except Exception as e:
+                        print(f"Warning: could not upgrade the wallet file, it still opens as before: {e}")
+                note_wallet_address(filename, wallet.address, fmt)
                 print(f"Loaded wallet address: {wallet.address}")
                 pause()
                 clear_screen()
@@ -504,7 +2360,7 @@ def loadWallet():
         if Fernet is not None:
             save = input("Save this wallet encrypted to disk for next time? (y/N): ").strip().lower()
             if save == "y":
-                saveWalletSeed(seed)
+                saveWalletSeed(seed, wallet.address)
         clear_screen()
         return wallet
     except Exception as e:
@@ -513,101 +2369,727 @@ def loadWallet():
         clear_screen()
         return None
 
-def getXrpUsdRate():
-    url = "https://api.coingecko.com/api/v3/simple/price?ids=ripple&vs_currencies=usd"
-    try:
-        with urllib.request.urlopen(url, timeout=5) as response:
-            data = json.load(response)
-            return float(data["ripple"]["usd"])
-    except Exception:
-        return None
+# --- Price feed ---
+# One request fetches every supported fiat currency. Prices are kept in memory and on disk,
+# served straight from there, and refreshed in the background once older than PRICE_TTL, so a
+# balance never waits on the feed. Only the very first run, with no copy on disk, blocks.
+# Point XRPURR_PRICE_URL at a stand-in (tools/standin.py serves one) for testing.
+PRICE_FEED_URL = os.environ.get("XRPURR_PRICE_URL", "https://api.coingecko.com/api/v3/simple/price")
+PRICE_CURRENCIES = ["usd", "eur", "gbp", "jpy", "cad", "aud", "chf", "cny", "krw", "inr", "brl", "mxn"]
+FIAT_SYMBOLS = {"usd": "$", "eur": "€", "gbp": "£", "jpy": "¥", "cny": "¥", "krw": "₩", "inr": "₹"}
+PRICE_TTL = 120  # seconds before a background refresh
+PRICE_STALE_WARN = 3600  # older prices are shown with their age
+PRICE_CACHE_FILE = os.path.join(BASEDIR, "src", "xrpurr_prices.json")
+_PRICE_CACHE = {"prices": None, "fetched_at": 0, "loaded": False, "refreshing": False}
+_PRICE_LOCK = threading.Lock()
+
+def _fetch_prices():
+    url = f"{PRICE_FEED_URL}?ids=ripple&vs_currencies={','.join(PRICE_CURRENCIES)}"
+    with urllib.request.urlopen(url, timeout=5) as response:
+        data = json.load(response)["ripple"]
+    prices = {c: float(data[c]) for c in PRICE_CURRENCIES if c in data}
+    if not prices:
+        raise ValueError("price feed returned no prices")
+    now = time.time()
+    with _PRICE_LOCK:
+        _PRICE_CACHE["prices"] = prices
+        _PRICE_CACHE["fetched_at"] = now
+    try:
+        tmp = PRICE_CACHE_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"fetched_at": now, "prices": prices}, f)
+        os.replace(tmp, PRICE_CACHE_FILE)
+    except Exception:
+        pass  # a price that only lives in memory is still fine
+    return prices
+
+def _load_price_cache():
+    # the last price from disk, once per process: startup shows it without a network call
+    with _PRICE_LOCK:
+        if _PRICE_CACHE["loaded"]:
+            return
+        _PRICE_CACHE["loaded"] = True
+        try:
+            with open(PRICE_CACHE_FILE, "r") as f:
+                data = json.load(f)
+            if _PRICE_CACHE["prices"] is None:
+                _PRICE_CACHE["prices"] = {c: float(v) for c, v in data["prices"].items()}
+                _PRICE_CACHE["fetched_at"] = float(data["fetched_at"])
+        except Exception:
+            pass
+
+def refresh_prices_in_background():
+    with _PRICE_LOCK:
+        if _PRICE_CACHE["refreshing"]:
+            return
+        _PRICE_CACHE["refreshing"] = True
+    def _run():
+        try:
+            _fetch_prices()
+        except Exception:
+            pass  # keep serving the old price; the next lookup tries again
+        finally:
+            _PRICE_CACHE["refreshing"] = False
+    threading.Thread(target=_run, daemon=True).start()
+
+def get_xrp_prices():
+    """Return (currency -> price, age in seconds), or (None, None) if no price is known and the feed is down."""
+    _load_price_cache()
+    with _PRICE_LOCK:
+        prices, fetched_at = _PRICE_CACHE["prices"], _PRICE_CACHE["fetched_at"]
+    if prices is None:
+        try:
+            return _fetch_prices(), 0.0
+        except Exception:
+            return None, None
+    age = max(0.0, time.time() - fetched_at)
+    if age > PRICE_TTL:
+        refresh_prices_in_background()
+    return prices, age
+
+def getXrpRate(currency=None):
+    currency = (currency or load_settings().get("fiat_currency", "usd")).lower()
+    prices, _ = get_xrp_prices()
+    if not prices:
+        return None
+    return prices.get(currency)
+
+def getXrpUsdRate():
+    return getXrpRate("usd")
+
+def format_fiat(amount, currency):
+    symbol = FIAT_SYMBOLS.get(currency.lower())
+    if symbol:
+        return f"{symbol}{amount:,.2f}" if currency.lower() not in ("jpy", "krw") else f"{symbol}{amount:,.0f}"
+    return f"{amount:,.2f} {currency.upper()}"
+
+def xrpToFiat(xrpAmt, currency=None):
+    rate = getXrpRate(currency)
+    if rate is not None:
+        return xrpAmt * rate, rate
+    return None, None
+
+def xrpToUsd(xrpAmt):
+    return xrpToFiat(xrpAmt, "usd")
+
+def read_amount_xrp(settings):
+    """
+    Prompt for a send amount, in the fiat currency when xrp_input_mode is set to it.
+    Returns the amount in XRP, or None to cancel; raises ValueError on bad input.
+    """
+    currency = settings.get("fiat_currency", "usd")
+    rate = age = None
+    if settings.get("xrp_input_mode", "XRP") != "XRP":
+        prices, age = get_xrp_prices()
+        if prices is not None and age > PRICE_STALE_WARN:
+            # about to move funds: try for a current price before settling for the cached one
+            try:
+                prices, age = _fetch_prices(), 0.0
+            except Exception:
+                pass
+        rate = prices.get(currency) if prices else None
+        if rate is None:
+            print(f"No XRP/{currency.upper()} price available; enter the amount in XRP instead.")
+        elif age > PRICE_STALE_WARN:
+            confirm = input(f"The XRP/{currency.upper()} price is {format_duration(age)} old; use it anyway? (y/N): ").strip().lower()
+            if confirm != 'y':
+                rate = None
+                print("Enter the amount in XRP instead.")
+    amtInput = input(f"Amount in {currency.upper() if rate else 'XRP'}: ").strip()
+    if amtInput.lower() in ['q', 'quit']:
+        return None
+    amount = float(amtInput)
+    if not rate:
+        return amount
+    amt = round(amount / rate, 6)
+    print(f"{format_fiat(amount, currency)} = {amt} XRP at {format_fiat(rate, currency)}/XRP (price {format_duration(age)} old)")
+    return amt
+
+def getBalance(address):
+    def _get_balance(client_obj, address):
+        acctInfo = AccountInfo(
+            account=address,
+            ledger_index="validated"
+        )
+        return client_obj.request(acctInfo)
+    try:
+        response = hedged_read(_get_balance, address)
+        settings = load_settings()
+        showFiat = settings.get("xrp_usd_conversion", False)
+        currency = settings.get("fiat_currency", "usd")
+        if response and response.is_successful():
+            balance = int(response.result["account_data"]["Balance"])
+            balanceXrp = float(drops_to_xrp(str(balance)))
+            if showFiat:
+                prices, age = get_xrp_prices()
+                rate = prices.get(currency) if prices else None
+                if rate is not None:
+                    stale = f" (price {format_duration(age)} old)" if age > PRICE_STALE_WARN else ""
+                    print(f"Balance for {address}: {balanceXrp} XRP ({format_fiat(balanceXrp * rate, currency)}) [{format_fiat(rate, currency)}/XRP]{stale}")
+                else:
+                    print(f"Balance for {address}: {balanceXrp} XRP ({currency.upper()} unavailable)")
+            else:
+                print(f"Balance for {address}: {balanceXrp} XRP")
+            return balance
+        else:
+            err = getattr(response, 'result', response)
+            if isinstance(err, dict) and err.get('error') == 'actNotFound':
+                print(f"{address} is not activated.")
+                print(f"{address} is a valid XRP address and can be activated by sending the minimum reserve balance of XRP to it.")
+                print(f"Reserve calculation: Base Reserve = {BASE_RESERVE_XRP} XRP, Owner Reserve = {OWNER_RESERVE_XRP} XRP per object.")
+                print(f"Once activated, you can use this wallet for transactions and management.")
+            else:
+                print(f"Error getting balance: {err}")
+            time.sleep(3.5)
+            return 0
+    except Exception as e:
+        print(f"Error getting balance: {e}")
+        time.sleep(3.5)
+        return 0
+
+# Account index file: header, a 256-entry fan-out table (as in git's pack index), a Bloom
+# filter, then the decoded 20-byte account IDs in sorted order. It is mapped straight into
+# memory, so loading it costs no parsing, and a lookup is a Bloom probe plus a binary search
+# within one first-byte bucket. Account IDs are hash outputs already, so each Bloom position
+# is simply one of their 32-bit words, no hashing needed.
+_ACCOUNT_INDEX_HEADER = struct.Struct("<8sIIB3x")  # magic, count, Bloom bytes, Bloom hashes
+_ACCOUNT_INDEX_FANOUT = struct.Struct("<256I")  # entry b: number of IDs whose first byte is <= b
+_ACCOUNT_INDEX_MAGIC = b"XRPACID1"
+_ACCOUNT_ID_WORDS = struct.Struct("<5I")
+
+def build_account_index(account_ids, bloom_bits=DTAG_BLOOM_BITS, hashes=DTAG_BLOOM_HASHES):
+    """Return the index file contents for an iterable of 20-byte account IDs."""
+    ids = sorted(set(account_ids))
+    bloom = bytearray((len(ids) * bloom_bits + 7) // 8)
+    bits = len(bloom) * 8
+    if bits:
+        for account_id in ids:
+            for word in _ACCOUNT_ID_WORDS.unpack(account_id)[:hashes]:
+                pos = word % bits
+                bloom[pos >> 3] |= 1 << (pos & 7)
+    fanout = [0] * 256
+    for account_id in ids:
+        fanout[account_id[0]] += 1
+    for b in range(1, 256):
+        fanout[b] += fanout[b - 1]
+    header = _ACCOUNT_INDEX_HEADER.pack(_ACCOUNT_INDEX_MAGIC, len(ids), len(bloom), hashes if bits else 0)
+    return header + _ACCOUNT_INDEX_FANOUT.pack(*fanout) + bytes(bloom) + b"".join(ids)
+
+class _AccountIdView:
+    # lets bisect walk the sorted IDs where they lie
+    __slots__ = ("buf", "base", "count")
+
+    def __init__(self, buf, base, count):
+        self.buf, self.base, self.count = buf, base, count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        start = self.base + 20 * i
+        return self.buf[start:start + 20]
+
+class AccountIndex:
+    """Read-only set of accounts over build_account_index output: bytes, or an mmap of the file."""
+
+    def __init__(self, buf, mapped=None):
+        magic, count, bloom_bytes, self.hashes = _ACCOUNT_INDEX_HEADER.unpack_from(buf, 0)
+        if magic != _ACCOUNT_INDEX_MAGIC:
+            raise ValueError("not an account index")
+        self.buf = buf
+        self.mapped = mapped  # the mmap to close, if any
+        self.fanout = _ACCOUNT_INDEX_FANOUT.unpack_from(buf, _ACCOUNT_INDEX_HEADER.size)
+        self.bloom_start = _ACCOUNT_INDEX_HEADER.size + _ACCOUNT_INDEX_FANOUT.size
+        self.bloom_bits = bloom_bytes * 8
+        self.ids = _AccountIdView(buf, self.bloom_start + bloom_bytes, count)
+        if len(buf) != self.ids.base + 20 * count:
+            raise ValueError("truncated account index")
+
+    @classmethod
+    def open(cls, path):
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapped, mapped)
+        except Exception:
+            mapped.close()
+            raise
+
+    def __len__(self):
+        return len(self.ids)
+
+    def may_contain(self, account_id):
+        """Bloom filter only: False is certain, True may be a false positive."""
+        buf, bits, start = self.buf, self.bloom_bits, self.bloom_start
+        if not bits:
+            return True
+        for word in _ACCOUNT_ID_WORDS.unpack(account_id)[:self.hashes]:
+            pos = word % bits
+            if not buf[start + (pos >> 3)] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def contains_id(self, account_id):
+        # most lookups are misses, and most misses stop at the first Bloom probe
+        if not self.may_contain(account_id):
+            return False
+        first = account_id[0]
+        hi = self.fanout[first]
+        i = bisect.bisect_left(self.ids, account_id, self.fanout[first - 1] if first else 0, hi)
+        return i < hi and self.ids[i] == account_id
+
+    def __contains__(self, address):
+        try:
+            account_id = decode_account_id(address)
+        except Exception:
+            return False
+        return account_id is not None and self.contains_id(account_id)
+
+    def close(self):
+        if self.mapped is not None:
+            self.mapped.close()
+
+def _install_dtag_index(data):
+    # swap the new list in and let the old mapping go with its last reference, never close()
+    # it: a lookup on another thread may still be reading it. If one is, Windows refuses the
+    # replace below; the caller treats that like any other failed write.
+    cache = _DTAG_ACCOUNTS_CACHE
+    with _DTAG_LOCK:
+        cache["accounts"] = AccountIndex(data)
+    tmp = DTAG_INDEX_FILE + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, DTAG_INDEX_FILE)
+
+def _save_dtag_meta():
+    cache = _DTAG_ACCOUNTS_CACHE
+    tmp = DTAG_CACHE_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"fetched_at": cache["last_fetch"], "etag": cache["etag"], "last_modified": cache["last_modified"]}, f)
+    os.replace(tmp, DTAG_CACHE_FILE)
+
+def _load_dtag_cache():
+    # the copy on disk, once per process; mapping the index is all the loading there is
+    cache = _DTAG_ACCOUNTS_CACHE
+    with _DTAG_LOCK:
+        if cache["loaded"]:
+            return
+        cache["loaded"] = True
+        try:
+            with open(DTAG_CACHE_FILE, "r") as f:
+                meta = json.load(f)
+            cache["accounts"] = AccountIndex.open(DTAG_INDEX_FILE)
+            cache["last_fetch"] = float(meta.get("fetched_at", 0))
+            cache["etag"] = meta.get("etag")
+            cache["last_modified"] = meta.get("last_modified")
+        except Exception:
+            pass  # no usable copy: the next refresh downloads the whole list
+
+def refresh_dtag_accounts():
+    """
+    Revalidate the list with If-None-Match/If-Modified-Since; a 304 costs no download.
+    On failure the last good copy stays in use. Returns True if the list is current.
+    """
+    cache = _DTAG_ACCOUNTS_CACHE
+    now = time.time()
+    cache["last_attempt"] = now
+    req = urllib.request.Request(DTAG_LIST_URL)
+    if cache["accounts"] is not None:
+        if cache["etag"]:
+            req.add_header("If-None-Match", cache["etag"])
+        if cache["last_modified"]:
+            req.add_header("If-Modified-Since", cache["last_modified"])
+    try:
+        with urllib.request.urlopen(req, timeout=10) as response:
+            data = response.read().decode("utf-8-sig")
+            etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+    except urllib.error.HTTPError as e:
+        if e.code != 304:
+            return False
+        cache["last_fetch"] = now
+        data = None
+    except Exception:
+        return False
+    try:
+        if data is not None:
+            reader = csv.reader(StringIO(data))
+            next(reader, None)  # skip header
+            ids = decode_account_ids([row[1] for row in reader if len(row) > 1])
+            _install_dtag_index(build_account_index(i for i in ids if i is not None))
+            cache.update(last_fetch=now, etag=etag, last_modified=last_modified)
+        _save_dtag_meta()
+    except OSError:
+        pass  # the new list is in memory either way
+    return True
+
+def prefetch_dtag_accounts():
+    """Start a background refresh if the list is due for one; never blocks."""
+    _load_dtag_cache()
+    cache = _DTAG_ACCOUNTS_CACHE
+    now = time.time()
+    with _DTAG_LOCK:
+        if (cache["refreshing"] or now - cache["last_fetch"] < DTAG_REFRESH_SECONDS
+                or now - cache["last_attempt"] < DTAG_RETRY_SECONDS):
+            return
+        cache["refreshing"] = True
+    def _run():
+        try:
+            refresh_dtag_accounts()
+        finally:
+            cache["refreshing"] = False
+    threading.Thread(target=_run, daemon=True).start()
+
+def fetch_dtag_accounts_without_flag():
+    """
+    Returns the set of accounts that need a destination tag but do not have the RequireDest
+    flag set. Served from memory/disk; refreshed in the background every 30 minutes.
+    """
+    prefetch_dtag_accounts()
+    accounts = _DTAG_ACCOUNTS_CACHE["accounts"]
+    if accounts is None:
+        print("Warning: The destination tag account list has not been downloaded yet; this check is skipped.")
+        time.sleep(3.5)
+        return set()
+    return accounts
+
+# --- Background submission ---
+# Sends are signed and submitted on one long-lived asyncio loop in a daemon thread. The menu
+# only waits until a node accepts the transaction; a task on the loop then follows it to
+# validation and writes the final result to the log.
+VALIDATION_POLL_SECONDS = 2
+SUBMIT_TIMEOUT = 60  # seconds the menu waits for a node to accept a transaction
+_ASYNC_LOOP = None
+_ASYNC_HTTP = None  # httpx.AsyncClient, bound to _ASYNC_LOOP
+_PENDING_TXS = {}  # hash -> status entry, in submission order
+_PENDING_LOCK = threading.Lock()
+
+def _pooled_async_client_class():
+    from xrpl.asyncio.clients import AsyncJsonRpcClient
+    from xrpl.clients import XRPLRequestFailureException
+    from xrpl.asyncio.clients.client import REQUEST_TIMEOUT
+    from xrpl.asyncio.clients.utils import json_to_response, request_to_json_rpc
+
+    class PooledAsyncJsonRpcClient(AsyncJsonRpcClient):
+        """AsyncJsonRpcClient that posts over one keep-alive pool on the background loop."""
+
+        async def _request_impl(self, request, *, timeout=REQUEST_TIMEOUT):
+            global _ASYNC_HTTP
+            if _ASYNC_HTTP is None:
+                _ASYNC_HTTP = httpx.AsyncClient(limits=httpx.Limits(
+                    max_connections=POOL_MAX_CONNECTIONS,
+                    max_keepalive_connections=POOL_MAX_KEEPALIVE,
+                    keepalive_expiry=POOL_KEEPALIVE_EXPIRY
+                ))
+            response = await _ASYNC_HTTP.post(self.url, json=request_to_json_rpc(request), timeout=timeout)
+            try:
+                return json_to_response(response.json())
+            except JSONDecodeError:
+                raise XRPLRequestFailureException({
+                    "error": response.status_code,
+                    "error_message": response.text
+                })
+
+    return [PooledAsyncJsonRpcClient]
+
+lazy("PooledAsyncJsonRpcClient", _pooled_async_client_class, "PooledAsyncJsonRpcClient")
+
+def _async_loop():
+    global _ASYNC_LOOP
+    with _PENDING_LOCK:
+        if _ASYNC_LOOP is None:
+            _ASYNC_LOOP = asyncio.new_event_loop()
+            threading.Thread(target=_ASYNC_LOOP.run_forever, name="xrpurr-submit", daemon=True).start()
+        return _ASYNC_LOOP
+
+def run_async(coro, timeout=None):
+    """
+    Run a coroutine on the background loop and block until it finishes. On timeout the
+    coroutine is cancelled, and has finished unwinding, before asyncio.TimeoutError is raised.
+    """
+    if timeout is not None:
+        # the deadline lives on the loop: wait_for only returns once the cancelled coroutine has stopped
+        coro = asyncio.wait_for(coro, timeout)
+    return asyncio.run_coroutine_threadsafe(coro, _async_loop()).result()
+
+# One WebSocket subscription to the ledger stream and the sending accounts resolves every
+# in-flight hash the moment its ledger validates. Whenever the stream is unavailable or
+# drops, waiting transactions fall back to polling over JSON-RPC.
+STREAM_CONNECT_TIMEOUT = 5
+STREAM_IDLE_TIMEOUT = 20  # ledgers close every ~4 s, so this much silence means a dead stream
+STREAM_RETRY_SECONDS = 60  # after a failed connect, poll over HTTP for this long
+
+class LedgerStream:
+    """Shared ledger-stream subscription, living on the background loop."""
+
+    def __init__(self):
+        self.client = None
+        self.url = None
+        self.accounts = set()
+        self.waiters = {}  # hash -> (future, LastLedgerSequence)
+        self.ledger_index = None
+        self.down_until = 0
+        self.connecting = None  # future while a connect is in progress
+        self.stats = {"connects": 0, "resolved": 0, "fallbacks": 0}
+
+    async def watch(self, tx_hash, account, last_ledger):
+        """
+        Start watching a hash; call before submitting so the result cannot be missed.
+        Returns a future for the final result (None if the stream dropped), or None to poll.
+        """
+        if time.time() < self.down_until or not await self._connect():
+            return None
+        if account not in self.accounts:
+            try:
+                await asyncio.wait_for(self.client.request(Subscribe(accounts=[account])), STREAM_CONNECT_TIMEOUT)
+            except Exception:
+                return None
+            self.accounts.add(account)
+        future = asyncio.get_running_loop().create_future()
+        self.waiters[tx_hash] = (future, last_ledger)
+        return future
+
+    def forget(self, tx_hash):
+        self.waiters.pop(tx_hash, None)
+
+    async def connection(self):
+        """The open stream client, for plain requests that can share its socket; None if it is down."""
+        if time.time() < self.down_until or not await self._connect():
+            return None
+        return self.client
+
+    async def _connect(self):
+        if self.client is not None and self.client.is_open():
+            return True
+        if self.connecting is None:
+            self.connecting = asyncio.get_running_loop().create_future()
+            asyncio.ensure_future(self._run(self.connecting))
+        return await asyncio.shield(self.connecting)
+
+    async def _run(self, connecting):
+        client = None
+        for url in XRPL_WS_ENDPOINTS:
+            c = AsyncWebsocketClient(url)
+            try:
+                await asyncio.wait_for(c.open(), STREAM_CONNECT_TIMEOUT)
+                await asyncio.wait_for(c.request(Subscribe(streams=[StreamParameter.LEDGER])), STREAM_CONNECT_TIMEOUT)
+                client, self.url = c, url
+                break
+            except Exception:
+                try:
+                    await c.close()
+                except Exception:
+                    pass
+        self.connecting = None
+        if client is None:
+            self.down_until = time.time() + STREAM_RETRY_SECONDS
+            connecting.set_result(False)
+            return
+        self.client = client
+        self.stats["connects"] += 1
+        connecting.set_result(True)
+        try:
+            # xrpl-py's message iterator never wakes up on a dropped socket, so each message
+            # gets a deadline; the iterator ending or timing out both mean the stream is gone
+            messages = client.__aiter__()
+            while True:
+                self._handle(await asyncio.wait_for(messages.__anext__(), STREAM_IDLE_TIMEOUT))
+        except Exception:
+            pass
+        finally:
+            self.client = None
+            self.accounts.clear()
+            try:
+                await client.close()
+            except Exception:
+                pass
+            # whoever is still waiting carries on by polling
+            for h in list(self.waiters):
+                self._resolve(h, None)
+
+    def _resolve(self, tx_hash, result):
+        future, _ = self.waiters.pop(tx_hash)
+        if not future.done():
+            future.set_result(result)
+        self.stats["resolved" if result else "fallbacks"] += 1
 
-def xrpToUsd(xrpAmt):
-    rate = getXrpUsdRate()
-    if rate is not None:
-        usd = xrpAmt * rate
-        return usd, rate
-    return None, None
+    def _handle(self, msg):
+        kind = msg.get("type")
+        if kind == "ledgerClosed":
+            # a ledger's transactions are published right after its ledgerClosed,
+            # so only a later ledger proves a transaction missed its LastLedgerSequence
+            self.ledger_index = msg.get("ledger_index")
+            for h, (_, last_ledger) in list(self.waiters.items()):
+                if last_ledger is not None and self.ledger_index > last_ledger:
+                    self._resolve(h, "EXPIRED")
+        elif kind == "transaction" and msg.get("validated"):
+            # API v2 puts the hash at the top level, v1 inside "transaction"
+            tx_hash = msg.get("hash") or msg.get("transaction", {}).get("hash")
+            if tx_hash in self.waiters:
+                self._resolve(tx_hash, msg.get("meta", {}).get("TransactionResult", "UNKNOWN"))
 
-def getBalance(address):
-    def _get_balance(client_obj, address):
-        acctInfo = AccountInfo(
-            account=address,
-            ledger_index="validated"
-        )
-        return client_obj.request(acctInfo)
-    try:
-        response = try_all_clients(_get_balance, address)
-        settings = load_settings()
-        showUsd = settings.get("xrp_usd_conversion", False)
-        if response and response.is_successful():
-            balance = int(response.result["account_data"]["Balance"])
-            balanceXrp = float(drops_to_xrp(str(balance)))
-            if showUsd:
-                usd, rate = xrpToUsd(balanceXrp)
-                if usd is not None:
-                    print(f"Balance for {address}: {balanceXrp} XRP (${usd:.2f}) [${rate:.4f}/XRP]")
-                else:
-                    print(f"Balance for {address}: {balanceXrp} XRP (USD unavailable)")
-            else:
-                print(f"Balance for {address}: {balanceXrp} XRP")
-            return balance
+_LEDGER_STREAM = LedgerStream()
+
+async def _submit_async(tx, wallet, progress):
+    # Sign once on the best node, then hand the same signed transaction to the next node if
+    # a submit call fails outright or the node answers with an error (tooBusy, noCurrent)
+    # instead of an engine result, so a retry can never become a second payment.
+    # progress tells a caller that gave up waiting whether the blob may already be out.
+    signed = None
+    stream_future = None
+    last_exception = None
+    for url in ranked_endpoints():
+        c = PooledAsyncJsonRpcClient(url)
+        t0 = time.time()
+        try:
+            if signed is None:
+                signed = progress["signed"] = await asyncio.to_thread(sign_once, tx, wallet)
+                if load_settings().get("ledger_stream", True):
+                    stream_future = progress["stream_future"] = await _LEDGER_STREAM.watch(
+                        signed.get_hash(), wallet.address, signed.last_ledger_sequence)
+                    t0 = time.time()  # a slow stream connect is not this node's latency
+            progress["url"] = url
+            resp = await async_submit(signed, c)
+            if not resp.is_successful() or "engine_result" not in resp.result:
+                raise Exception(f"{resp.result.get('error', 'no engine_result')}: {resp.result.get('error_message', resp.result)}")
+            record_endpoint_result(url, time.time() - t0, True)
+            note_submit_result(signed, resp.result["engine_result"])
+            return signed, resp, url, stream_future
+        except Exception as e:
+            record_endpoint_result(url, time.time() - t0, False)
+            last_exception = e
+    if signed is not None:
+        _LEDGER_STREAM.forget(signed.get_hash())
+        # it may or may not have reached a node; read the sequence from the ledger next time
+        forget_account_state(wallet.address)
+    raise last_exception or Exception("No XRPL endpoints available")
+
+async def _track_validation(tx_hash, account, last_ledger, url, log_data, stream_future=None):
+    result = None
+    if stream_future is not None:
+        with _PENDING_LOCK:
+            _PENDING_TXS[tx_hash]["status"] = "streaming"
+        result = await stream_future
+        if result == "EXPIRED":
+            # the stream only saw a later ledger; a missed message must not turn a validated
+            # payment into an expired one, so a node confirms it below with a Tx lookup
+            result = None
+    c = PooledAsyncJsonRpcClient(url)
+    while result is None:
+        await asyncio.sleep(VALIDATION_POLL_SECONDS)
+        try:
+            # ledger first: once it is past LastLedgerSequence an unvalidated tx can never land
+            current = await async_get_latest_validated_ledger_sequence(c)
+            resp = await c._request_impl(Tx(transaction=tx_hash))
+        except Exception:
+            # node trouble: carry on against whichever node is healthiest now
+            c = PooledAsyncJsonRpcClient(ranked_endpoints()[0])
+            continue
+        if resp.is_successful() and resp.result.get("validated"):
+            result = resp.result.get("meta", {}).get("TransactionResult", "UNKNOWN")
+        elif current > last_ledger:
+            result = "EXPIRED"
         else:
-            err = getattr(response, 'result', response)
-            if isinstance(err, dict) and err.get('error') == 'actNotFound':
-                print(f"{address} is not activated.")
-                print(f"{address} is a valid XRP address and can be activated by sending the minimum reserve balance of XRP to it.")
-                print(f"Reserve calculation: Base Reserve = {BASE_RESERVE_XRP} XRP, Owner Reserve = {OWNER_RESERVE_XRP} XRP per object.")
-                print(f"Once activated, you can use this wallet for transactions and management.")
-            else:
-                print(f"Error getting balance: {err}")
-            time.sleep(3.5)
-            return 0
-    except Exception as e:
-        print(f"Error getting balance: {e}")
-        time.sleep(3.5)
-        return 0
+            with _PENDING_LOCK:
+                _PENDING_TXS[tx_hash]["status"] = "polling"
+                _PENDING_TXS[tx_hash]["ledger"] = current
+    with _PENDING_LOCK:
+        entry = _PENDING_TXS[tx_hash]
+        entry["status"] = "validated" if result != "EXPIRED" else "expired"
+        entry["result"] = result
+        entry["finished_at"] = time.time()
+    if result == "EXPIRED":
+        # it can no longer take its sequence: read the next one from the ledger
+        forget_account_state(account)
+    log_transaction({**log_data, "hash": tx_hash, "result": result}, interactive=False)
 
-def fetch_dtag_accounts_without_flag():
+def submit_in_background(tx, wallet, log_data, kind="Payment"):
     """
-    Fetches the list of accounts without the RequireDest flag set from the API.
-    Caches the result for 5 minutes to avoid excessive requests.
-    Returns a set of addresses.
+    Sign and submit a transaction, returning once a node has accepted it. Validation is
+    followed in the background and the final result is logged through log_transaction.
+    Returns the pending entry; a rejected submission is logged right away and raised. If no
+    node answered in time but the blob may have gone out, the entry's prelim is "unknown"
+    and the transaction is followed like any other.
     """
-    global _DTAG_ACCOUNTS_CACHE
-    now = time.time()
-    # Cache for 30 minutes
-    if (_DTAG_ACCOUNTS_CACHE["accounts"] is not None and
-        now - _DTAG_ACCOUNTS_CACHE["last_fetch"] < 3000):
-        return _DTAG_ACCOUNTS_CACHE["accounts"]
-    url = "https://xrpl.ws-stats.com/lists/f:dtag_accounts_without_flag"
+    progress = {}
     try:
-        with urllib.request.urlopen(url, timeout=10) as response:
-            data = response.read().decode("utf-8-sig")
-            reader = csv.reader(StringIO(data))
-            header = next(reader, None)  # skip header
-            accounts = [row[1] for row in reader if len(row) > 1]
-            accounts_set = set(accounts)
-            _DTAG_ACCOUNTS_CACHE["accounts"] = accounts_set
-            _DTAG_ACCOUNTS_CACHE["last_fetch"] = now
-            return accounts_set
-    except Exception as e:
-        print(f"Warning: Could not fetch destination tag account list: {e}")
-        time.sleep(3.5)
-        return set()
+        signed, resp, url, stream_future = run_async(_submit_async(tx, wallet, progress), SUBMIT_TIMEOUT)
+        prelim = resp.result["engine_result"]
+    except asyncio.TimeoutError:
+        signed = progress.get("signed")
+        if "url" not in progress:
+            # cancelled before any submit went out
+            if signed is not None:
+                _async_loop().call_soon_threadsafe(_LEDGER_STREAM.forget, signed.get_hash())
+            raise Exception(f"Timed out after {SUBMIT_TIMEOUT}s before the transaction was submitted")
+        # a node may have it: keep the sequence reserved and find out from the ledger
+        url, stream_future, prelim = progress["url"], progress.get("stream_future"), "unknown"
+    tx_hash = signed.get_hash()
+    # tes/tec/ter results can still land in a ledger; anything else never will
+    if prelim != "unknown" and not prelim.startswith(("tes", "tec", "ter")):
+        _async_loop().call_soon_threadsafe(_LEDGER_STREAM.forget, tx_hash)
+        log_transaction({**log_data, "hash": tx_hash, "result": "FAILED", "error": str(resp.result)}, interactive=False)
+        raise Exception(f"{prelim}: {resp.result.get('engine_result_message', resp.result)}")
+    entry = {
+        "hash": tx_hash,
+        "kind": kind,
+        "destination": log_data.get("destination"),
+        "amount_xrp": log_data.get("amount_xrp"),
+        "status": "submitted" if prelim != "unknown" else "unknown",
+        "prelim": prelim,
+        "result": None,
+        "ledger": None,
+        "last_ledger": signed.last_ledger_sequence,
+        "submitted_at": time.time(),
+        "finished_at": None
+    }
+    with _PENDING_LOCK:
+        _PENDING_TXS[tx_hash] = entry
+    asyncio.run_coroutine_threadsafe(_track_validation(tx_hash, signed.account, signed.last_ledger_sequence, url, log_data, stream_future), _async_loop())
+    return entry
 
-def sendXrp(wallet, destination, amountXrp, destinationTag=None):
-    def _send_payment(client_obj, wallet, destination, amountXrp, destinationTag):
-        paymentParams = {
-            "account": wallet.address,
-            "amount": xrp_to_drops(amountXrp),
-            "destination": destination
-        }
-        if destinationTag is not None:
-            paymentParams["destination_tag"] = int(destinationTag)
-        payment = Payment(**paymentParams)
-        return submit_and_wait(payment, client_obj, wallet)
+def pending_transaction_count():
+    with _PENDING_LOCK:
+        return sum(1 for e in _PENDING_TXS.values() if e["finished_at"] is None)
+
+def wait_for_pending_transactions():
+    """Let in-flight transactions reach a final result before exit; Ctrl-C skips the wait."""
+    n = pending_transaction_count()
+    if not n:
+        return
+    print(f"Waiting for {n} transaction(s) to validate (Ctrl-C to quit now; they may still land)...")
+    try:
+        while pending_transaction_count():
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+
+def pending_transactions_menu():
+    while True:
+        clear_screen()
+        with _PENDING_LOCK:
+            entries = list(_PENDING_TXS.values())
+        print("\nPending transactions (this session):")
+        if not entries:
+            print("No transactions submitted yet.")
+        for e in entries:
+            age = int((e["finished_at"] or time.time()) - e["submitted_at"])
+            if e["finished_at"] is None:
+                ledger = e["ledger"] or _LEDGER_STREAM.ledger_index or "?"
+                state = f"{e['status']} ({e['prelim']}, {age}s, ledger {ledger}/{e['last_ledger']})"
+            else:
+                state = f"{e['status']}: {e['result']} after {age}s"
+            print(f"{e['hash'][:16]}... {e['kind']} {e['amount_xrp']} XRP -> {e['destination']} | {state}")
+        print("\nr. Refresh\nc. Clear finished\nb. Back")
+        choice = input("Select: ").strip().lower()
+        if choice == "c":
+            with _PENDING_LOCK:
+                for h in [h for h, e in _PENDING_TXS.items() if e["finished_at"] is not None]:
+                    del _PENDING_TXS[h]
+        elif choice == "b":
+            clear_screen()
+            break
 
+def sendXrp(wallet, destination, amountXrp, destinationTag=None):
     try:
         settings = load_settings()
         debug = settings.get("debug", False)
@@ -618,7 +3100,6 @@ def sendXrp(wallet, destination, amountXrp, destinationTag=None):
             print(f"  amountXrp: {amountXrp}")
             print(f"  destinationTag: {destinationTag}")
 
-        # Prepare tx hash and sequence for fallback check
         paymentParams = {
             "account": wallet.address,
             "amount": xrp_to_drops(amountXrp),
@@ -627,15 +3108,31 @@ def sendXrp(wallet, destination, amountXrp, destinationTag=None):
         if destinationTag is not None:
             paymentParams["destination_tag"] = int(destinationTag)
         payment = Payment(**paymentParams)
-        txSeq = getattr(payment, "sequence", None)
-        txAccount = wallet.address
-        txHash = None
-        try:
-            txHash = payment.hash()
-        except Exception:
-            pass
+        if settings.get("background_sends", True):
+            entry = submit_in_background(payment, wallet, {
+                "destination": destination,
+                "amount_xrp": amountXrp,
+                "destination_tag": destinationTag
+            })
+            if entry["prelim"] == "unknown":
+                print("No node confirmed the submission in time; the transaction may or may not land.")
+                print("Do not send it again until its outcome shows under 'Pending transactions'.")
+            else:
+                print(f"Transaction submitted ({entry['prelim']}).")
+            print(f"Hash: {entry['hash']}")
+            if destinationTag:
+                print(f"Destination tag: {destinationTag}")
+            print("Validation is tracked in the background; see 'Pending transactions' in the main menu.")
+            pause()
+            clear_screen()
+            return entry
+        # Sign once; every endpoint gets the same blob, and its real hash drives the fallback check
+        signed = sign_once(payment, wallet)
+        txHash = signed.get_hash()
+        if debug:
+            print(f"DEBUG: signed hash {txHash}, sequence {signed.sequence}, LastLedgerSequence {signed.last_ledger_sequence}")
 
-        response = try_all_clients(_send_payment, wallet, destination, amountXrp, destinationTag, txHash=txHash, txSeq=txSeq, txAccount=txAccount)
+        response = try_all_clients(_submit_signed, signed, txHash=txHash, txSeq=signed.sequence, txAccount=wallet.address)
         if debug:
             print("DEBUG: Response from submit_and_wait:", response)
 
@@ -671,6 +3168,8 @@ def sendXrp(wallet, destination, amountXrp, destinationTag=None):
         return response
 
     except Exception as e:
+        # unknown whether the reserved sequence got used; read it from the ledger next time
+        forget_account_state(wallet.address)
         settings = load_settings()
         debug = settings.get("debug", False)
         print(f"Error sending XRP: {e}")
@@ -704,19 +3203,12 @@ def sendAccountDelete(wallet, destination):
         )
         return client_obj.request(acctInfo)
 
-    def _submit_account_delete(client_obj, wallet, destination):
-        tx = AccountDelete(
-            account=wallet.address,
-            destination=destination
-        )
-        return submit_and_wait(tx, client_obj, wallet)
-
     try:
         clear_screen()
         print(f"\nPreparing to delete account {wallet.address} and send the XRP reserve to {destination}...")
 
         # Try all endpoints for account info
-        response = try_all_clients(_get_account_info, wallet)
+        response = hedged_read(_get_account_info, wallet)
         if not response or not response.is_successful():
             print(f"Error getting account info: {getattr(response, 'result', response)}")
             time.sleep(3.5)
@@ -765,7 +3257,20 @@ def sendAccountDelete(wallet, destination):
 
         # Try all endpoints for AccountDelete
         print("Submitting AccountDelete transaction...")
-        resp = try_all_clients(_submit_account_delete, wallet, destination)
+        if load_settings().get("background_sends", True):
+            entry = submit_in_background(AccountDelete(account=wallet.address, destination=destination), wallet, {
+                "destination": destination,
+                "amount_xrp": drops_to_xrp(str(amount_to_send_drops)),
+                "account_delete": True
+            }, kind="AccountDelete")
+            print(f"AccountDelete submitted ({entry['prelim']}).")
+            print(f"Hash: {entry['hash']}")
+            print("Validation is tracked in the background; see 'Pending transactions' in the main menu.")
+            pause()
+            clear_screen()
+            return True
+        signed = sign_once(AccountDelete(account=wallet.address, destination=destination), wallet)
+        resp = try_all_clients(_submit_signed, signed, txHash=signed.get_hash(), txSeq=signed.sequence, txAccount=wallet.address)
         if resp and resp.is_successful():
             print("AccountDelete transaction successful!")
             print(f"Hash: {resp.result['hash']}")
@@ -809,10 +3314,408 @@ def sendAccountDelete(wallet, destination):
         clear_screen()
         return False
 
+# --- Portfolio ---
+# Every known account is read at one validated ledger, so the rows and the total are a
+# consistent snapshot. They share the ledger stream's WebSocket when it is up: every request
+# goes out at once, only rows that raced a ledger close are read again, and a hundred
+# accounts come back in about one round trip. Otherwise they go over the async keep-alive
+# pool to the healthiest endpoint, pinned to a ledger up front.
+PORTFOLIO_CONCURRENCY = 50  # account_info requests in flight at once
+PORTFOLIO_TIMEOUT = 30
+_SESSION_WALLETS = {}  # address -> label, for wallets loaded or created this session but not saved
+
+def note_session_wallet(wallet, label="wallet"):
+    _SESSION_WALLETS.setdefault(wallet.address, label)
+
+def portfolio_accounts(settings, wallet=None):
+    """(address, label) for the loaded wallet, every wallet file, the session's other wallets and the saved addresses, without repeats."""
+    accounts = dict(history_accounts(wallet))
+    for entry in settings.get("frequent_addresses", []):
+        address = entry.get("address")
+        # settings.json is hand-editable: a bad saved address is left out, not sent to the server
+        if isinstance(address, str) and is_valid_xrp_address(address):
+            accounts.setdefault(address, entry.get("nickname") or "saved address")
+    return list(accounts.items())
+
+def _account_info_requests(addresses, ledger_index):
+    # the id is set up front: the WebSocket client would otherwise rebuild each request to add one
+    return [AccountInfo(account=address, ledger_index=ledger_index, id=f"account_info_{random.getrandbits(48)}")
+            for address in addresses]
+
+async def _read_portfolio(request, addresses, all_at_once):
+    limit = asyncio.Semaphore(PORTFOLIO_CONCURRENCY)
+
+    async def ask(req):
+        async with limit:
+            return await asyncio.wait_for(request(req), PORTFOLIO_TIMEOUT)
+
+    if not all_at_once:
+        # reads queue up behind a few connections, long enough for ledgers to close meanwhile: pin first
+        validated = (await ask(ServerInfo())).result["info"]["validated_ledger"]
+        ledger = validated["seq"]
+        answers = await asyncio.gather(*map(ask, _account_info_requests(addresses, ledger)), return_exceptions=True)
+        return ledger, validated, list(answers)
+    # everything at once at whatever ledger is validated now; server_info rides along for the reserves
+    info, *answers = await asyncio.gather(ask(ServerInfo()), *map(ask, _account_info_requests(addresses, "validated")),
+                                          return_exceptions=True)
+    if isinstance(info, Exception):
+        raise info
+    validated = info.result["info"]["validated_ledger"]
+    seen = [r.result.get("ledger_index") for r in answers if not isinstance(r, Exception)]
+    ledger = max([i for i in seen if i] or [validated["seq"]])
+    # a ledger can validate mid-flight: read the rows that answered from an older one again at the newest
+    again = [i for i, r in enumerate(answers) if isinstance(r, Exception) or r.result.get("ledger_index") != ledger]
+    if again:
+        redo = await asyncio.gather(*map(ask, _account_info_requests([addresses[i] for i in again], ledger)), return_exceptions=True)
+        for i, r in zip(again, redo):
+            answers[i] = r
+    return ledger, validated, answers
+
+async def _fetch_portfolio(addresses):
+    # one node answers everything, so the pinned ledger is one it has
+    candidates = []
+    if load_settings().get("ledger_stream", True):
+        client = await _LEDGER_STREAM.connection()
+        if client is not None:
+            candidates.append((client.request, _LEDGER_STREAM.url, True))
+    candidates += [(PooledAsyncJsonRpcClient(url).request, url, len(addresses) <= POOL_MAX_CONNECTIONS) for url in ranked_endpoints()]
+    last_exception = None
+    for request, source, all_at_once in candidates:
+        try:
+            ledger, validated, answers = await _read_portfolio(request, addresses, all_at_once)
+            break
+        except Exception as e:
+            last_exception = e
+    else:
+        raise last_exception or RuntimeError("no XRPL endpoint answered")
+    base = Decimal(str(validated.get("reserve_base_xrp", BASE_RESERVE_XRP)))
+    inc = Decimal(str(validated.get("reserve_inc_xrp", OWNER_RESERVE_XRP)))
+    rows = []
+    for address, resp in zip(addresses, answers):
+        row = {"address": address, "balance": None, "reserve": None, "spendable": None, "owner_count": None, "error": None}
+        if isinstance(resp, Exception):
+            row["error"] = str(resp) or type(resp).__name__
+        elif resp.is_successful():
+            data = resp.result["account_data"]
+            row["owner_count"] = int(data.get("OwnerCount", 0))
+            row["balance"] = drops_to_xrp(data["Balance"])
+            row["reserve"] = base + inc * row["owner_count"]
+            row["spendable"] = max(Decimal(0), row["balance"] - row["reserve"])
+        elif resp.result.get("error") == "actNotFound":
+            row["error"] = "not activated"
+        else:
+            row["error"] = resp.result.get("error_message") or resp.result.get("error")
+        rows.append(row)
+    return {"ledger": ledger, "source": source, "base_reserve": base, "owner_reserve": inc, "rows": rows}
+
+def fetch_portfolio(addresses):
+    """
+    Balance, reserve and spendable XRP for each address, all read at the same validated ledger.
+    Returns {"ledger", "source", "base_reserve", "owner_reserve", "rows"}, rows in input order;
+    a row that could not be read has "error" set and None amounts.
+    """
+    return run_async(_fetch_portfolio(list(addresses)), PORTFOLIO_TIMEOUT * 2)
+
+def portfolio_menu(wallet=None):
+    clear_screen()
+    settings = load_settings()
+    accounts = portfolio_accounts(settings, wallet)
+    if not accounts:
+        print("No accounts to show. Load a wallet or save some addresses first.")
+        pause()
+        clear_screen()
+        return
+    labels = dict(accounts)
+    print(f"Fetching {len(accounts)} account(s)...")
+    t0 = time.time()
+    try:
+        snapshot = fetch_portfolio(labels)
+    except Exception as e:
+        print(f"Could not fetch the portfolio: {e}")
+        pause()
+        clear_screen()
+        return
+    elapsed = time.time() - t0
+    clear_screen()
+    print(f"\nPortfolio at validated ledger {snapshot['ledger']} ({len(accounts)} accounts in {elapsed:.2f}s from {snapshot['source']})")
+    print(f"Reserve: {snapshot['base_reserve']} XRP base + {snapshot['owner_reserve']} XRP per owned object\n")
+    print(f"{'Label':<18} {'Address':<35} {'Balance':>16} {'Reserve':>10} {'Spendable':>16}")
+    totals = {"balance": Decimal(0), "reserve": Decimal(0), "spendable": Decimal(0)}
+    for row in snapshot["rows"]:
+        label = labels[row["address"]][:18]
+        if row["error"]:
+            print(f"{label:<18} {row['address']:<35} {row['error']}")
+            continue
+        for k in totals:
+            totals[k] += row[k]
+        print(f"{label:<18} {row['address']:<35} {row['balance']:>16} {row['reserve']:>10} {row['spendable']:>16}")
+    print(f"{'Total':<18} {'':<35} {totals['balance']:>16} {totals['reserve']:>10} {totals['spendable']:>16}")
+    if settings.get("xrp_usd_conversion", False):
+        currency = settings.get("fiat_currency", "usd")
+        prices, age = get_xrp_prices()
+        rate = prices.get(currency) if prices else None
+        if rate is not None:
+            stale = f" (price {format_duration(age)} old)" if age > PRICE_STALE_WARN else ""
+            print(f"Total value: {format_fiat(float(totals['balance']) * rate, currency)}, spendable {format_fiat(float(totals['spendable']) * rate, currency)}{stale}")
+    pause()
+    clear_screen()
+
+# --- Batch payments ---
+# Rows are validated up front, then signed with consecutive sequence numbers and submitted
+# back-to-back. Confirmation happens once at the end, from the account's validated history.
+BATCH_LEDGER_OFFSET = 20  # LastLedgerSequence headroom, plus one ledger per BATCH_ROWS_PER_LEDGER rows
+BATCH_ROWS_PER_LEDGER = 50
+BATCH_RETRY_CODES = ("telCAN_NOT_QUEUE", "telINSUF_FEE_P", "terPRE_SEQ")  # ledger/queue full: same blob, next ledger
+BATCH_CONFIRM_GRACE = 120  # seconds past last_ledger's expected close before unconfirmed rows are reported as such
+
+def read_payment_csv(path):
+    """
+    Parse and validate a destination,amount[,tag] CSV. A header row is allowed.
+    Returns (rows, errors); nothing should be sent unless errors is empty.
+    """
+    rows = []
+    errors = []
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        lines = [[c.strip() for c in row] for row in csv.reader(f)]
+    # every destination is checked (checksum included) in one batch pass
+    address_ok = validate_xrp_addresses([row[0] if row else "" for row in lines])
+    for line_no, (row, valid) in enumerate(zip(lines, address_ok), 1):
+        if not any(row):
+            continue
+        if line_no == 1 and len(row) > 1 and row[0].lower() in ("destination", "address", "to"):
+            continue
+        if len(row) < 2:
+            errors.append(f"line {line_no}: expected destination,amount[,tag]")
+            continue
+        dest, amount = row[0], row[1]
+        tag = row[2] if len(row) > 2 and row[2] else None
+        if not valid:
+            errors.append(f"line {line_no}: invalid XRP address '{dest}'")
+            continue
+        try:
+            amt = Decimal(amount)
+            if not amt.is_finite() or amt <= 0:
+                raise InvalidOperation
+            drops = int(xrp_to_drops(amt))
+        except Exception:
+            errors.append(f"line {line_no}: invalid amount '{amount}'")
+            continue
+        if tag is not None:
+            if not tag.isdigit() or int(tag) > 4294967295:
+                errors.append(f"line {line_no}: invalid destination tag '{tag}'")
+                continue
+            tag = int(tag)
+        rows.append({"line": line_no, "destination": dest, "amount_xrp": amt, "drops": drops, "tag": tag})
+    return rows, errors
+
+def _submit_blob(tx_blob):
+    def _submit(client_obj):
+        return client_obj.request(SubmitOnly(tx_blob=tx_blob))
+    # a signed blob is the same transaction everywhere, so resubmitting it on failover is safe
+    return try_all_clients(_submit)
+
+def confirm_transactions(account, pending, start_ledger, last_ledger):
+    """
+    Resolve many submitted hashes at once from the account's validated history instead of
+    one tx lookup per hash. pending: hash -> anything. Returns hash -> TransactionResult,
+    with "EXPIRED" for hashes not validated by last_ledger, and "UNCONFIRMED" for any still
+    open when the nodes stopped answering for BATCH_CONFIRM_GRACE past last_ledger's close.
+    """
+    results = {}
+    scan_from = start_ledger  # each pass reads only the ledgers the previous ones did not
+    failed_passes = 0
+    deadline = time.time() + (last_ledger - start_ledger) * LEDGER_CLOSE_SECONDS + BATCH_CONFIRM_GRACE
+    while len(results) < len(pending):
+        # the whole marker chain from one node: a marker only means something to the node that issued it
+        endpoints = [url for url in ranked_endpoints() if not endpoint_breaker_open(url)] or ranked_endpoints()
+        url = endpoints[failed_passes % len(endpoints)]
+        marker = None
+        scanned_to = None
+        while True:
+            def _account_tx(client_obj):
+                return client_obj.request(AccountTx(account=account, ledger_index_min=scan_from,
+                                                    ledger_index_max=-1, forward=True, marker=marker))
+            try:
+                resp = _timed_read(url, _account_tx)
+            except Exception:
+                resp = None
+            if not resp or not resp.is_successful():
+                # the next pass starts the chain over, on the next node
+                failed_passes += 1
+                break
+            for item in resp.result.get("transactions", []):
+                tx_hash = item.get("hash") or item.get("tx", {}).get("hash") or item.get("tx_json", {}).get("hash")
+                if tx_hash in pending and item.get("validated"):
+                    results[tx_hash] = item.get("meta", {}).get("TransactionResult", "?")
+            marker = resp.result.get("marker")
+            if not marker:
+                scanned_to = resp.result.get("ledger_index_max")
+                break
+        if scanned_to is not None:
+            # a complete pass: everything up to scanned_to has been seen
+            scan_from = max(scan_from, int(scanned_to) + 1)
+        # only ledgers actually scanned prove a hash missed its LastLedgerSequence
+        validated_index = scan_from - 1
+        if validated_index > last_ledger:
+            for tx_hash in pending:
+                results.setdefault(tx_hash, "EXPIRED")
+        if len(results) < len(pending):
+            if time.time() >= deadline:
+                print(f"Gave up waiting for validation: {len(pending) - len(results)} transaction(s) still unconfirmed; check them later by hash.")
+                for tx_hash in pending:
+                    results.setdefault(tx_hash, "UNCONFIRMED")
+                break
+            print(f"Waiting for validation: {len(results)}/{len(pending)} confirmed (scanned to ledger {validated_index}, last allowed {last_ledger})")
+            time.sleep(LEDGER_CLOSE_SECONDS / 2)
+    return results
+
+def run_batch_payments(wallet, rows, batch_id):
+    """Sign every row with consecutive sequence numbers, submit back-to-back, then confirm. Returns rows with results."""
+    fee = cached_fee()
+    # the real index, not an estimate: confirmation scans account_tx from here
+    start_ledger = first_answer(get_latest_validated_ledger_sequence)
+    last_ledger = start_ledger + BATCH_LEDGER_OFFSET + len(rows) // BATCH_ROWS_PER_LEDGER
+    # sign everything first; signing is local and cheap
+    for i, row in enumerate(rows):
+        row["sequence"] = reserve_sequence(wallet.address)
+        paymentParams = {
+            "account": wallet.address,
+            "amount": str(row["drops"]),
+            "destination": row["destination"],
+            "sequence": row["sequence"],
+            "fee": fee,
+            "last_ledger_sequence": last_ledger
+        }
+        if row["tag"] is not None:
+            paymentParams["destination_tag"] = row["tag"]
+        signed = sign(Payment(**paymentParams), wallet)
+        row["hash"] = signed.get_hash()
+        row["blob"] = encode(signed.to_xrpl())
+    pending = {}
+    stopped_at = None
+    for i, row in enumerate(rows):
+        engine = None
+        for attempt in range(5):
+            try:
+                resp = _submit_blob(row["blob"])
+                engine = resp.result.get("engine_result", "?") if resp and resp.is_successful() else str(getattr(resp, "result", resp))
+            except Exception as e:
+                engine = f"ERROR: {e}"
+            if not engine.startswith(BATCH_RETRY_CODES):
+                break
+            time.sleep(LEDGER_CLOSE_SECONDS)
+        row["submit_result"] = engine
+        print(f"[{i+1}/{len(rows)}] {row['destination']} {row['amount_xrp']} XRP seq {row['sequence']}: {engine}")
+        if engine.startswith(("tes", "tec", "ter")):
+            # tec still lands in a ledger and uses up its sequence number, and any ter may yet
+            pending[row["hash"]] = row
+        if not engine.startswith(("tes", "tec", "terQUEUED")):
+            # the sequence is not used (yet), so every later row would be stuck behind a gap
+            stopped_at = i
+            break
+    if stopped_at is not None:
+        for row in rows[stopped_at + 1:]:
+            row["submit_result"] = "NOT_SUBMITTED"
+    final = confirm_transactions(wallet.address, pending, start_ledger, last_ledger) if pending else {}
+    if "UNCONFIRMED" not in final.values() and (stopped_at is not None or "EXPIRED" in final.values()):
+        # reserved numbers went unused; only once nothing submitted can still take one are
+        # they handed out again, by reading the sequence from the ledger
+        forget_account_state(wallet.address)
+    for row in rows:
+        row["result"] = final.get(row.get("hash"), "FAILED" if row["submit_result"] != "NOT_SUBMITTED" else "NOT_SUBMITTED")
+        entry = {
+            "destination": row["destination"],
+            "amount_xrp": row["amount_xrp"],
+            "destination_tag": row["tag"],
+            "result": row["result"],
+            "batch": batch_id,
+            "batch_row": row["line"]
+        }
+        if row["hash"] in final:
+            entry["hash"] = row["hash"]
+        elif row["submit_result"] != "NOT_SUBMITTED":
+            entry["error"] = row["submit_result"]
+        log_transaction(entry)
+    return rows
+
+def batch_payment_menu(wallet):
+    clear_screen()
+    print("\nBatch payments from CSV")
+    print("Each line: destination,amount_in_XRP[,destination_tag]. A header line is fine.")
+    path = input("CSV file path (or 'q' to cancel): ").strip().strip('"')
+    if path.lower() in ['q', 'quit'] or not path:
+        clear_screen()
+        return
+    try:
+        rows, errors = read_payment_csv(path)
+    except Exception as e:
+        print(f"Could not read CSV: {e}")
+        pause()
+        clear_screen()
+        return
+    settings = load_settings()
+    if not settings.get("never_require_dtag", False):
+        dtag_accounts = fetch_dtag_accounts_without_flag()
+        for row in rows:
+            if row["tag"] is None and row["destination"] in dtag_accounts:
+                errors.append(f"line {row['line']}: {row['destination']} is known to require a destination tag")
+    if errors:
+        print(f"\n{len(errors)} problem(s) found, nothing was sent:")
+        for e in errors[:50]:
+            print(f"  {e}")
+        if len(errors) > 50:
+            print(f"  ... and {len(errors) - 50} more")
+        pause()
+        clear_screen()
+        return
+    if not rows:
+        print("No payments found in file.")
+        pause()
+        clear_screen()
+        return
+    total = sum(r["amount_xrp"] for r in rows)
+    info = hedged_read(lambda c: c.request(AccountInfo(account=wallet.address, ledger_index="validated")))
+    if info and info.is_successful():
+        data = info.result["account_data"]
+        reserve = Decimal(str(BASE_RESERVE_XRP)) + Decimal(str(OWNER_RESERVE_XRP)) * int(data.get("OwnerCount", 0))
+        spendable = drops_to_xrp(data["Balance"]) - reserve
+        if total > spendable:
+            print(f"Batch total {total} XRP is more than the spendable balance of {spendable} XRP. Nothing was sent.")
+            pause()
+            clear_screen()
+            return
+    print(f"\n{len(rows)} payments, {total} XRP total (plus network fees), to {len({r['destination'] for r in rows})} destinations.")
+    confirm = input("Confirm batch? (y/n): ").strip().lower()
+    if confirm != 'y':
+        print("Batch cancelled.")
+        time.sleep(3.5)
+        clear_screen()
+        return
+    batch_id = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    try:
+        t0 = time.time()
+        rows = run_batch_payments(wallet, rows, batch_id)
+    except Exception as e:
+        print(f"Batch failed: {e}")
+        if settings.get("debug", False):
+            traceback.print_exc()
+        pause()
+        clear_screen()
+        return
+    ok = sum(1 for r in rows if r["result"] == "tesSUCCESS")
+    print(f"\nBatch {batch_id}: {ok}/{len(rows)} succeeded in {time.time() - t0:.1f}s.")
+    for r in rows:
+        if r["result"] != "tesSUCCESS":
+            print(f"  line {r['line']}: {r['destination']} {r['amount_xrp']} XRP -> {r['result']}")
+    print("Per-row results were written to the transaction log.")
+    pause()
+    clear_screen()
+
 def getUserChoice():
     try:
         choice = input("Select an option (or 'q' to quit): ").strip().lower()
         if choice == 'q' or choice == 'quit':
+            wait_for_pending_transactions()
             print("Goodbye!")
             clear_screen()
             exit(0)
@@ -840,7 +3743,7 @@ def settings_menu(wallet=None):
         elif choice == "2":
             destination_tag_settings_menu()
         elif choice == "3":
-            transaction_log_settings_menu()
+            transaction_log_settings_menu(wallet)
         elif choice == "4":
             delete_wallet_account_menu(wallet)
         elif choice == "5":
@@ -855,6 +3758,45 @@ def settings_menu(wallet=None):
             time.sleep(2)
 
 # --- Submenu stubs ---
+def import_frequent_addresses(settings):
+    """
+    Add address book entries from a CSV of nickname,address[,tags] rows, tags separated by ';'.
+    Every address is checked in one batch; rows that fail are reported and skipped, and
+    addresses already in the book are left alone.
+    """
+    path = input("CSV file to import: ").strip()
+    try:
+        with open(path, newline="") as f:
+            rows = [r for r in csv.reader(f) if any(c.strip() for c in r)]
+    except OSError as e:
+        print(f"Could not read {path}: {e}")
+        return
+    if rows and rows[0][0].strip().lower() == "nickname":
+        rows = rows[1:]
+    fa = settings.get("frequent_addresses", [])
+    known = {entry["address"] for entry in fa}
+    ids = decode_account_ids(r[1].strip() if len(r) > 1 else "" for r in rows)
+    added, skipped = 0, []
+    for n, (row, account_id) in enumerate(zip(rows, ids), 1):
+        if account_id is None:
+            skipped.append(f"row {n}: invalid XRP address")
+            continue
+        address = row[1].strip()
+        if address in known:
+            continue
+        tags = [int(t) for t in (row[2] if len(row) > 2 else "").split(";") if t.strip().isdigit()]
+        fa.append({"nickname": row[0].strip() or address, "address": address, "tags": tags})
+        known.add(address)
+        added += 1
+    if added:
+        settings["frequent_addresses"] = fa
+        save_settings(settings)
+    print(f"Imported {added} address(es).")
+    for msg in skipped[:20]:
+        print("  " + msg)
+    if len(skipped) > 20:
+        print(f"  ... and {len(skipped) - 20} more")
+
 def manage_frequent_addresses_menu():
     settings = load_settings()
     while True:
@@ -871,11 +3813,16 @@ def manage_frequent_addresses_menu():
         print("a. Add new address")
         print("e. Edit address")
         print("d. Delete address")
+        print("i. Import from CSV (nickname,address[,tag;tag...])")
         print("b. Back")
         choice = input("Select: ").strip().lower()
         if choice == "a":
             nickname = input("Enter nickname: ").strip()
             address = input("Enter address: ").strip()
+            if not is_valid_xrp_address(address):
+                print("Invalid XRP address.")
+                time.sleep(2)
+                continue
             tags_input = input("Enter tags (comma separated, or leave blank): ").strip()
             tags = []
             if tags_input:
@@ -899,6 +3846,10 @@ def manage_frequent_addresses_menu():
                 if new_nick:
                     entry['nickname'] = new_nick
                 if new_addr:
+                    if not is_valid_xrp_address(new_addr):
+                        print("Invalid XRP address.")
+                        time.sleep(2)
+                        continue
                     entry['address'] = new_addr
                 if new_tags:
                     tags = []
@@ -914,6 +3865,9 @@ def manage_frequent_addresses_menu():
             else:
                 print("Invalid selection.")
                 time.sleep(2)
+        elif choice == "i":
+            import_frequent_addresses(settings)
+            pause()
         elif choice == "d":
             idx = input("Enter number to delete: ").strip()
             if idx.isdigit() and 1 <= int(idx) <= len(fa):
@@ -960,34 +3914,100 @@ def destination_tag_settings_menu():
             time.sleep(2)
 
 
-def transaction_log_settings_menu():
+def search_tx_log_menu():
+    clear_screen()
+    print("\nSearch transaction log (press Enter to skip a filter):")
+    tx_hash = input("Transaction hash: ").strip().upper()
+    destination = input("Destination address: ").strip()
+    tag = input("Destination tag: ").strip()
+    since = input("From date (YYYY-MM-DD): ").strip()
+    until = input("To date (YYYY-MM-DD): ").strip()
+    if tag and not tag.isdigit():
+        print("Invalid destination tag.")
+        time.sleep(2)
+        return
+    for d in (since, until):
+        if d:
+            try:
+                datetime.strptime(d, "%Y-%m-%d")
+            except ValueError:
+                print(f"Invalid date: {d}")
+                time.sleep(2)
+                return
+    try:
+        t0 = time.perf_counter()
+        results = query_tx_log(tx_hash or None, destination or None, int(tag) if tag else None,
+                               since or None, until or None, limit=200)
+        elapsed = (time.perf_counter() - t0) * 1000
+    except Exception as e:
+        print(f"Could not search transaction log: {e}")
+        pause()
+        return
+    if not results:
+        print("No matching transactions.")
+    else:
+        print(f"\n{len(results)} match(es), newest first ({elapsed:.1f} ms):")
+        for entry in results:
+            print(format_tx_entry(entry))
+    pause()
+
+def transaction_log_settings_menu(wallet=None):
     settings = load_settings()
     while True:
         clear_screen()
         print("\nTransaction Log Settings:")
         print("1. View transaction log")
-        print("2. Reset & archive transaction log")
+        print("2. Log rotation (currently: at {} or after {}; archives are compressed)".format(
+            f"{settings.get('tx_log_rotate_mb', 5)} MB" if settings.get("tx_log_rotate_mb", 5) else "no size limit",
+            f"{settings.get('tx_log_rotate_days', 90)} days" if settings.get("tx_log_rotate_days", 90) else "no age limit"))
         print("3. Force clear transaction log")
         print("4. Enable/disable transaction logging (currently: {})".format("ON" if settings.get("tx_log_enabled") else "OFF"))
+        print("5. Toggle fsync after each log entry (currently: {})".format("ON" if settings.get("tx_log_fsync") else "OFF"))
+        print("6. Search transaction log (hash, destination, tag, dates)")
+        print("7. Sync account history from the ledger (incoming payments and other tools' sends too)")
+        print("8. View synced account history")
+        print("9. Totals sent, across archives (destination, dates)")
         print("b. Back")
         choice = input("Select: ").strip().lower()
         if choice == "1":
             print_tx_log()
         elif choice == "2":
-            archive_log()
-            print("Transaction log archived and reset.")
-            with open(TX_LOG_FILE, "w") as f:
-                json.dump([], f)
+            size = input(f"Archive the log at this many MB (0 for no size limit, Enter for {settings.get('tx_log_rotate_mb', 5)}): ").strip()
+            days = input(f"Or once its oldest entry is this many days old (0 for no age limit, Enter for {settings.get('tx_log_rotate_days', 90)}): ").strip()
+            if (size and not size.isdigit()) or (days and not days.isdigit()):
+                print("Invalid number.")
+                time.sleep(2)
+                continue
+            if size:
+                settings["tx_log_rotate_mb"] = int(size)
+            if days:
+                settings["tx_log_rotate_days"] = int(days)
+            save_settings(settings)
+            if input("Archive the current log now as well? (y/N): ").strip().lower() == "y":
+                archive = archive_log()
+                print(f"Log archived to {archive}" if archive else "The log is empty; nothing to archive.")
             pause()
         elif choice == "3":
-            with open(TX_LOG_FILE, "w") as f:
-                json.dump([], f)
+            migrate_tx_log()
+            clear_tx_log()
             print("Transaction log force cleared.")
             pause()
         elif choice == "4":
             settings["tx_log_enabled"] = not settings.get("tx_log_enabled", True)
             print(f"Transaction log set to: {'ON' if settings['tx_log_enabled'] else 'OFF'}")
             save_settings(settings)
+        elif choice == "5":
+            settings["tx_log_fsync"] = not settings.get("tx_log_fsync", False)
+            print(f"Transaction log fsync set to: {'ON' if settings['tx_log_fsync'] else 'OFF'}")
+            save_settings(settings)
+        elif choice == "6":
+            search_tx_log_menu()
+        elif choice == "7":
+            sync_history_menu(wallet)
+        elif choice == "8":
+            view_history_menu(wallet)
+        elif choice == "9":
+            sent_totals_menu()
         elif choice == "b":
             clear_screen()
             break
@@ -1029,7 +4049,7 @@ def delete_wallet_account_menu(wallet):
                         ledger_index="validated"
                     )
                     return client_obj.request(acctInfo)
-                response = try_all_clients(_get_account_info, wallet)
+                response = hedged_read(_get_account_info, wallet)
                 if response and response.is_successful():
                     account_data = response.result["account_data"]
                     balance_drops = int(account_data["Balance"])
@@ -1055,14 +4075,15 @@ def delete_wallet_account_menu(wallet):
         elif choice == "2":
             # Secure wallet deletion
             print("Permanently delete current wallet (secure wipe)")
-            wallet_files = [f for f in os.listdir(wallets_dir) if f.endswith(".dat")]
+            entries = wallet_entries()
+            wallet_files = [name for name, _ in entries]
             if not wallet_files:
                 print("No wallet file found to delete.")
                 pause()
                 continue
             print("Wallet files in your wallets directory:")
-            for idx, fname in enumerate(wallet_files, 1):
-                print(f"  {idx}. {fname}")
+            for idx, (fname, entry) in enumerate(entries, 1):
+                print(f"  {idx}. {describe_wallet_entry(fname, entry)}")
             idx = input("Select wallet file to delete (number): ").strip()
             if idx.isdigit() and 1 <= int(idx) <= len(wallet_files):
                 fname = wallet_files[int(idx)-1]
@@ -1076,6 +4097,7 @@ def delete_wallet_account_menu(wallet):
                             f.write(b"\x00" * length)
                             f.flush()
                         os.remove(fullpath)
+                        forget_wallet_file(fullpath)
                         print("Wallet file securely deleted.")
                     except Exception as e:
                         print(f"Error deleting wallet file: {e}")
@@ -1096,25 +4118,34 @@ def currency_conversion_settings_menu():
     settings = load_settings()
     while True:
         clear_screen()
+        currency = settings.get("fiat_currency", "usd").upper()
+        mode = "XRP" if settings.get("xrp_input_mode", "XRP") == "XRP" else currency
         print("\nCurrency Conversion Settings:")
-        print("1. Toggle XRP-USD display (currently: {})".format("ON" if settings.get("xrp_usd_conversion", False) else "OFF"))
-        print("2. Change currency (stub, extensible)")
-        print("3. Toggle input mode (currently: {})".format(settings.get("xrp_input_mode", "XRP")))
+        print("1. Toggle XRP-{} display (currently: {})".format(currency, "ON" if settings.get("xrp_usd_conversion", False) else "OFF"))
+        print(f"2. Change currency (currently: {currency})")
+        print(f"3. Toggle input mode (currently: {mode})")
         print("b. Back")
         choice = input("Select: ").strip().lower()
         if choice == "1":
             settings["xrp_usd_conversion"] = not settings.get("xrp_usd_conversion", False)
-            print(f"XRP→USD conversion display set to: {'ON' if settings['xrp_usd_conversion'] else 'OFF'}")
+            print(f"XRP→{currency} conversion display set to: {'ON' if settings['xrp_usd_conversion'] else 'OFF'}")
             save_settings(settings)
         elif choice == "2":
-            print("Currency change not implemented yet. (stub)")
-            # extensible: add more fiat currencies
-            pause()
+            print("Available: " + ", ".join(c.upper() for c in PRICE_CURRENCIES))
+            new_currency = input("Currency code: ").strip().lower()
+            if new_currency in PRICE_CURRENCIES:
+                settings["fiat_currency"] = new_currency
+                save_settings(settings)
+                rate = getXrpRate(new_currency)
+                print(f"Currency set to: {new_currency.upper()}" + (f" ({format_fiat(rate, new_currency)}/XRP)" if rate else ""))
+                time.sleep(2)
+            else:
+                print("Unknown currency.")
+                time.sleep(2)
         elif choice == "3":
-            mode = settings.get("xrp_input_mode", "XRP")
-            new_mode = "USD" if mode == "XRP" else "XRP"
-            settings["xrp_input_mode"] = new_mode
-            print(f"Input mode set to: {new_mode}")
+            # any old value ("USD") counts as fiat mode
+            settings["xrp_input_mode"] = "FIAT" if settings.get("xrp_input_mode", "XRP") == "XRP" else "XRP"
+            print(f"Input mode set to: {'XRP' if settings['xrp_input_mode'] == 'XRP' else currency}")
             save_settings(settings)
         elif choice == "b":
             clear_screen()
@@ -1132,6 +4163,13 @@ def developer_settings_menu():
         print(f"2. Toggle debug output")
         print(f"3. Donate easter egg")
         print(f"4. Show contact info")
+        print(f"5. Toggle hedged reads (currently: {'ON' if load_settings().get('hedged_reads', True) else 'OFF'})")
+        print(f"6. Set hedge delay (currently: {load_settings().get('hedge_delay_ms', 300)} ms)")
+        print(f"7. Toggle background sends (currently: {'ON' if load_settings().get('background_sends', True) else 'OFF'})")
+        print(f"8. Toggle ledger stream confirmation (currently: {'ON' if load_settings().get('ledger_stream', True) else 'OFF'})")
+        print(f"9. Toggle background module preload (currently: {'ON' if load_settings().get('preload_modules', True) else 'OFF'})")
+        print(f"10. Recalibrate wallet unlock cost (currently: {describe_wallet_kdf(load_settings().get('wallet_kdf'))})")
+        print(f"11. Set unlock cache time (currently: {load_settings().get('wallet_unlock_cache_minutes', 5)} min, {unlocked_key_count()} key(s) held)")
         print("b. Back")
         choice = input("Select: ").strip().lower()
         if choice == "1":
@@ -1149,6 +4187,63 @@ def developer_settings_menu():
             print("GitHub: https://github.com/rubyatmidnight/xrpurr")
             print("Email: rubyaftermidnight@gmail.com")
             pause()
+        elif choice == "5":
+            settings = load_settings()
+            settings["hedged_reads"] = not settings.get("hedged_reads", True)
+            print(f"Hedged reads set to: {'ON' if settings['hedged_reads'] else 'OFF'}")
+            save_settings(settings)
+        elif choice == "6":
+            settings = load_settings()
+            delay = input("Hedge delay in milliseconds: ").strip()
+            if delay.isdigit():
+                settings["hedge_delay_ms"] = int(delay)
+                save_settings(settings)
+                print(f"Hedge delay set to: {delay} ms")
+            else:
+                print("Invalid delay.")
+                time.sleep(2)
+        elif choice == "7":
+            settings = load_settings()
+            settings["background_sends"] = not settings.get("background_sends", True)
+            print(f"Background sends set to: {'ON' if settings['background_sends'] else 'OFF'}")
+            save_settings(settings)
+        elif choice == "8":
+            settings = load_settings()
+            settings["ledger_stream"] = not settings.get("ledger_stream", True)
+            print(f"Ledger stream confirmation set to: {'ON' if settings['ledger_stream'] else 'OFF'}")
+            save_settings(settings)
+        elif choice == "9":
+            settings = load_settings()
+            settings["preload_modules"] = not settings.get("preload_modules", True)
+            print(f"Background module preload set to: {'ON' if settings['preload_modules'] else 'OFF'}")
+            save_settings(settings)
+        elif choice == "10":
+            settings = load_settings()
+            target = input(f"Target unlock time in milliseconds (Enter for {settings.get('wallet_unlock_ms', 500)}): ").strip()
+            if target and not target.isdigit():
+                print("Invalid time.")
+                time.sleep(2)
+                continue
+            if target:
+                settings["wallet_unlock_ms"] = int(target)
+            print("Measuring...")
+            settings["wallet_kdf"] = calibrate_wallet_kdf(settings.get("wallet_unlock_ms", 500))
+            save_settings(settings)
+            print(f"New wallet files will use {describe_wallet_kdf(settings['wallet_kdf'])}.")
+            print("Existing files keep the cost they were saved with.")
+            pause()
+        elif choice == "11":
+            settings = load_settings()
+            minutes = input("Minutes to keep unlocked wallet keys after last use (0 to never keep them): ").strip()
+            if minutes.isdigit():
+                settings["wallet_unlock_cache_minutes"] = int(minutes)
+                save_settings(settings)
+                if int(minutes) == 0:
+                    clear_unlock_cache()
+                print(f"Unlock cache time set to: {minutes} min")
+            else:
+                print("Invalid time.")
+                time.sleep(2)
         elif choice == "b":
             clear_screen()
             break
@@ -1279,6 +4374,27 @@ def show_dev_info():
     print(f"Current Loaded Settings: {SETTINGS_FILE}")
     print(f"Tx log file: {TX_LOG_FILE}")
     print(f"XRPL client URLs: {', '.join(XRPL_ENDPOINTS)}")
+    if _STARTUP["import"] is not None:
+        first_menu = f"{_STARTUP['first_menu']*1000:.0f} ms" if _STARTUP["first_menu"] is not None else "n/a"
+        print(f"Startup: module import {_STARTUP['import']*1000:.0f} ms (budget {STARTUP_BUDGET_MS} ms), first menu after {first_menu}")
+    loaded = lazy_modules_loaded()
+    slow = [f"{label} {sec*1000:.0f} ms" for label, sec in sorted(loaded.items(), key=lambda kv: -kv[1]) if sec >= 0.001]
+    print(f"Deferred imports loaded: {len(loaded)}" + (f" ({', '.join(slow)})" if slow else ""))
+    if _HEDGE_STATS["last_winner"]:
+        print(f"Last hedged read answered by: {_HEDGE_STATS['last_winner']} (backups fired: {_HEDGE_STATS['hedges_fired']})")
+    stream = _LEDGER_STREAM
+    if stream.client is not None:
+        print(f"Ledger stream: connected to {stream.url}, ledger {stream.ledger_index}, {len(stream.waiters)} watched")
+    else:
+        print(f"Ledger stream: {'retrying later' if time.time() < stream.down_until else 'not connected'}")
+    print(f"  confirmed by stream: {stream.stats['resolved']}, fell back to polling: {stream.stats['fallbacks']}")
+    print(f"Wallet KDF for new files: {describe_wallet_kdf(load_settings().get('wallet_kdf'))}, unlocked keys held: {unlocked_key_count()}")
+    print("Endpoint health (best first):")
+    for url in ranked_endpoints():
+        state = _endpoint_state(url)
+        latency = f"{state['latency']*1000:.0f} ms" if state["latency"] is not None else "n/a"
+        breaker = "OPEN" if endpoint_breaker_open(url) else "closed"
+        print(f"  {url} latency: {latency}, errors: {state['error_rate']*100:.0f}%, calls: {state['calls']}, breaker: {breaker}")
     print(f"Python version: {os.sys.version}")
     print(f"Developer Info: ruby")
     print(f"Repo: https://github.com/rubyatmidnight/xrpurr")
@@ -1318,6 +4434,9 @@ def main():
     print(f"{getGreeting()}!")
     wallet = None
     settings = load_settings()
+    if settings.get("xrp_usd_conversion", False) or settings.get("xrp_input_mode", "XRP") != "XRP":
+        get_xrp_prices()  # disk copy now, fresh one in the background if it is old
+    prefetch_dtag_accounts()  # ready by the time a send needs it
     
     while True:
         print("\nMenu:")
@@ -1327,12 +4446,21 @@ def main():
         print("4. Show wallet balance and address")
         print("5. Create new wallet (random fresh address)")
         print("6. Settings")
+        print("7. Batch send from a CSV file")
+        print(f"8. Pending transactions ({pending_transaction_count()} in flight)")
+        print("9. Portfolio (all known accounts)")
         print("q. Exit")
+        if _STARTUP["first_menu"] is None:
+            _STARTUP["first_menu"] = time.perf_counter() - STARTUP_T0
+            if settings.get("preload_modules", True):
+                preload_modules()  # the first wallet load or send then finds them imported
         
         choice = getUserChoice()
         
         if choice == "1":
             wallet = loadWallet()
+            if wallet:
+                note_session_wallet(wallet)
         elif choice == "2":
             # Send XRP to an address (manual)
             if wallet:
@@ -1364,9 +4492,20 @@ def main():
                 time.sleep(3.5)
         elif choice == "5":
             wallet = createWallet()
+            note_session_wallet(wallet, "new wallet")
         elif choice == "6":
             settings_menu(wallet)
             settings = load_settings()  # reload in case changed
+        elif choice == "7":
+            if wallet:
+                batch_payment_menu(wallet)
+            else:
+                print("No wallet loaded.")
+                time.sleep(3.5)
+        elif choice == "8":
+            pending_transactions_menu()
+        elif choice == "9":
+            portfolio_menu(wallet)
         elif choice == "q":
             print("Goodbye!")
             clear_screen()
@@ -1374,7 +4513,7 @@ def main():
         elif choice == "vanity":
             # Hidden vanity finder
             try:
-                prefix = input("Enter desired address prefix (e.g., rABC, 'q' to cancel): ").strip()
+                prefix = input("Enter desired prefixes, comma separated (e.g., rABC, *xyz for a suffix, add /i to ignore case, 'q' to cancel): ").strip()
                 if prefix.lower() not in ['q', 'quit']:
                     findVanityAddr(prefix)
             except KeyboardInterrupt:
@@ -1472,18 +4611,16 @@ def send_xrp_manual(wallet, settings):
                 print(f"Could not fetch balance: {e}")
                 pause()
             
-            amtInput = input("Amount in XRP: ").strip()
-            if amtInput.lower() in ['q', 'quit']:
-                clear_screen()
-                return
-
             try:
-                amt = float(amtInput)
+                amt = read_amount_xrp(settings)
             except Exception:
                 print("Invalid amount.")
                 time.sleep(3.5)
                 clear_screen()
                 return
+            if amt is None:
+                clear_screen()
+                return
 
             print(f"\nSending {amt} XRP to {dest}")
             if destTag is not None:
@@ -1584,18 +4721,16 @@ def send_xrp_saved(wallet, settings):
                     print(f"Could not fetch balance: {e}")
                     pause()
                 
-                amtInput = input("Amount in XRP: ").strip()
-                if amtInput.lower() in ['q', 'quit']:
-                    clear_screen()
-                    return
-
                 try:
-                    amt = float(amtInput)
+                    amt = read_amount_xrp(settings)
                 except Exception:
                     print("Invalid amount.")
                     time.sleep(3.5)
                     clear_screen()
                     return
+                if amt is None:
+                    clear_screen()
+                    return
 
                 print(f"\nSending {amt} XRP to {dest}")
                 if destTag is not None:
@@ -1635,5 +4770,7 @@ def send_xrp_saved(wallet, settings):
             clear_screen()
             return
 
+_STARTUP["import"] = time.perf_counter() - STARTUP_T0
+
 if __name__ == "__main__":
     main()